@@ -0,0 +1,142 @@
+"""Workspace artifact store for oversized tool results."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+
+class ArtifactStore:
+    """Keep large tool results on disk and put a preview in the conversation.
+
+    A result longer than ``threshold_chars`` is written once to
+    ``<workspace>/.artifacts/<hash>.txt`` (named by content hash, so a repeated
+    result reuses its file).  The tool message then holds the head and tail of
+    the output plus the artifact path, which the model can page through with
+    ``read_file``.  Reads of an artifact are passed through unchanged so that
+    paging does not create new artifacts.
+
+    The store is pruned after each write: artifacts unused for ``ttl_s`` are
+    deleted, then the least recently used ones until the directory is under
+    ``max_total_bytes`` (either limit is off when 0).
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        threshold_chars: int = 16_000,
+        preview_chars: int = 2_000,
+        max_total_bytes: int = 200 * 1024 * 1024,
+        ttl_s: int = 7 * 24 * 60 * 60,
+    ):
+        self.workspace = Path(workspace)
+        self.directory = self.workspace / ".artifacts"
+        self.threshold_chars = threshold_chars
+        self.preview_chars = preview_chars
+        self.max_total_bytes = max_total_bytes
+        self.ttl_s = ttl_s
+        self.stored = 0
+        self.chars_saved = 0
+
+    def put(self, text: str) -> Path:
+        """Write *text* to the store (once per distinct content) and return its path."""
+        data = text.encode("utf-8")
+        path = self.directory / f"{hashlib.sha256(data).hexdigest()[:16]}.txt"
+        if path.exists():
+            os.utime(path)  # mark as recently used for pruning
+            return path
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.prune(keep=path)
+        return path
+
+    def prune(self, keep: Path | None = None) -> int:
+        """Delete expired artifacts, then the oldest ones over the size cap."""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob("*.txt"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        cutoff = time.time() - self.ttl_s if self.ttl_s > 0 else None
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            expired = cutoff is not None and mtime < cutoff
+            oversize = 0 < self.max_total_bytes < total
+            if path == keep or not (expired or oversize):
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            logger.debug("Pruned {} old artifact(s) from {}", removed, self.directory)
+        return removed
+
+    def is_artifact_read(self, tool_name: str, arguments: dict[str, Any]) -> bool:
+        if tool_name != "read_file" or not isinstance(arguments.get("path"), str):
+            return False
+        path = Path(arguments["path"]).expanduser()
+        if not path.is_absolute():
+            path = self.workspace / path
+        return path.resolve().is_relative_to(self.directory.resolve())
+
+    def preview(self, text: str, path: Path) -> str:
+        """Return the head/tail preview that replaces *text* in the conversation."""
+        head_chars = self.preview_chars * 2 // 3
+        tail_chars = self.preview_chars - head_chars
+        try:
+            shown = path.relative_to(self.workspace)
+        except ValueError:
+            shown = path
+        lines = text.count("\n") + 1
+        omitted = len(text) - head_chars - tail_chars
+        return (
+            f"{text[:head_chars]}\n\n"
+            f"... ({omitted:,} chars omitted. Full output ({len(text):,} chars, {lines:,} lines) "
+            f"saved to {shown}; page through it with read_file using offset and limit.) ...\n\n"
+            f"{text[-tail_chars:] if tail_chars else ''}"
+        )
+
+    def store(self, tool_name: str, text: str) -> str | None:
+        """Store *text* and return its preview, or ``None`` if it could not be written.
+
+        Does file I/O; call it from a worker thread.
+        """
+        try:
+            path = self.put(text)
+        except OSError as exc:
+            logger.warning("Could not store {} output as an artifact: {}", tool_name, exc)
+            return None
+        preview = self.preview(text, path)
+        self.stored += 1
+        self.chars_saved += len(text) - len(preview)
+        logger.debug("Stored {} output ({:,} chars) as artifact {}", tool_name, len(text), path.name)
+        return preview
+
+    async def offload(self, tool_name: str, arguments: dict[str, Any], result: Any) -> Any:
+        """Return *result*, or a preview of it if it is a string over the threshold."""
+        if (
+            not isinstance(result, str)
+            or len(result) <= self.threshold_chars
+            or self.is_artifact_read(tool_name, arguments)
+        ):
+            return result
+        preview = await asyncio.to_thread(self.store, tool_name, result)
+        return result if preview is None else preview
@@ -0,0 +1,216 @@
+"""In-turn compaction of tool results for long tool loops."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.helpers import estimate_message_tokens
+
+
+class TurnCompactor:
+    """Shrink the current turn's tool results before each provider request.
+
+    The runner keeps the full messages; only the copy sent to the provider is
+    compacted, and message order and tool-call pairing are left intact.
+
+    * With ``drop_superseded``, a ``read_file`` result is replaced with a
+      short stub once the same file is edited or rewritten later in the turn,
+      or read again with the same window.
+    * With ``budget_tokens`` set, once the turn's messages exceed it, tool
+      results from the oldest iterations (all but the last
+      ``keep_recent_iterations``) are cut to a one-line preview, oldest first,
+      until the turn fits.
+
+    Rewriting an earlier message invalidates the provider's prompt cache from
+    that message on, so stubs are applied in batches and then kept as they
+    are: new superseded stubs wait until they remove at least
+    ``_MIN_BATCH_SHARE`` of the tokens they would invalidate, and an
+    over-budget turn is condensed down to ``_BUDGET_HEADROOM`` of the budget
+    so the next iterations fit without another rewrite.
+
+    ``tokens_saved`` adds up the estimated prompt tokens removed across every
+    request of the turn.
+    """
+
+    _MUTATING_FILE_TOOLS = frozenset({"write_file", "edit_file"})
+    _MIN_COMPACT_CHARS = 200
+    _PREVIEW_CHARS = 160
+    _MIN_BATCH_SHARE = 0.25
+    _BUDGET_HEADROOM = 0.75
+
+    def __init__(
+        self,
+        turn_start: int,
+        *,
+        drop_superseded: bool = True,
+        budget_tokens: int = 0,
+        keep_recent_iterations: int = 2,
+    ):
+        self.turn_start = turn_start
+        self.drop_superseded = drop_superseded
+        self.budget_tokens = budget_tokens
+        self.keep_recent_iterations = keep_recent_iterations
+        self.tokens_saved = 0
+        self.superseded = 0
+        self.condensed = 0
+        self._token_cache: dict[int, int] = {}
+        self._applied: dict[int, str] = {}  # turn index -> stub already sent to the provider
+
+    def _tokens(self, message: dict[str, Any]) -> int:
+        key = id(message)
+        if key not in self._token_cache:
+            self._token_cache[key] = estimate_message_tokens(message)
+        return self._token_cache[key]
+
+    @staticmethod
+    def _call_arguments(tool_call: dict[str, Any]) -> dict[str, Any]:
+        raw = (tool_call.get("function") or {}).get("arguments")
+        if isinstance(raw, dict):
+            return raw
+        try:
+            parsed = json.loads(raw or "{}")
+        except (TypeError, ValueError):
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+
+    def _tool_results(self, turn: list[dict[str, Any]]) -> list[tuple[int, int, str, dict]]:
+        """Return ``(index, iteration, tool name, arguments)`` for each tool result in *turn*."""
+        calls: dict[str, tuple[int, str, dict[str, Any]]] = {}
+        results: list[tuple[int, int, str, dict[str, Any]]] = []
+        iteration = -1
+        for index, message in enumerate(turn):
+            role = message.get("role")
+            if role == "assistant" and message.get("tool_calls"):
+                iteration += 1
+                for tool_call in message["tool_calls"]:
+                    name = (tool_call.get("function") or {}).get("name", "")
+                    calls[tool_call.get("id", "")] = (
+                        iteration,
+                        name,
+                        self._call_arguments(tool_call),
+                    )
+            elif role == "tool" and isinstance(message.get("content"), str):
+                call = calls.get(message.get("tool_call_id", ""))
+                if call is not None:
+                    results.append((index, *call))
+        return results
+
+    def _superseded(self, results: list[tuple[int, int, str, dict]]) -> dict[int, str]:
+        """Map result index -> stub for file reads made stale later in the turn."""
+        stubs: dict[int, str] = {}
+        later_writes: dict[str, str] = {}
+        later_windows: dict[str, set[tuple[Any, Any]]] = {}
+        for index, _iteration, name, args in reversed(results):
+            path = args.get("path")
+            if not isinstance(path, str) or not path:
+                continue
+            key = os.path.normpath(path)
+            if name in self._MUTATING_FILE_TOOLS:
+                later_writes.setdefault(key, name)
+                continue
+            if name != "read_file":
+                continue
+            window = (args.get("offset") or 1, args.get("limit"))
+            if key in later_writes:
+                reason = f"{path} was changed later in this turn by {later_writes[key]}"
+            elif window in later_windows.get(key, set()):
+                reason = f"{path} was read again later in this turn"
+            else:
+                reason = None
+            if reason:
+                stubs[index] = f"[superseded read_file result: {reason}]"
+            later_windows.setdefault(key, set()).add(window)
+        return stubs
+
+    def _condense(
+        self,
+        turn: list[dict[str, Any]],
+        results: list[tuple[int, int, str, dict]],
+        stubs: dict[int, str],
+        total: int,
+        target: int,
+    ) -> None:
+        """Cut the oldest iterations' tool results to previews until the turn is under *target*."""
+        if not results:
+            return
+        last_iteration = results[-1][1]
+        for index, iteration, name, _args in results:
+            if total <= target:
+                return
+            if iteration > last_iteration - self.keep_recent_iterations or index in stubs:
+                continue
+            content = turn[index]["content"]
+            if len(content) < self._MIN_COMPACT_CHARS:
+                continue
+            first_line = content.strip().splitlines()[0] if content.strip() else ""
+            stub = (
+                f"[earlier {name} result condensed to fit the turn budget "
+                f"({len(content):,} chars): {first_line[: self._PREVIEW_CHARS]}]"
+            )
+            before = self._tokens(turn[index])
+            after = estimate_message_tokens({**turn[index], "content": stub})
+            stubs[index] = stub
+            total -= before - after
+
+    def _saving(self, turn: list[dict[str, Any]], stubs: dict[int, str]) -> int:
+        return sum(
+            self._tokens(turn[i]) - estimate_message_tokens({**turn[i], "content": stub})
+            for i, stub in stubs.items()
+        )
+
+    def _worth_applying(self, turn: list[dict[str, Any]], pending: dict[int, str]) -> bool:
+        """Whether *pending* stubs save enough to justify re-sending the rest of the turn."""
+        invalidated = sum(self._tokens(m) for m in turn[min(pending) :])
+        return self._saving(turn, pending) >= invalidated * self._MIN_BATCH_SHARE
+
+    def compact(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the messages to send, with stale or old tool results stubbed."""
+        turn = messages[self.turn_start :]
+        results = self._tool_results(turn)
+        if not results:
+            return messages
+
+        stubs = dict(self._applied)
+        pending: dict[int, str] = {}
+        if self.drop_superseded:
+            pending = {
+                index: stub
+                for index, stub in self._superseded(results).items()
+                if index not in stubs and len(turn[index]["content"]) > len(stub)
+            }
+        if self.budget_tokens > 0:
+            total = sum(self._tokens(m) for m in turn) - self._saving(turn, stubs)
+            if total > self.budget_tokens:
+                stubs.update(pending)
+                total -= self._saving(turn, pending)
+                pending = {}
+                target = int(self.budget_tokens * self._BUDGET_HEADROOM)
+                self._condense(turn, results, stubs, total, target)
+        if pending and self._worth_applying(turn, pending):
+            stubs.update(pending)
+        self._applied = stubs
+        if not stubs:
+            return messages
+
+        compacted = list(messages)
+        saved = 0
+        for index, stub in stubs.items():
+            original = turn[index]
+            replacement = {**original, "content": stub}
+            compacted[self.turn_start + index] = replacement
+            saved += self._tokens(original) - estimate_message_tokens(replacement)
+        superseded = sum(1 for stub in stubs.values() if stub.startswith("[superseded"))
+        self.tokens_saved += max(0, saved)
+        self.superseded = superseded
+        self.condensed = len(stubs) - superseded
+        logger.debug(
+            "Turn compaction: {} superseded, {} condensed tool results (~{} tokens)",
+            superseded,
+            len(stubs) - superseded,
+            saved,
+        )
+        return compacted
@@ -32,7 +32,11 @@ class ContextBuilder:
         self.runtime_timezone = runtime_timezone
 
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
-        """Build the system prompt from identity, bootstrap files, memory, and skills."""
+        """Build the system prompt from identity, bootstrap files, skills, and memory.
+
+        Sections are ordered from most to least stable so providers can cache
+        the prompt prefix; memory, which consolidation rewrites, comes last.
+        """
         parts = [self._get_identity()]
         requested_skills = list(dict.fromkeys(skill_names or []))
 
@@ -46,10 +50,6 @@ class ContextBuilder:
                 f"{bootstrap}"
             )
 
-        memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
-
         always_skills = self.skills.get_always_skills()
         if self.memory.is_supermemory():
             always_skills = [name for name in always_skills if name != "memory"]
@@ -74,6 +74,10 @@ Skills with available="false" need dependencies installed first - you can try in
 
 {skills_summary}""")
 
+        memory = self.memory.get_memory_context()
+        if memory:
+            parts.append(f"# Memory\n\n{memory}")
+
         return "\n\n---\n\n".join(parts)
 
     def _get_identity(self) -> str:
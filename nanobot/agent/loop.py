@@ -6,21 +6,31 @@ import asyncio
 import json
 import os
 import time
-from contextlib import AsyncExitStack, nullcontext
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
+from nanobot.agent.artifacts import ArtifactStore
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.hook import AgentHook, AgentHookContext
 from nanobot.agent.memory import MemoryConsolidator
 from nanobot.agent.runner import AgentRunner, AgentRunSpec
 from nanobot.agent.skills import BUILTIN_SKILLS_DIR
 from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.cron import CronTool
-from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
+from nanobot.agent.tools.filesystem import (
+    EditFileTool,
+    GlobTool,
+    GrepTool,
+    ListDirTool,
+    ReadFileTool,
+    WriteFileTool,
+)
+from nanobot.agent.tools.mcp import MCPServerConnection, MCPToolCache, mcp_progress
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
@@ -35,10 +45,12 @@ from nanobot.utils.helpers import should_allow_live_streaming, trim_history_for_
 
 if TYPE_CHECKING:
     from nanobot.config.schema import (
+        ArtifactConfig,
         ChannelsConfig,
         ExecToolConfig,
         InputLimitsConfig,
         MemoryConfig,
+        SubagentConfig,
         WebSearchConfig,
     )
     from nanobot.cron.service import CronService
@@ -56,6 +68,7 @@ class MCPServerStatus:
     error: str | None = None
     checked_at: float | None = None
     session: Any | None = None
+    stats: dict[str, Any] = field(default_factory=dict)
 
 
 class AgentLoop:
@@ -83,6 +96,8 @@ class AgentLoop:
         max_iterations: int = 40,
         context_window_tokens: int = 65_536,
         context_budget_tokens: int = 0,
+        compact_tool_results: bool = True,
+        turn_budget_tokens: int = 0,
         web_search_config: WebSearchConfig | None = None,
         web_proxy: str | None = None,
         exec_config: ExecToolConfig | None = None,
@@ -94,8 +109,19 @@ class AgentLoop:
         channels_config: ChannelsConfig | None = None,
         runtime_timezone: str | None = None,
         memory_config: MemoryConfig | None = None,
+        speculative_tools: bool = False,
+        auxiliary_provider: LLMProvider | None = None,
+        auxiliary_model: str | None = None,
+        subagent_config: SubagentConfig | None = None,
+        mcp_tool_cache_path: Path | None = None,
+        artifact_config: ArtifactConfig | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig, InputLimitsConfig, WebSearchConfig
+        from nanobot.config.schema import (
+            ArtifactConfig,
+            ExecToolConfig,
+            InputLimitsConfig,
+            WebSearchConfig,
+        )
 
         self.bus = bus
         self.channels_config = channels_config
@@ -107,6 +133,8 @@ class AgentLoop:
         self.context_budget_tokens = (
             max(context_budget_tokens, 500) if context_budget_tokens > 0 else 0
         )
+        self.compact_tool_results = compact_tool_results
+        self.turn_budget_tokens = turn_budget_tokens
         self.web_search_config = web_search_config or WebSearchConfig()
         self.web_proxy = web_proxy
         self.exec_config = exec_config or ExecToolConfig()
@@ -114,6 +142,7 @@ class AgentLoop:
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
         self.runtime_timezone = runtime_timezone
+        self.speculative_tools = speculative_tools
         self._start_time = time.time()
         self._last_usage: dict[str, int] = {}
 
@@ -124,6 +153,18 @@ class AgentLoop:
             memory_config=memory_config,
         )
         self.runner = AgentRunner(provider)
+        artifact_config = artifact_config or ArtifactConfig()
+        self.artifacts = (
+            ArtifactStore(
+                workspace,
+                threshold_chars=artifact_config.threshold_chars,
+                preview_chars=artifact_config.preview_chars,
+                max_total_bytes=artifact_config.max_total_mb * 1024 * 1024,
+                ttl_s=artifact_config.ttl_s,
+            )
+            if artifact_config.enabled
+            else None
+        )
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
@@ -136,11 +177,14 @@ class AgentLoop:
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
             runtime_timezone=self.runtime_timezone,
+            config=subagent_config,
+            artifacts=self.artifacts,
         )
 
         self._running = False
         self._mcp_servers = mcp_servers or {}
-        self._mcp_stack: AsyncExitStack | None = None
+        self._mcp_tool_cache_path = mcp_tool_cache_path
+        self._mcp_connections: dict[str, MCPServerConnection] = {}
         self._mcp_lock = asyncio.Lock()
         self._mcp_connected = False
         self._mcp_connecting = False
@@ -163,6 +207,8 @@ class AgentLoop:
             get_tool_definitions=self.tools.get_definitions,
             max_completion_tokens=provider.generation.max_tokens,
             memory_config=memory_config,
+            auxiliary_provider=auxiliary_provider,
+            auxiliary_model=auxiliary_model,
         )
         self._register_default_tools()
         self.commands = CommandRouter()
@@ -199,56 +245,38 @@ class AgentLoop:
         ]:
             self.tools.unregister(name)
 
-    def _set_all_mcp_failed(self, error: str) -> None:
-        """Mark every configured server as failed with the same error message."""
-        checked_at = time.time()
+    def _sync_mcp_status(self, checked: bool = False) -> None:
+        """Update in-memory MCP status from each server's live connection."""
         if not self._mcp_status and self._mcp_servers:
             self._seed_mcp_status()
-        for status in self._mcp_status.values():
-            status.state = "failed"
-            status.error = error
-            status.checked_at = checked_at
-            status.session = None
-            status.available_tools = []
-            status.registered_tools = []
-
-    def _apply_mcp_connect_results(self, results: dict[str, Any]) -> None:
-        """Update in-memory MCP status from connect results."""
         checked_at = time.time()
-        for name, cfg in self._mcp_servers.items():
-            status = self._mcp_status.get(name) or MCPServerStatus(
-                name=name,
-                transport=self._infer_mcp_transport(cfg),
+        for name, connection in self._mcp_connections.items():
+            status = self._mcp_status.setdefault(
+                name,
+                MCPServerStatus(name=name, transport=self._infer_mcp_transport(connection.cfg)),
             )
-            result = results.get(name)
-            if result is None:
-                status.state = "failed"
-                status.error = "No status returned from MCP connector"
-                status.checked_at = checked_at
-                status.session = None
-                status.available_tools = []
-                status.registered_tools = self._mcp_tools_for_server(name)
-                self._mcp_status[name] = status
-                continue
-
+            result = connection.result
             status.transport = result.transport or status.transport
-            status.error = result.error
             status.available_tools = sorted(result.available_tools)
-            status.registered_tools = sorted(result.registered_tools)
-            status.checked_at = checked_at
-            if result.connected:
+            status.registered_tools = self._mcp_tools_for_server(name)
+            status.session = connection.session
+            status.stats = connection.stats.snapshot()
+            if checked:
+                status.checked_at = checked_at
+            if connection.connected:
                 status.state = "connected"
-                status.session = result.session
-            else:
+                status.error = None
+            elif connection.connecting:
+                status.state = "connecting"
+            elif result.error:
                 status.state = "failed"
-                status.session = None
-
-            self._mcp_status[name] = status
+                status.error = result.error
+            else:
+                status.state = "uninitialized"
 
     def get_mcp_status_snapshot(self) -> list[dict[str, Any]]:
         """Return MCP status for all configured servers, sorted by name."""
-        if not self._mcp_status and self._mcp_servers:
-            self._seed_mcp_status()
+        self._sync_mcp_status()
         return [
             {
                 "name": status.name,
@@ -258,12 +286,13 @@ class AgentLoop:
                 "available_tools": list(status.available_tools),
                 "error": status.error,
                 "checked_at": status.checked_at,
+                "stats": dict(status.stats),
             }
             for status in sorted(self._mcp_status.values(), key=lambda item: item.name)
         ]
 
     async def refresh_mcp_status(self, reconnect: bool = False) -> list[dict[str, Any]]:
-        """Refresh MCP connection health, optionally forcing reconnect for all servers."""
+        """Refresh MCP connection health, optionally pinging and reconnecting unhealthy servers."""
         await self._connect_mcp(force_refresh=reconnect)
         return self.get_mcp_status_snapshot()
 
@@ -271,11 +300,10 @@ class AgentLoop:
         """Register the default set of tools."""
         allowed_dir = self.workspace if self.restrict_to_workspace else None
         extra_read = [BUILTIN_SKILLS_DIR] if allowed_dir else None
-        self.tools.register(
-            ReadFileTool(
-                workspace=self.workspace, allowed_dir=allowed_dir, extra_allowed_dirs=extra_read
+        for cls in (ReadFileTool, GlobTool, GrepTool):
+            self.tools.register(
+                cls(workspace=self.workspace, allowed_dir=allowed_dir, extra_allowed_dirs=extra_read)
             )
-        )
         for cls in (WriteFileTool, EditFileTool, ListDirTool):
             self.tools.register(cls(workspace=self.workspace, allowed_dir=allowed_dir))
         if self.exec_config.enable:
@@ -285,6 +313,8 @@ class AgentLoop:
                     timeout=self.exec_config.timeout,
                     restrict_to_workspace=self.restrict_to_workspace,
                     path_append=self.exec_config.path_append,
+                    persistent=self.exec_config.persistent_session,
+                    session_idle_timeout=self.exec_config.session_idle_timeout,
                 )
             )
         self.tools.register(WebSearchTool(config=self.web_search_config, proxy=self.web_proxy))
@@ -294,8 +324,33 @@ class AgentLoop:
         if self.cron_service:
             self.tools.register(CronTool(self.cron_service))
 
+    def _get_mcp_connections(self) -> dict[str, MCPServerConnection]:
+        """Create one connection object per configured MCP server (once)."""
+        if not self._mcp_connections and self._mcp_servers:
+            cache = MCPToolCache(self._mcp_tool_cache_path) if self._mcp_tool_cache_path else None
+            self._mcp_connections = {
+                name: MCPServerConnection(name, cfg, self.tools, cache, artifacts=self.artifacts)
+                for name, cfg in self._mcp_servers.items()
+            }
+        return self._mcp_connections
+
+    def _register_cached_mcp_tools(self) -> None:
+        """Expose cached MCP tool lists right away, before any server has connected."""
+        for connection in self._get_mcp_connections().values():
+            connection.register_cached_tools()
+
+    async def _close_mcp_connections(self) -> None:
+        await asyncio.gather(
+            *(connection.shutdown() for connection in self._mcp_connections.values()),
+            return_exceptions=True,
+        )
+
     async def _connect_mcp(self, force_refresh: bool = False) -> None:
-        """Connect to configured MCP servers (one-time, lazy)."""
+        """Connect to configured MCP servers in parallel (one-time, lazy).
+
+        With *force_refresh*, servers that are already up are pinged and only
+        the unreachable ones are reconnected; healthy sessions are left alone.
+        """
         if self._mcp_connecting or not self._mcp_servers:
             return
 
@@ -306,37 +361,26 @@ class AgentLoop:
                 return
 
             self._mcp_connecting = True
-            from nanobot.agent.tools.mcp import connect_mcp_servers
-
             try:
-                if force_refresh:
-                    self._unregister_all_mcp_tools()
-                    if self._mcp_stack:
-                        try:
-                            await self._mcp_stack.aclose()
-                        except (RuntimeError, BaseExceptionGroup):
-                            pass
-                        self._mcp_stack = None
-
-                if self._mcp_stack is None:
-                    self._mcp_stack = AsyncExitStack()
-                    await self._mcp_stack.__aenter__()
-
-                results = await connect_mcp_servers(self._mcp_servers, self.tools, self._mcp_stack)
-                self._apply_mcp_connect_results(results)
+                connections = self._get_mcp_connections()
+                if self._mcp_connected:
+                    outcomes = await asyncio.gather(
+                        *(connection.check() for connection in connections.values()),
+                        return_exceptions=True,
+                    )
+                else:
+                    outcomes = await asyncio.gather(
+                        *(connection.connect() for connection in connections.values()),
+                        return_exceptions=True,
+                    )
+                for connection, outcome in zip(connections.values(), outcomes):
+                    if isinstance(outcome, BaseException):
+                        logger.error("MCP server '{}': connect failed: {}", connection.name, outcome)
+                        connection.result.error = f"{type(outcome).__name__}: {outcome}"
+                    connection.start_health_checks()
+                self._sync_mcp_status(checked=True)
                 # Mark initialized after one connect attempt to avoid reconnecting every message.
                 self._mcp_connected = True
-            except BaseException as e:
-                logger.error("Failed to connect MCP servers (will retry on /mcp): {}", e)
-                if self._mcp_stack:
-                    try:
-                        await self._mcp_stack.aclose()
-                    except (RuntimeError, BaseExceptionGroup):
-                        pass
-                    self._mcp_stack = None
-                self._unregister_all_mcp_tools()
-                self._set_all_mcp_failed(f"{type(e).__name__}: {e}")
-                self._mcp_connected = True
             finally:
                 self._mcp_connecting = False
 
@@ -364,6 +408,9 @@ class AgentLoop:
         if tool := self.tools.get("cron"):
             if hasattr(tool, "set_context"):
                 tool.set_context(channel, chat_id)
+        if tool := self.tools.get("exec"):
+            if hasattr(tool, "set_context"):
+                tool.set_context(session_key or f"{channel}:{chat_id}")
 
     def _get_effective_reasoning_effort(self, session: Session) -> str | None:
         """Resolve the effective reasoning effort for the given session."""
@@ -513,6 +560,11 @@ class AgentLoop:
                     if ((td.get("function") or {}).get("name") not in self._blocked)
                 ]
 
+            def get(self, tool_name: str) -> Tool | None:
+                if tool_name in self._blocked:
+                    return None
+                return self._registry.get(tool_name)
+
             async def execute(self, tool_name: str, arguments: dict[str, Any]) -> Any:
                 if tool_name in self._blocked:
                     return f"Error: Tool '{tool_name}' is disabled in this context"
@@ -556,8 +608,9 @@ class AgentLoop:
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, args_str[:200])
 
-                # Re-bind tool context right before execution so that
-                # concurrent sessions don't clobber each other's routing.
+                # Tool routing lives in context variables, so each session's task
+                # keeps its own; re-bind it anyway in case this hook runs in a
+                # task created before the turn set it.
                 self._loop._set_tool_context(
                     channel,
                     chat_id,
@@ -593,18 +646,29 @@ class AgentLoop:
             ) -> str | None:
                 return self._loop._strip_think(content)
 
-        result = await self.runner.run(
-            AgentRunSpec(
-                initial_messages=messages,
-                tools=_ScopedTools(self.tools, blocked_tools),
-                model=self.model,
-                max_iterations=self.max_iterations,
-                reasoning_effort=reasoning_effort,
-                hook=_LoopHook(self, turn_start_index, on_stream, on_stream_end),
-                concurrent_tools=True,
+        with mcp_progress(on_progress):
+            result = await self.runner.run(
+                AgentRunSpec(
+                    initial_messages=messages,
+                    tools=_ScopedTools(self.tools, blocked_tools),
+                    model=self.model,
+                    max_iterations=self.max_iterations,
+                    reasoning_effort=reasoning_effort,
+                    hook=_LoopHook(self, turn_start_index, on_stream, on_stream_end),
+                    concurrent_tools=True,
+                    speculative_tools=self.speculative_tools,
+                    artifacts=self.artifacts,
+                    compact_tool_results=self.compact_tool_results,
+                    turn_budget_tokens=self.turn_budget_tokens,
+                )
             )
-        )
         self._last_usage = dict(result.usage)
+        if result.compacted_tokens:
+            logger.info(
+                "Turn compaction saved ~{} prompt tokens over {} tool calls",
+                result.compacted_tokens,
+                len(result.tools_used),
+            )
 
         if result.stop_reason == "error":
             logger.error("LLM returned error: {}", (result.error or "")[:200])
@@ -616,7 +680,11 @@ class AgentLoop:
     async def run(self) -> None:
         """Run the agent loop, dispatching messages as tasks to stay responsive to /stop."""
         self._running = True
-        await self._connect_mcp()
+        if self._mcp_servers:
+            # Servers handshake in the background; cached tool lists make their
+            # tools callable (connecting on first use) before that finishes.
+            self._register_cached_mcp_tools()
+            self._schedule_background(self._connect_mcp(), label="MCP connect")
         logger.info("Agent loop started")
 
         while self._running:
@@ -716,17 +784,14 @@ class AgentLoop:
                 )
 
     async def close_mcp(self) -> None:
-        """Drain pending background archives, then close MCP connections."""
+        """Drain pending background archives, then close MCP connections and shells."""
         if self._background_tasks:
             await asyncio.gather(*self._background_tasks, return_exceptions=True)
             self._background_tasks.clear()
+        if isinstance(exec_tool := self.tools.get("exec"), ExecTool):
+            await exec_tool.close_sessions()
         self._unregister_all_mcp_tools()
-        if self._mcp_stack:
-            try:
-                await self._mcp_stack.aclose()
-            except (RuntimeError, BaseExceptionGroup):
-                pass  # MCP SDK cancel scope cleanup is noisy but harmless
-            self._mcp_stack = None
+        await self._close_mcp_connections()
         self._mcp_connected = False
         for status in self._mcp_status.values():
             status.state = "uninitialized"
@@ -910,7 +975,7 @@ class AgentLoop:
             label="post-turn memory",
         )
 
-        if (mt := self.tools.get("message")) and isinstance(mt, MessageTool) and mt._sent_in_turn:
+        if (mt := self.tools.get("message")) and isinstance(mt, MessageTool) and mt.sent_in_turn:
             return None
 
         preview = final_content[:120] + "..." if len(final_content) > 120 else final_content
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import re
 import weakref
 from datetime import datetime
 from pathlib import Path
@@ -12,6 +13,7 @@ from typing import TYPE_CHECKING, Any, Callable, Literal, cast
 from loguru import logger
 
 from nanobot.config.schema import MemoryConfig
+from nanobot.providers.scheduler import request_priority
 from nanobot.utils.helpers import estimate_message_tokens, estimate_prompt_tokens_chain
 
 from .local import LocalMemoryBackend
@@ -129,10 +131,47 @@ Examples:
 - skip: "I reran the command and got a timeout once."
 - skip: "Thanks"""
 
+_MEMORY_DECISION_BATCH_TOOL = [
+    {
+        "type": "function",
+        "function": {
+            "name": "memory_decision",
+            "description": "Decide whether one numbered exchange should be persisted immediately as durable memory.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "exchange": {
+                        "type": "integer",
+                        "description": "Number of the exchange this decision is for.",
+                    },
+                    **_MEMORY_DECISION_TOOL[0]["function"]["parameters"]["properties"],
+                },
+                "required": ["exchange", "action"],
+            },
+        },
+    }
+]
+
+_MEMORY_DECISION_BATCH_SYSTEM_PROMPT = (
+    _MEMORY_DECISION_SYSTEM_PROMPT
+    + "\n\nYou will be shown several numbered, unrelated exchanges. Call memory_decision once "
+    "per exchange, setting exchange to its number."
+)
+
 MemoryDecisionAction = Literal["skip", "summary", "both"]
 _MEMORY_DECISION_DEFAULT_ACTION: MemoryDecisionAction = "skip"
 _MEMORY_DECISION_ACTIONS: tuple[MemoryDecisionAction, ...] = ("skip", "summary", "both")
 
+# Greetings and acknowledgements never carry durable memory, so they skip the model call.
+# Yes/no answers are left out: replying to "Should I remember you're vegetarian?" carries
+# exactly the kind of fact memory is for.
+_TRIVIAL_USER_RE = re.compile(
+    r"hi|hey|hello|hiya|yo|thanks?( you)?( so much)?|thx|ty|ok(ay)?|k|cool|nice|great|"
+    r"got it|sounds good|bye|good ?(morning|afternoon|evening|night)",
+    re.IGNORECASE,
+)
+_TRIVIAL_REPLY_MAX_CHARS = 280
+
 
 def _ensure_text(value: Any) -> str:
     """Normalize tool-call payload values to text for file storage."""
@@ -165,6 +204,24 @@ _TOOL_CHOICE_ERROR_MARKERS = (
 )
 
 
+def _is_trivial_exchange(messages: list[dict[str, object]]) -> bool:
+    """Return True for a plain greeting/acknowledgement answered with a short reply."""
+    users = [m for m in messages if m.get("role") == "user"]
+    if not users or any(m.get("role") not in {"user", "assistant"} for m in messages):
+        return False
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, str) or message.get("tool_calls"):
+            return False
+        if message["role"] == "user":
+            words = re.sub(r"[\W_]+", " ", content).strip()
+            if not words or not _TRIVIAL_USER_RE.fullmatch(words):
+                return False
+        elif len(content) > _TRIVIAL_REPLY_MAX_CHARS:
+            return False
+    return True
+
+
 def _is_tool_choice_unsupported(content: str | None) -> bool:
     """Detect provider errors caused by forced tool_choice being unsupported."""
     text = (content or "").lower()
@@ -251,9 +308,10 @@ class MemoryStore:
         if not messages:
             return True
 
-        if self.is_supermemory():
-            return await self._consolidate_supermemory(messages, provider, model)
-        return await self._consolidate_local(messages, provider, model)
+        with request_priority("background"):
+            if self.is_supermemory():
+                return await self._consolidate_supermemory(messages, provider, model)
+            return await self._consolidate_local(messages, provider, model)
 
     async def _consolidate_local(
         self,
@@ -287,6 +345,7 @@ class MemoryStore:
                 tools=_SAVE_MEMORY_TOOL,
                 model=model,
                 tool_choice=forced,
+                cache=True,
             )
 
             if response.finish_reason == "error" and _is_tool_choice_unsupported(response.content):
@@ -296,6 +355,7 @@ class MemoryStore:
                     tools=_SAVE_MEMORY_TOOL,
                     model=model,
                     tool_choice="auto",
+                    cache=True,
                 )
 
             if not response.has_tool_calls:
@@ -388,6 +448,7 @@ short mappings like "X = Y". Use short labeled lines when helpful.
                 tools=_SAVE_SUPERMEMORY_SUMMARY_TOOL,
                 model=model,
                 tool_choice=forced,
+                cache=True,
             )
 
             if response.finish_reason == "error" and _is_tool_choice_unsupported(response.content):
@@ -397,6 +458,7 @@ short mappings like "X = Y". Use short labeled lines when helpful.
                     tools=_SAVE_SUPERMEMORY_SUMMARY_TOOL,
                     model=model,
                     tool_choice="auto",
+                    cache=True,
                 )
 
             if not response.has_tool_calls:
@@ -463,6 +525,109 @@ short mappings like "X = Y". Use short labeled lines when helpful.
         logger.warning("Memory consolidation degraded: raw-archived {} messages", len(messages))
 
 
+class MemoryDecisionBatcher:
+    """Coalesce post-turn memory decisions from concurrent turns into shared model calls.
+
+    Decisions wait up to ``window_s`` (or until ``max_items`` are queued) and
+    are then decided together by :meth:`MemoryConsolidator.decide_turn_memory_actions`.
+    A lone decision, and any exchange the batch call failed to answer, goes
+    through the single-exchange path.  Callers still hold their session lock
+    while waiting, so per-session ordering is unchanged.
+    """
+
+    def __init__(self, consolidator: MemoryConsolidator, max_items: int = 8, window_s: float = 0.25):
+        self._consolidator = consolidator
+        self.max_items = max_items
+        self.window_s = window_s
+        self.turns = 0
+        self.calls = 0
+        self._pending: list[tuple[list[dict[str, object]], asyncio.Future[MemoryDecisionAction]]] = []
+        self._timer: asyncio.Task[None] | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    @property
+    def calls_per_turn(self) -> float:
+        """Amortized memory-decision model calls per completed turn."""
+        return self.calls / self.turns if self.turns else 0.0
+
+    async def decide(self, messages: list[dict[str, object]]) -> MemoryDecisionAction:
+        if _is_trivial_exchange(messages):
+            self.turns += 1
+            return "skip"
+        if self.max_items <= 1:
+            self.turns += 1
+            self.calls += 1
+            return await self._consolidator.decide_turn_memory_action(messages)
+
+        future: asyncio.Future[MemoryDecisionAction] = asyncio.get_running_loop().create_future()
+        self._pending.append((messages, future))
+        if len(self._pending) >= self.max_items:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            task = asyncio.create_task(self._run(self._take()))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    def _take(self) -> list[tuple[list[dict[str, object]], asyncio.Future[MemoryDecisionAction]]]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_s)
+        self._timer = None
+        await self._run(self._take())
+
+    async def _run(
+        self, batch: list[tuple[list[dict[str, object]], asyncio.Future[MemoryDecisionAction]]]
+    ) -> None:
+        batch = [(messages, future) for messages, future in batch if not future.done()]
+        if not batch:
+            return
+        consolidator = self._consolidator
+        self.turns += len(batch)
+        self.calls += 1
+        try:
+            if len(batch) == 1:
+                actions: list[MemoryDecisionAction | None] = [
+                    await consolidator.decide_turn_memory_action(batch[0][0])
+                ]
+            else:
+                actions = await consolidator.decide_turn_memory_actions([m for m, _ in batch])
+        except Exception:
+            logger.exception("Memory decision batch failed, falling back to single calls")
+            actions = [None] * len(batch)
+
+        async def _resolve(
+            messages: list[dict[str, object]],
+            future: asyncio.Future[MemoryDecisionAction],
+            action: MemoryDecisionAction | None,
+        ) -> None:
+            if action is None:
+                self.calls += 1
+                try:
+                    action = await consolidator.decide_turn_memory_action(messages)
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                    return
+            if not future.done():
+                future.set_result(action)
+
+        await asyncio.gather(*(
+            _resolve(messages, future, action)
+            for (messages, future), action in zip(batch, actions)
+        ))
+        logger.debug(
+            "Memory decision: batch of {} resolved, {:.2f} model calls per turn",
+            len(batch),
+            self.calls_per_turn,
+        )
+
+
 class MemoryConsolidator:
     """Owns consolidation policy, locking, and session offset updates."""
 
@@ -480,16 +645,27 @@ class MemoryConsolidator:
         get_tool_definitions: Callable[[], list[dict[str, Any]]],
         max_completion_tokens: int = 4096,
         memory_config: MemoryConfig | None = None,
+        auxiliary_provider: LLMProvider | None = None,
+        auxiliary_model: str | None = None,
     ):
         self.store = MemoryStore(workspace, memory_config=memory_config)
         self.provider = provider
         self.model = model
+        # Memory decisions and consolidation run on the auxiliary model when configured.
+        self.aux_provider = auxiliary_provider or provider
+        self.aux_model = auxiliary_model or model
         self.sessions = sessions
         self.context_window_tokens = context_window_tokens
         self.max_completion_tokens = max_completion_tokens
         self._build_messages = build_messages
         self._get_tool_definitions = get_tool_definitions
         self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        memory_config = memory_config or MemoryConfig()
+        self.decisions = MemoryDecisionBatcher(
+            self,
+            max_items=memory_config.decision_batch_size,
+            window_s=memory_config.decision_batch_window_s,
+        )
 
     def get_lock(self, session_key: str) -> asyncio.Lock:
         """Return the shared consolidation lock for one session."""
@@ -497,7 +673,7 @@ class MemoryConsolidator:
 
     async def consolidate_messages(self, messages: list[dict[str, object]]) -> bool:
         """Archive a selected message chunk into persistent memory."""
-        return await self.store.consolidate(messages, self.provider, self.model)
+        return await self.store.consolidate(messages, self.aux_provider, self.aux_model)
 
     def pick_consolidation_boundary(
         self,
@@ -565,6 +741,9 @@ class MemoryConsolidator:
         """Use the model to pick immediate persistence action for a completed exchange."""
         if not messages:
             return _MEMORY_DECISION_DEFAULT_ACTION
+        if _is_trivial_exchange(messages):
+            logger.debug("Memory decision: trivial exchange, skipping model call")
+            return "skip"
 
         prompt = f"""Review this completed exchange and call the memory_decision tool.
 
@@ -573,34 +752,38 @@ class MemoryConsolidator:
 
         try:
             forced = {"type": "function", "function": {"name": "memory_decision"}}
-            response = await self.provider.chat_with_retry(
-                messages=[
-                    {"role": "system", "content": _MEMORY_DECISION_SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                tools=_MEMORY_DECISION_TOOL,
-                model=self.model,
-                tool_choice=forced,
-                max_tokens=256,
-                temperature=0.0,
-            )
-
-            if response.finish_reason == "error" and _is_tool_choice_unsupported(response.content):
-                logger.warning(
-                    "Forced tool_choice unsupported for memory_decision, retrying with auto"
-                )
-                response = await self.provider.chat_with_retry(
+            with request_priority("background"):
+                response = await self.aux_provider.chat_with_retry(
                     messages=[
                         {"role": "system", "content": _MEMORY_DECISION_SYSTEM_PROMPT},
                         {"role": "user", "content": prompt},
                     ],
                     tools=_MEMORY_DECISION_TOOL,
-                    model=self.model,
-                    tool_choice="auto",
+                    model=self.aux_model,
+                    tool_choice=forced,
                     max_tokens=256,
                     temperature=0.0,
+                    cache=True,
                 )
 
+            if response.finish_reason == "error" and _is_tool_choice_unsupported(response.content):
+                logger.warning(
+                    "Forced tool_choice unsupported for memory_decision, retrying with auto"
+                )
+                with request_priority("background"):
+                    response = await self.aux_provider.chat_with_retry(
+                        messages=[
+                            {"role": "system", "content": _MEMORY_DECISION_SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt},
+                        ],
+                        tools=_MEMORY_DECISION_TOOL,
+                        model=self.aux_model,
+                        tool_choice="auto",
+                        max_tokens=256,
+                        temperature=0.0,
+                        cache=True,
+                    )
+
             if not response.has_tool_calls:
                 logger.warning(
                     "Memory decision: LLM did not call memory_decision (finish_reason={}, content_preview={})",
@@ -632,6 +815,52 @@ class MemoryConsolidator:
             logger.exception("Memory decision failed")
             return _MEMORY_DECISION_DEFAULT_ACTION
 
+    async def decide_turn_memory_actions(
+        self, exchanges: list[list[dict[str, object]]]
+    ) -> list[MemoryDecisionAction | None]:
+        """Decide several exchanges with one model call.
+
+        Returns one action per exchange; ``None`` marks an exchange the model
+        did not answer for, which the caller should decide on its own.
+        """
+        sections = [
+            f"## Exchange {i}\n{self.store._format_messages(messages)}"
+            for i, messages in enumerate(exchanges, start=1)
+        ]
+        prompt = (
+            "Review these completed exchanges and call the memory_decision tool once for each.\n\n"
+            + "\n\n".join(sections)
+        )
+        with request_priority("background"):
+            response = await self.aux_provider.chat_with_retry(
+                messages=[
+                    {"role": "system", "content": _MEMORY_DECISION_BATCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                tools=_MEMORY_DECISION_BATCH_TOOL,
+                model=self.aux_model,
+                tool_choice="auto",
+                max_tokens=64 + 128 * len(exchanges),
+                temperature=0.0,
+                cache=True,
+            )
+
+        actions: list[MemoryDecisionAction | None] = [None] * len(exchanges)
+        if response.finish_reason == "error":
+            logger.warning("Memory decision batch failed: {}", (response.content or "")[:200])
+            return actions
+        for call in response.tool_calls:
+            args = _normalize_save_memory_args(call.arguments)
+            if call.name != "memory_decision" or args is None:
+                continue
+            try:
+                index = int(args.get("exchange", 0)) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(actions) and actions[index] is None:
+                actions[index] = _normalize_memory_action(str(args.get("action", "")))
+        return actions
+
     async def process_post_turn_memory(
         self,
         session_key: str,
@@ -641,7 +870,7 @@ class MemoryConsolidator:
         lock = self.get_lock(session_key)
         async with lock:
             if messages:
-                action = await self.decide_turn_memory_action(messages)
+                action = await self.decisions.decide(messages)
                 if action in {"summary", "both"}:
                     await self.remember_messages(messages)
                     if action == "both" and not await self.store.save_raw_turn(messages):
@@ -6,6 +6,8 @@ import asyncio
 from dataclasses import dataclass, field
 from typing import Any
 
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.compaction import TurnCompactor
 from nanobot.agent.hook import AgentHook, AgentHookContext
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.providers.base import LLMProvider, ToolCallRequest
@@ -34,6 +36,10 @@ class AgentRunSpec:
     max_iterations_message: str | None = None
     concurrent_tools: bool = False
     fail_on_tool_error: bool = False
+    speculative_tools: bool = False
+    artifacts: ArtifactStore | None = None
+    compact_tool_results: bool = False
+    turn_budget_tokens: int = 0
 
 
 @dataclass(slots=True)
@@ -47,6 +53,7 @@ class AgentRunResult:
     stop_reason: str = "completed"
     error: str | None = None
     tool_events: list[dict[str, str]] = field(default_factory=list)
+    compacted_tokens: int = 0
 
 
 class AgentRunner:
@@ -64,9 +71,20 @@ class AgentRunner:
         error: str | None = None
         stop_reason = "completed"
         tool_events: list[dict[str, str]] = []
+        compactor = (
+            TurnCompactor(
+                len(messages),
+                drop_superseded=spec.compact_tool_results,
+                budget_tokens=spec.turn_budget_tokens,
+            )
+            if spec.compact_tool_results or spec.turn_budget_tokens > 0
+            else None
+        )
 
         for iteration in range(spec.max_iterations):
-            context = AgentHookContext(iteration=iteration, messages=messages)
+            # Only the request copy is compacted; ``messages`` keeps full results.
+            request_messages = compactor.compact(messages) if compactor else messages
+            context = AgentHookContext(iteration=iteration, messages=request_messages)
             await hook.before_iteration(context)
 
             kwargs: dict[str, Any] = {
@@ -81,15 +99,39 @@ class AgentRunner:
             if spec.reasoning_effort is not None:
                 kwargs["reasoning_effort"] = spec.reasoning_effort
 
-            if hook.wants_streaming():
+            # Parallel-safe tool calls that finish streaming early start right
+            # away; their tasks are joined after the stream ends.
+            started: list[tuple[ToolCallRequest, asyncio.Task]] = []
 
-                async def _stream(delta: str) -> None:
-                    await hook.on_stream(context, delta)
+            if hook.wants_streaming() or spec.speculative_tools:
+                stream_kwargs: dict[str, Any] = {}
+                if hook.wants_streaming():
 
-                response = await self.provider.chat_stream_with_retry(
-                    **kwargs,
-                    on_content_delta=_stream,
-                )
+                    async def _stream(delta: str) -> None:
+                        await hook.on_stream(context, delta)
+
+                    stream_kwargs["on_content_delta"] = _stream
+                if spec.speculative_tools:
+
+                    async def _dispatch(tool_call: ToolCallRequest) -> None:
+                        tool = spec.tools.get(tool_call.name)
+                        if tool is not None and tool.parallel_safe:
+                            started.append((
+                                tool_call,
+                                asyncio.create_task(self._run_tool(spec, tool_call)),
+                            ))
+
+                    stream_kwargs["on_tool_call"] = _dispatch
+
+                try:
+                    response = await self.provider.chat_stream_with_retry(
+                        **kwargs,
+                        **stream_kwargs,
+                    )
+                except BaseException:
+                    for _, task in started:
+                        task.cancel()
+                    raise
             else:
                 response = await self.provider.chat_with_retry(**kwargs)
 
@@ -123,7 +165,7 @@ class AgentRunner:
                 await hook.before_execute_tools(context)
 
                 results, new_events, fatal_error = await self._execute_tools(
-                    spec, response.tool_calls
+                    spec, response.tool_calls, started
                 )
                 tool_events.extend(new_events)
                 context.tool_results = list(results)
@@ -137,6 +179,11 @@ class AgentRunner:
                     break
 
                 for tool_call, result in zip(response.tool_calls, results):
+                    if spec.artifacts is not None:
+                        # Large outputs would be resent on every later iteration.
+                        result = await spec.artifacts.offload(
+                            tool_call.name, tool_call.arguments, result
+                        )
                     messages.append(
                         {
                             "role": "tool",
@@ -148,6 +195,9 @@ class AgentRunner:
                 await hook.after_iteration(context)
                 continue
 
+            for _, task in started:
+                task.cancel()
+
             if hook.wants_streaming():
                 await hook.on_stream_end(context, resuming=False)
 
@@ -187,19 +237,34 @@ class AgentRunner:
             stop_reason=stop_reason,
             error=error,
             tool_events=tool_events,
+            compacted_tokens=compactor.tokens_saved if compactor else 0,
         )
 
     async def _execute_tools(
         self,
         spec: AgentRunSpec,
         tool_calls: list[ToolCallRequest],
+        started: list[tuple[ToolCallRequest, asyncio.Task]] | None = None,
     ) -> tuple[list[Any], list[dict[str, str]], BaseException | None]:
+        early = {id(tool_call): task for tool_call, task in started or ()}
+        claimed = [early.pop(id(tool_call), None) for tool_call in tool_calls]
+        # Calls dispatched from a stream attempt that was later retried.
+        for task in early.values():
+            task.cancel()
+
+        async def _run(tool_call: ToolCallRequest, task: asyncio.Task | None):
+            if task is not None:
+                return await task
+            return await self._run_tool(spec, tool_call)
+
         if spec.concurrent_tools:
             tool_results = await asyncio.gather(
-                *(self._run_tool(spec, tool_call) for tool_call in tool_calls)
+                *(_run(tool_call, task) for tool_call, task in zip(tool_calls, claimed))
             )
         else:
-            tool_results = [await self._run_tool(spec, tool_call) for tool_call in tool_calls]
+            tool_results = [
+                await _run(tool_call, task) for tool_call, task in zip(tool_calls, claimed)
+            ]
 
         results: list[Any] = []
         events: list[dict[str, str]] = []
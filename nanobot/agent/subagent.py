@@ -3,17 +3,29 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import json
+import time
 import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, AsyncIterator, Literal
 
 from loguru import logger
 
 from nanobot.agent.hook import AgentHook, AgentHookContext
 from nanobot.agent.runner import AgentRunner, AgentRunSpec
 from nanobot.agent.skills import BUILTIN_SKILLS_DIR
-from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
+from nanobot.agent.tools.filesystem import (
+    EditFileTool,
+    GlobTool,
+    GrepTool,
+    ListDirTool,
+    ReadFileTool,
+    WriteFileTool,
+)
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
@@ -21,13 +33,36 @@ from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.config.schema import ExecToolConfig
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.scheduler import request_priority
 
 if TYPE_CHECKING:
-    from nanobot.config.schema import WebSearchConfig
+    from nanobot.agent.artifacts import ArtifactStore
+    from nanobot.config.schema import SubagentConfig, WebSearchConfig
+
+
+@dataclass
+class SubagentInfo:
+    """Status of one spawned subagent."""
+
+    task_id: str
+    label: str
+    session_key: str | None
+    state: Literal["queued", "running"] = "queued"
+    queued_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+
+
+class _BudgetExceededError(Exception):
+    """Raised from the subagent hook once its token budget is spent."""
 
 
 class SubagentManager:
-    """Manages background subagent execution."""
+    """Manages background subagent execution.
+
+    Spawned subagents run in a bounded pool: at most ``max_concurrent`` run at
+    once and the rest wait in a priority queue (FIFO within a priority).  All
+    subagents share one tool registry, since its tools keep no per-run state.
+    """
 
     def __init__(
         self,
@@ -40,8 +75,10 @@ class SubagentManager:
         exec_config: ExecToolConfig | None = None,
         restrict_to_workspace: bool = False,
         runtime_timezone: str | None = None,
+        config: SubagentConfig | None = None,
+        artifacts: ArtifactStore | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig, WebSearchConfig
+        from nanobot.config.schema import ExecToolConfig, SubagentConfig, WebSearchConfig
 
         self.provider = provider
         self.workspace = workspace
@@ -52,9 +89,16 @@ class SubagentManager:
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
         self.runtime_timezone = runtime_timezone
+        self.config = config or SubagentConfig()
+        self.artifacts = artifacts
         self.runner = AgentRunner(provider)
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
         self._session_tasks: dict[str, set[str]] = {}  # session_key -> {task_id, ...}
+        self._subagents: dict[str, SubagentInfo] = {}
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._waiter_seq = itertools.count()
+        self._tools: ToolRegistry | None = None
 
     async def spawn(
         self,
@@ -64,21 +108,28 @@ class SubagentManager:
         origin_chat_id: str = "direct",
         session_key: str | None = None,
         reasoning_effort: str | None = None,
+        priority: int = 0,
     ) -> str:
-        """Spawn a subagent to execute a task in the background."""
+        """Spawn a subagent to execute a task in the background.
+
+        Lower ``priority`` values start first when the pool is full.
+        """
         task_id = str(uuid.uuid4())[:8]
         display_label = label or task[:30] + ("..." if len(task) > 30 else "")
         origin = {"channel": origin_channel, "chat_id": origin_chat_id}
 
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin, reasoning_effort)
-        )
+        self._subagents[task_id] = SubagentInfo(task_id, display_label, session_key)
+        with request_priority("background"):
+            bg_task = asyncio.create_task(
+                self._run_pooled(task_id, priority, task, display_label, origin, reasoning_effort)
+            )
         self._running_tasks[task_id] = bg_task
         if session_key:
             self._session_tasks.setdefault(session_key, set()).add(task_id)
 
         def _cleanup(_: asyncio.Task) -> None:
             self._running_tasks.pop(task_id, None)
+            self._subagents.pop(task_id, None)
             if session_key and (ids := self._session_tasks.get(session_key)):
                 ids.discard(task_id)
                 if not ids:
@@ -89,6 +140,82 @@ class SubagentManager:
         logger.info("Spawned subagent [{}]: {}", task_id, display_label)
         return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
 
+    @asynccontextmanager
+    async def _slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold one of the pool's run slots, waiting in priority order if it is full."""
+        limit = self.config.max_concurrent
+        if limit <= 0 or (self._active < limit and not self._waiters):
+            self._active += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._waiter_seq), waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release_slot()  # the slot was handed over as we were cancelled
+                raise
+        try:
+            yield
+        finally:
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        """Hand a freed slot to the next live waiter, or return it to the pool."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    async def _run_pooled(
+        self,
+        task_id: str,
+        priority: int,
+        task: str,
+        label: str,
+        origin: dict[str, str],
+        reasoning_effort: str | None,
+    ) -> None:
+        """Wait for a pool slot, then run the subagent."""
+        async with self._slot(priority):
+            if info := self._subagents.get(task_id):
+                info.state = "running"
+                info.started_at = time.monotonic()
+            await self._run_subagent(task_id, task, label, origin, reasoning_effort)
+
+    def _get_tools(self) -> ToolRegistry:
+        """Build the subagent tool registry once (no message tool, no spawn tool)."""
+        if self._tools is not None:
+            return self._tools
+        tools = ToolRegistry()
+        allowed_dir = self.workspace if self.restrict_to_workspace else None
+        extra_read = [BUILTIN_SKILLS_DIR] if allowed_dir else None
+        for cls in (ReadFileTool, GlobTool, GrepTool):
+            tools.register(
+                cls(
+                    workspace=self.workspace,
+                    allowed_dir=allowed_dir,
+                    extra_allowed_dirs=extra_read,
+                )
+            )
+        tools.register(WriteFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
+        tools.register(EditFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
+        tools.register(ListDirTool(workspace=self.workspace, allowed_dir=allowed_dir))
+        tools.register(
+            ExecTool(
+                working_dir=str(self.workspace),
+                timeout=self.exec_config.timeout,
+                restrict_to_workspace=self.restrict_to_workspace,
+                path_append=self.exec_config.path_append,
+            )
+        )
+        tools.register(WebSearchTool(config=self.web_search_config, proxy=self.web_proxy))
+        tools.register(WebFetchTool(proxy=self.web_proxy))
+        self._tools = tools
+        return tools
+
     async def _run_subagent(
         self,
         task_id: str,
@@ -101,36 +228,30 @@ class SubagentManager:
         logger.info("Subagent [{}] starting task: {}", task_id, label)
 
         try:
-            # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
-            allowed_dir = self.workspace if self.restrict_to_workspace else None
-            extra_read = [BUILTIN_SKILLS_DIR] if allowed_dir else None
-            tools.register(
-                ReadFileTool(
-                    workspace=self.workspace, allowed_dir=allowed_dir, extra_allowed_dirs=extra_read
-                )
-            )
-            tools.register(WriteFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(EditFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(ListDirTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(
-                ExecTool(
-                    working_dir=str(self.workspace),
-                    timeout=self.exec_config.timeout,
-                    restrict_to_workspace=self.restrict_to_workspace,
-                    path_append=self.exec_config.path_append,
-                )
-            )
-            tools.register(WebSearchTool(config=self.web_search_config, proxy=self.web_proxy))
-            tools.register(WebFetchTool(proxy=self.web_proxy))
-
+            tools = self._get_tools()
             system_prompt = self._build_subagent_prompt()
             messages: list[dict[str, Any]] = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": task},
             ]
 
+            token_budget = self.config.max_tokens
+
             class _SubagentHook(AgentHook):
+                def __init__(self) -> None:
+                    self.tokens_used = 0
+
+                async def before_iteration(self, context: AgentHookContext) -> None:
+                    if token_budget > 0 and self.tokens_used >= token_budget:
+                        raise _BudgetExceededError(
+                            f"subagent used {self.tokens_used} tokens, "
+                            f"over its {token_budget} token budget"
+                        )
+
+                async def after_iteration(self, context: AgentHookContext) -> None:
+                    self.tokens_used += context.usage.get("prompt_tokens", 0)
+                    self.tokens_used += context.usage.get("completion_tokens", 0)
+
                 async def before_execute_tools(self, context: AgentHookContext) -> None:
                     for tool_call in context.tool_calls:
                         args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
@@ -141,17 +262,22 @@ class SubagentManager:
                             args_str,
                         )
 
-            result = await self.runner.run(
+            run = self.runner.run(
                 AgentRunSpec(
                     initial_messages=messages,
                     tools=tools,
                     model=self.model,
-                    max_iterations=15,
+                    max_iterations=self.config.max_iterations,
                     reasoning_effort=reasoning_effort,
                     max_iterations_message="Task completed but no final response was generated.",
                     hook=_SubagentHook(),
+                    artifacts=self.artifacts,
                 )
             )
+            if self.config.timeout_s > 0:
+                result = await asyncio.wait_for(run, timeout=self.config.timeout_s)
+            else:
+                result = await run
             final_result = (
                 result.final_content or "Task completed but no final response was generated."
             )
@@ -167,6 +293,11 @@ class SubagentManager:
                 logger.error("Subagent [{}] failed: {}", task_id, final_result)
             await self._announce_result(task_id, label, task, final_result, origin, status)
 
+        except asyncio.TimeoutError:
+            error_msg = f"Error: subagent exceeded its {self.config.timeout_s}s time budget"
+            logger.error("Subagent [{}] timed out after {}s", task_id, self.config.timeout_s)
+            await self._announce_result(task_id, label, task, error_msg, origin, "error")
+
         except Exception as e:
             error_msg = f"Error: {str(e)}"
             logger.error("Subagent [{}] failed: {}", task_id, e)
@@ -252,5 +383,10 @@ Tools like 'read_file' and 'web_fetch' can return native image content. Read vis
         return len(tasks)
 
     def get_running_count(self) -> int:
-        """Return the number of currently running subagents."""
+        """Return the number of spawned subagents that have not finished (running or queued)."""
         return len(self._running_tasks)
+
+    def get_status(self) -> dict[str, int]:
+        """Return how many subagents are running and how many are queued."""
+        running = sum(1 for info in self._subagents.values() if info.state == "running")
+        return {"running": running, "queued": len(self._subagents) - running}
@@ -53,6 +53,11 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
 
+    @property
+    def parallel_safe(self) -> bool:
+        """Whether the tool is free of side effects and may start speculatively."""
+        return False
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> Any:
         """
@@ -7,6 +7,8 @@ from typing import Any
 from nanobot.agent.tools.base import Tool
 from nanobot.cron.service import CronService
 from nanobot.cron.types import (
+    CRON_CATCH_UP_POLICIES,
+    CRON_OVERLAP_POLICIES,
     DEFAULT_CRON_HISTORY_PROFILE,
     CronHistoryProfile,
     CronJobState,
@@ -20,14 +22,12 @@ class CronTool(Tool):
 
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
+        self._route: ContextVar[tuple[str, str]] = ContextVar("cron_route", default=("", ""))
         self._in_cron_context: ContextVar[bool] = ContextVar("cron_in_context", default=False)
 
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
+        self._route.set((channel, chat_id))
 
     def set_cron_context(self, active: bool):
         """Mark whether the tool is executing inside a cron job callback."""
@@ -80,6 +80,16 @@ class CronTool(Tool):
                     "enum": ["stateless", "compact", "normal"],
                     "description": "History retention profile for recurring runs",
                 },
+                "overlap": {
+                    "type": "string",
+                    "enum": ["skip", "queue", "allow"],
+                    "description": "What to do if the job is due while its last run is still going",
+                },
+                "catch_up": {
+                    "type": "string",
+                    "enum": ["skip", "once", "all"],
+                    "description": "How to handle runs missed while the gateway was down",
+                },
                 "job_id": {"type": "string", "description": "Job ID (for remove)"},
             },
             "required": ["action"],
@@ -94,13 +104,17 @@ class CronTool(Tool):
         tz: str | None = None,
         at: str | None = None,
         profile: str | None = None,
+        overlap: str | None = None,
+        catch_up: str | None = None,
         job_id: str | None = None,
         **kwargs: Any,
     ) -> str:
         if action == "add":
             if self._in_cron_context.get():
                 return "Error: cannot schedule new jobs from within a cron job execution"
-            return self._add_job(message, every_seconds, cron_expr, tz, at, profile)
+            return self._add_job(
+                message, every_seconds, cron_expr, tz, at, profile, overlap, catch_up
+            )
         elif action == "list":
             return self._list_jobs()
         elif action == "remove":
@@ -115,10 +129,13 @@ class CronTool(Tool):
         tz: str | None,
         at: str | None,
         profile: str | None,
+        overlap: str | None = None,
+        catch_up: str | None = None,
     ) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        channel, chat_id = self._route.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         if tz and not cron_expr and not at:
             return "Error: tz can only be used with cron_expr or at"
@@ -154,6 +171,10 @@ class CronTool(Tool):
         effective_profile = self._parse_profile(profile)
         if effective_profile is None:
             return "Error: unknown profile. Use stateless, compact, or normal"
+        if overlap and overlap not in CRON_OVERLAP_POLICIES:
+            return "Error: unknown overlap policy. Use skip, queue, or allow"
+        if catch_up and catch_up not in CRON_CATCH_UP_POLICIES:
+            return "Error: unknown catch_up policy. Use skip, once, or all"
 
         job = self._cron.add_job(
             name=message[:30],
@@ -161,9 +182,11 @@ class CronTool(Tool):
             message=message,
             profile=effective_profile,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
             delete_after_run=delete_after,
+            overlap=overlap or "skip",
+            catch_up=catch_up or "skip",
         )
         return f"Created job '{job.name}' (id: {job.id}, profile: {job.profile})"
 
@@ -208,6 +231,8 @@ class CronTool(Tool):
             info = f"  Last run: {last_dt.isoformat()} — {state.last_status or 'unknown'}"
             if state.last_error:
                 info += f" ({state.last_error})"
+            if state.run_history and state.run_history[-1].lag_ms >= 1000:
+                info += f", started {state.run_history[-1].lag_ms / 1000:.0f}s late"
             lines.append(info)
         if state.next_run_at_ms:
             next_dt = datetime.fromtimestamp(state.next_run_at_ms / 1000, tz=timezone.utc)
@@ -1,7 +1,15 @@
-"""File system tools: read, write, edit, list."""
+"""File system tools: read, write, edit, list, glob, grep."""
 
+import asyncio
 import difflib
 import mimetypes
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -27,6 +35,18 @@ def _resolve_path(
     return resolved
 
 
+# Noise directories skipped by list_dir and the search tools.
+_IGNORE_DIRS = {
+    ".git", "node_modules", "__pycache__", ".venv", "venv",
+    "dist", "build", ".tox", ".mypy_cache", ".pytest_cache",
+    ".ruff_cache", ".coverage", "htmlcov", ".artifacts",
+}
+
+
+# Line boundaries recognised by str.splitlines() other than "\n".
+_OTHER_LINE_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
 def _is_under(path: Path, directory: Path) -> bool:
     try:
         path.relative_to(directory.resolve())
@@ -56,11 +76,95 @@ class _FsTool(Tool):
 # read_file
 # ---------------------------------------------------------------------------
 
+class _LineIndex:
+    """Lazily built newline index for one version of a file.
+
+    ``counts[b]`` is the number of newlines before block *b*, so locating a
+    line only needs a bisect plus a scan of one block.  Blocks are counted on
+    demand, so paging near the start of a huge file never touches its end.
+    Reads run in worker threads, so ``lock`` guards growing ``counts``.
+    """
+
+    BLOCK = 256 * 1024
+
+    def __init__(self, size: int, ends_with_newline: bool):
+        self.size = size
+        self.ends_with_newline = ends_with_newline
+        self.counts = array("Q", [0])
+        self.lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        return (len(self.counts) - 1) * self.BLOCK >= self.size
+
+    @property
+    def total_lines(self) -> int | None:
+        if not self.complete:
+            return None
+        return self.counts[-1] + (0 if self.ends_with_newline else 1)
+
+    def _extend(self, mm: mmap.mmap, newlines: int) -> None:
+        """Count blocks until at least *newlines* newlines are indexed (or EOF)."""
+        while self.counts[-1] < newlines and not self.complete:
+            start = (len(self.counts) - 1) * self.BLOCK
+            self.counts.append(self.counts[-1] + mm[start : start + self.BLOCK].count(b"\n"))
+
+    def line_start(self, mm: mmap.mmap, line: int) -> int | None:
+        """Byte offset where 0-based *line* starts, or ``None`` past the end."""
+        if line == 0:
+            return 0
+        with self.lock:
+            self._extend(mm, line)
+            if self.counts[-1] < line:
+                return None
+            block = bisect_left(self.counts, line) - 1
+            before = self.counts[block]
+        base = block * self.BLOCK
+        parts = mm[base : base + self.BLOCK].split(b"\n", line - before)
+        start = base + sum(len(part) + 1 for part in parts[:-1])
+        return start if start < self.size else None
+
+
+_LINE_INDEX_CACHE: "OrderedDict[tuple[str, int, int], _LineIndex]" = OrderedDict()
+_LINE_INDEX_CACHE_SIZE = 16
+_LINE_INDEX_LOCK = threading.Lock()
+
+
+def _get_line_index(fp: Path, st: os.stat_result, mm: mmap.mmap) -> _LineIndex:
+    """Return the cached index for this path+mtime+size, creating it if needed."""
+    key = (str(fp), st.st_mtime_ns, st.st_size)
+    with _LINE_INDEX_LOCK:
+        index = _LINE_INDEX_CACHE.get(key)
+        if index is None:
+            index = _LineIndex(st.st_size, mm[-1:] == b"\n")
+            _LINE_INDEX_CACHE[key] = index
+            while len(_LINE_INDEX_CACHE) > _LINE_INDEX_CACHE_SIZE:
+                _LINE_INDEX_CACHE.popitem(last=False)
+        else:
+            _LINE_INDEX_CACHE.move_to_end(key)
+        return index
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """Whether the leading bytes of a file decode as UTF-8 text."""
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sniff window is fine.
+        return e.start >= len(head) - 3 and e.reason == "unexpected end of data"
+    return True
+
+
 class ReadFileTool(_FsTool):
     """Read file contents with optional line-based pagination."""
 
+    parallel_safe = True
     _MAX_CHARS = 128_000
     _DEFAULT_LIMIT = 2000
+    _MMAP_THRESHOLD = 4 * 1024 * 1024  # files at least this big are paged via mmap
+    _SNIFF_BYTES = 8192
 
     @property
     def name(self) -> str:
@@ -103,6 +207,11 @@ class ReadFileTool(_FsTool):
             if not fp.is_file():
                 return f"Error: Not a file: {path}"
 
+            if offset < 1:
+                offset = 1
+            if fp.stat().st_size >= self._MMAP_THRESHOLD:
+                return await asyncio.to_thread(self._read_large, fp, path, offset, limit)
+
             raw = fp.read_bytes()
             if not raw:
                 return f"(Empty file: {path})"
@@ -119,36 +228,122 @@ class ReadFileTool(_FsTool):
             all_lines = text_content.splitlines()
             total = len(all_lines)
 
-            if offset < 1:
-                offset = 1
             if offset > total:
                 return f"Error: offset {offset} is beyond end of file ({total} lines)"
 
             start = offset - 1
             end = min(start + (limit or self._DEFAULT_LIMIT), total)
-            numbered = [f"{start + i + 1}| {line}" for i, line in enumerate(all_lines[start:end])]
-            result = "\n".join(numbered)
-
-            if len(result) > self._MAX_CHARS:
-                trimmed, chars = [], 0
-                for line in numbered:
-                    chars += len(line) + 1
-                    if chars > self._MAX_CHARS:
-                        break
-                    trimmed.append(line)
-                end = start + len(trimmed)
-                result = "\n".join(trimmed)
-
-            if end < total:
-                result += f"\n\n(Showing lines {offset}-{end} of {total}. Use offset={end + 1} to continue.)"
-            else:
-                result += f"\n\n(End of file — {total} lines total)"
-            return result
+            return self._format_window(all_lines[start:end], offset, total)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error reading file: {e}"
 
+    def _read_large(self, fp: Path, path: str, offset: int, limit: int | None) -> Any:
+        """Read one window of a large file without loading the rest of it."""
+        with open(fp, "rb") as f:
+            head = f.read(self._SNIFF_BYTES)
+            mime = detect_image_mime(head) or mimetypes.guess_type(path)[0]
+            if mime and mime.startswith("image/"):
+                raw = head + f.read()
+                return build_image_content_blocks(raw, mime, str(fp), f"(Image file: {path})")
+            if not _looks_like_text(head):
+                return f"Error: Cannot read binary file {path} (MIME: {mime or 'unknown'}). Only UTF-8 text and images are supported."
+
+            st = os.fstat(f.fileno())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                index = _get_line_index(fp, st, mm)
+                pos = index.line_start(mm, offset - 1)
+                if pos is None:
+                    total = index.total_lines
+                    return f"Error: offset {offset} is beyond end of file ({total} lines)"
+
+                lines: list[str] = []
+                budget = self._MAX_CHARS
+                for _ in range(limit or self._DEFAULT_LIMIT):
+                    if pos >= st.st_size or budget <= 0:
+                        break
+                    nl = mm.find(b"\n", pos)
+                    stop = st.st_size if nl == -1 else nl
+                    # Never materialise more of a single line than could be shown.
+                    chunk = mm[pos : min(stop, pos + budget + 1)]
+                    line = chunk.decode("utf-8", errors="replace").rstrip("\r")
+                    lines.append(line)
+                    budget -= len(line) + 1
+                    pos = stop + 1
+
+                more = pos < st.st_size
+                total = index.total_lines if more else offset - 1 + len(lines)
+                return self._format_window(lines, offset, total, more=more)
+
+    def _format_window(
+        self,
+        lines: list[str],
+        offset: int,
+        total: int | None,
+        more: bool | None = None,
+    ) -> str:
+        """Number *lines* (starting at *offset*), apply the char budget and add a footer."""
+        start = offset - 1
+        numbered = [f"{start + i + 1}| {line}" for i, line in enumerate(lines)]
+        result = "\n".join(numbered)
+        end = start + len(numbered)
+
+        if len(result) > self._MAX_CHARS:
+            trimmed, chars = [], 0
+            for line in numbered:
+                chars += len(line) + 1
+                if chars > self._MAX_CHARS:
+                    break
+                trimmed.append(line)
+            end = start + len(trimmed)
+            result = "\n".join(trimmed)
+            more = True
+
+        if more is None:
+            more = total is not None and end < total
+        if more:
+            of_total = f" of {total}" if total is not None else ""
+            result += f"\n\n(Showing lines {offset}-{end}{of_total}. Use offset={end + 1} to continue.)"
+        else:
+            result += f"\n\n(End of file — {total} lines total)"
+        return result
+
+
+# ---------------------------------------------------------------------------
+# write helpers
+# ---------------------------------------------------------------------------
+
+_PATH_LOCKS: dict[str, threading.Lock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _path_lock(fp: Path) -> threading.Lock:
+    """Per-path lock so read-modify-write cycles on one file run one at a time."""
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(str(fp), threading.Lock())
+
+
+def _atomic_write(fp: Path, data: bytes) -> None:
+    """Replace *fp* with *data* via a temp file in the same directory.
+
+    Readers see either the old or the new file, never a partial write.  An
+    existing file keeps its permission bits.
+    """
+    try:
+        mode = fp.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    tmp = fp.with_name(f".{fp.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, fp)
+    finally:
+        tmp.unlink(missing_ok=True)
+
 
 # ---------------------------------------------------------------------------
 # write_file
@@ -183,14 +378,19 @@ class WriteFileTool(_FsTool):
             if content is None:
                 raise ValueError("Unknown content")
             fp = self._resolve(path)
-            fp.parent.mkdir(parents=True, exist_ok=True)
-            fp.write_text(content, encoding="utf-8")
+            await asyncio.to_thread(self._write, fp, content)
             return f"Successfully wrote {len(content)} bytes to {fp}"
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error writing file: {e}"
 
+    @staticmethod
+    def _write(fp: Path, content: str) -> None:
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        with _path_lock(fp):
+            _atomic_write(fp, content.encode("utf-8"))
+
 
 # ---------------------------------------------------------------------------
 # edit_file
@@ -210,12 +410,22 @@ def _find_match(content: str, old_text: str) -> tuple[str | None, int]:
         return None, 0
     stripped_old = [l.strip() for l in old_lines]
     content_lines = content.splitlines()
+    stripped = [line.strip() for line in content_lines]
+
+    # Anchor on the most distinctive line of old_text and only verify the
+    # windows where it lines up, instead of re-stripping every window.
+    anchor = max(range(len(stripped_old)), key=lambda k: len(stripped_old[k]))
+    key = stripped_old[anchor]
+    window = len(stripped_old)
+    last_start = len(content_lines) - window
 
     candidates = []
-    for i in range(len(content_lines) - len(stripped_old) + 1):
-        window = content_lines[i : i + len(stripped_old)]
-        if [l.strip() for l in window] == stripped_old:
-            candidates.append("\n".join(window))
+    for i, line in enumerate(stripped):
+        start = i - anchor
+        if line != key or start < 0 or start > last_start:
+            continue
+        if stripped[start : start + window] == stripped_old:
+            candidates.append("\n".join(content_lines[start : start + window]))
 
     if candidates:
         return candidates[0], len(candidates)
@@ -269,7 +479,19 @@ class EditFileTool(_FsTool):
             fp = self._resolve(path)
             if not fp.exists():
                 return f"Error: File not found: {path}"
+            return await asyncio.to_thread(
+                self._edit, fp, path, old_text, new_text, replace_all
+            )
+        except PermissionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error editing file: {e}"
 
+    def _edit(
+        self, fp: Path, path: str, old_text: str, new_text: str, replace_all: bool
+    ) -> str:
+        """Read, match, replace and write back; runs in a worker thread."""
+        with _path_lock(fp):
             raw = fp.read_bytes()
             uses_crlf = b"\r\n" in raw
             content = raw.decode("utf-8").replace("\r\n", "\n")
@@ -288,22 +510,39 @@ class EditFileTool(_FsTool):
             if uses_crlf:
                 new_content = new_content.replace("\n", "\r\n")
 
-            fp.write_bytes(new_content.encode("utf-8"))
+            _atomic_write(fp, new_content.encode("utf-8"))
             return f"Successfully edited {fp}"
-        except PermissionError as e:
-            return f"Error: {e}"
-        except Exception as e:
-            return f"Error editing file: {e}"
 
-    @staticmethod
-    def _not_found_msg(old_text: str, content: str, path: str) -> str:
+    _MAX_DIFF_CANDIDATES = 64  # windows scored with difflib when reporting a miss
+
+    @classmethod
+    def _not_found_msg(cls, old_text: str, content: str, path: str) -> str:
         lines = content.splitlines(keepends=True)
         old_lines = old_text.splitlines(keepends=True)
         window = len(old_lines)
+        starts = range(max(1, len(lines) - window + 1))
+
+        # Rank windows by how many trimmed lines they share with old_text and
+        # only score the best few with difflib; a window sharing no line at all
+        # cannot clear the similarity threshold below.
+        wanted = {line.strip() for line in old_lines}
+        hits = [1 if line.strip() in wanted else 0 for line in lines]
+        shared, running = [], sum(hits[:window])
+        for i in starts:
+            shared.append(running)
+            if i + window < len(hits):
+                running += hits[i + window] - hits[i]
+        ranked = sorted(
+            (i for i in starts if shared[i]), key=lambda i: (-shared[i], i)
+        )[: cls._MAX_DIFF_CANDIDATES]
 
         best_ratio, best_start = 0.0, 0
-        for i in range(max(1, len(lines) - window + 1)):
-            ratio = difflib.SequenceMatcher(None, old_lines, lines[i : i + window]).ratio()
+        matcher = difflib.SequenceMatcher(None, old_lines)
+        for i in sorted(ranked):
+            matcher.set_seq2(lines[i : i + window])
+            if matcher.real_quick_ratio() <= best_ratio or matcher.quick_ratio() <= best_ratio:
+                continue
+            ratio = matcher.ratio()
             if ratio > best_ratio:
                 best_ratio, best_start = ratio, i
 
@@ -325,12 +564,10 @@ class EditFileTool(_FsTool):
 class ListDirTool(_FsTool):
     """List directory contents with optional recursion."""
 
+    parallel_safe = True
     _DEFAULT_MAX = 200
-    _IGNORE_DIRS = {
-        ".git", "node_modules", "__pycache__", ".venv", "venv",
-        "dist", "build", ".tox", ".mypy_cache", ".pytest_cache",
-        ".ruff_cache", ".coverage", "htmlcov",
-    }
+    _IGNORE_DIRS = _IGNORE_DIRS
+    _COUNT_LIMIT = 10_000  # entries counted past the cap before giving up on an exact total
 
     @property
     def name(self) -> str:
@@ -377,34 +614,507 @@ class ListDirTool(_FsTool):
                 return f"Error: Not a directory: {path}"
 
             cap = max_entries or self._DEFAULT_MAX
-            items: list[str] = []
-            total = 0
-
-            if recursive:
-                for item in sorted(dp.rglob("*")):
-                    if any(p in self._IGNORE_DIRS for p in item.parts):
-                        continue
-                    total += 1
-                    if len(items) < cap:
-                        rel = item.relative_to(dp)
-                        items.append(f"{rel}/" if item.is_dir() else str(rel))
-            else:
-                for item in sorted(dp.iterdir()):
-                    if item.name in self._IGNORE_DIRS:
-                        continue
-                    total += 1
-                    if len(items) < cap:
-                        pfx = "📁 " if item.is_dir() else "📄 "
-                        items.append(f"{pfx}{item.name}")
+            items, total, complete = await asyncio.to_thread(self._list, dp, recursive, cap)
 
             if not items and total == 0:
                 return f"Directory {path} is empty"
 
             result = "\n".join(items)
             if total > cap:
-                result += f"\n\n(truncated, showing first {cap} of {total} entries)"
+                more = "" if complete else "+"
+                result += f"\n\n(truncated, showing first {cap} of {total}{more} entries)"
             return result
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error listing directory: {e}"
+
+    def _list(self, dp: Path, recursive: bool, cap: int) -> tuple[list[str], int, bool]:
+        """Collect up to *cap* entries; return (items, total counted, whether total is exact).
+
+        Recursive listings walk depth-first with sorted siblings (the same
+        order as sorting the full path list) and prune ignored directories
+        before descending into them.
+        """
+        items: list[str] = []
+        total = 0
+        stop_at = cap + self._COUNT_LIMIT
+        stack = [("", iter(self._scan(dp, ignore_errors=False)))]
+        while stack:
+            prefix, entries = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+            if entry.name in self._IGNORE_DIRS:
+                continue
+            total += 1
+            is_dir = entry.is_dir()
+            if len(items) < cap:
+                if recursive:
+                    rel = prefix + entry.name
+                    items.append(f"{rel}/" if is_dir else rel)
+                else:
+                    items.append(f"{'📁 ' if is_dir else '📄 '}{entry.name}")
+            if total >= stop_at:
+                return items, total, False
+            if recursive and is_dir and not entry.is_symlink():
+                stack.append((f"{prefix}{entry.name}{os.sep}", iter(self._scan(entry.path))))
+        return items, total, True
+
+    @staticmethod
+    def _scan(path: str | Path, ignore_errors: bool = True) -> list[os.DirEntry]:
+        try:
+            with os.scandir(path) as it:
+                return sorted(it, key=lambda e: e.name)
+        except OSError:
+            if not ignore_errors:
+                raise
+            return []
+
+
+# ---------------------------------------------------------------------------
+# glob / grep
+# ---------------------------------------------------------------------------
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore-style glob (``*``, ``?``, ``[..]``, ``**``) to a regex body."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (j := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : j]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = j + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def _compile_path_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a glob matched against ``/``-separated relative paths.
+
+    Patterns without a slash match a name at any depth (``*.py``); patterns
+    with one are anchored to the search root (``src/**/*.ts``).
+    """
+    pattern = pattern.strip()
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    if "/" in pattern:
+        return re.compile("^" + _glob_to_regex(pattern.lstrip("/")) + "$")
+    return re.compile("^(?:.*/)?" + _glob_to_regex(pattern) + "$")
+
+
+class _IgnoreRule:
+    """One line of a ``.gitignore`` file, scoped to the directory it lives in."""
+
+    __slots__ = ("base", "regex", "negate", "dir_only")
+
+    def __init__(self, base: str, line: str):
+        self.negate = line.startswith("!")
+        if self.negate:
+            line = line[1:]
+        self.dir_only = line.endswith("/")
+        self.base = base
+        self.regex = _compile_path_glob(line.rstrip("/"))
+
+    def matches(self, rel: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel.startswith(self.base + "/"):
+                return False
+            rel = rel[len(self.base) + 1 :]
+        return self.regex.match(rel) is not None
+
+
+def _parse_gitignore(path: str, base: str) -> list[_IgnoreRule]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("\\"):
+            line = line[1:]
+        rules.append(_IgnoreRule(base, line))
+    return rules
+
+
+class _FileIndex:
+    """Cached, gitignore-aware list of the files under one directory.
+
+    Every directory's listing is kept together with its mtime.  A refresh
+    re-stats the directories and rescans only those whose mtime changed
+    (files were added, removed or renamed); editing a ``.gitignore`` forces
+    a full rebuild.  Only ``.gitignore`` files at or below the root apply.
+    """
+
+    def __init__(self, root: Path):
+        self.root = str(root)
+        # rel dir -> (mtime_ns, file names, subdir names, symlinked file names)
+        self._dirs: dict[str, tuple[int, list[str], list[str], set[str]]] = {}
+        self._rules: list[_IgnoreRule] = []
+        self._ignore_mtimes: dict[str, int] = {}
+        self._files: list[str] = []
+        self.symlinks: set[str] = set()
+        self.lock = threading.Lock()
+
+    def _abs(self, rel: str) -> str:
+        return os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def _ignored(self, rel: str, is_dir: bool) -> bool:
+        ignored = False
+        for rule in self._rules:
+            if rule.negate == ignored and rule.matches(rel, is_dir):
+                ignored = not rule.negate
+        return ignored
+
+    def _gitignores_changed(self) -> bool:
+        for path, mtime in self._ignore_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def files(self) -> list[str]:
+        """Return the current ``/``-separated relative file paths, in sorted order."""
+        with self.lock:
+            if self._gitignores_changed():
+                self._reset()
+            known_ignores = len(self._ignore_mtimes)
+            incremental = bool(self._dirs)
+            changed = self._refresh()
+            if incremental and len(self._ignore_mtimes) != known_ignores:
+                # A new .gitignore may hide paths in directories scanned earlier.
+                self._reset()
+                self._refresh()
+            if changed:
+                self._files = []
+                self.symlinks = set()
+                self._collect("")
+            return self._files
+
+    def _reset(self) -> None:
+        self._dirs.clear()
+        self._rules = []
+        self._ignore_mtimes = {}
+
+    def _refresh(self) -> bool:
+        """Rescan directories whose mtime changed; return whether anything did."""
+        changed = False
+        seen: set[str] = set()
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            seen.add(rel)
+            try:
+                mtime = os.stat(self._abs(rel)).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._dirs.get(rel)
+            if cached is None or cached[0] != mtime:
+                cached = self._scan_dir(rel, mtime)
+                changed = True
+            stack.extend(f"{rel}/{d}" if rel else d for d in reversed(cached[2]))
+        for rel in [r for r in self._dirs if r not in seen]:
+            del self._dirs[rel]
+            changed = True
+        return changed
+
+    def _scan_dir(self, rel: str, mtime: int) -> tuple[int, list[str], list[str], set[str]]:
+        path = self._abs(rel)
+        gitignore = os.path.join(path, ".gitignore")
+        if gitignore not in self._ignore_mtimes and os.path.isfile(gitignore):
+            self._rules.extend(_parse_gitignore(gitignore, rel))
+            self._ignore_mtimes[gitignore] = os.stat(gitignore).st_mtime_ns
+        files, dirs, links = [], [], set()
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            child = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name not in _IGNORE_DIRS and not self._ignored(child, True):
+                    dirs.append(entry.name)
+            elif entry.is_file() and not self._ignored(child, False):
+                files.append(entry.name)
+                if entry.is_symlink():
+                    links.add(entry.name)
+        listing = (mtime, files, dirs, links)
+        self._dirs[rel] = listing
+        return listing
+
+    def _collect(self, rel: str) -> None:
+        cached = self._dirs.get(rel)
+        if cached is None:
+            return
+        _, files, dirs, links = cached
+        # Merge files and subdirectories by name to keep sorted full-path order.
+        children = sorted([(f, False) for f in files] + [(d, True) for d in dirs])
+        for name, is_dir in children:
+            child = f"{rel}/{name}" if rel else name
+            if is_dir:
+                self._collect(child)
+            else:
+                self._files.append(child)
+                if name in links:
+                    self.symlinks.add(child)
+
+
+_FILE_INDEX_CACHE: "OrderedDict[str, _FileIndex]" = OrderedDict()
+_FILE_INDEX_CACHE_SIZE = 8
+_FILE_INDEX_LOCK = threading.Lock()
+
+
+def _get_file_index(root: Path) -> _FileIndex:
+    key = str(root)
+    with _FILE_INDEX_LOCK:
+        index = _FILE_INDEX_CACHE.get(key)
+        if index is None:
+            index = _FileIndex(root)
+            _FILE_INDEX_CACHE[key] = index
+            while len(_FILE_INDEX_CACHE) > _FILE_INDEX_CACHE_SIZE:
+                _FILE_INDEX_CACHE.popitem(last=False)
+        else:
+            _FILE_INDEX_CACHE.move_to_end(key)
+        return index
+
+
+class _SearchTool(_FsTool):
+    """Shared plumbing for the workspace search tools."""
+
+    parallel_safe = True
+
+    def _search_root(self, path: str | None) -> Path:
+        root = self._resolve(path or ".")
+        if not root.exists():
+            raise FileNotFoundError(f"Path not found: {path}")
+        return root
+
+    def _candidate_files(self, root: Path, include: str | None = None) -> list[str]:
+        """Indexed files under *root* (relative, ``/``-separated) that the tool may read."""
+        index = _get_file_index(root)
+        files = index.files()
+        if include:
+            rx = _compile_path_glob(include)
+            files = [f for f in files if rx.match(f)]
+        if self._allowed_dir and index.symlinks:
+            allowed = [self._allowed_dir] + (self._extra_allowed_dirs or [])
+            files = [
+                f for f in files
+                if f not in index.symlinks
+                or any(_is_under((root / f).resolve(), d) for d in allowed)
+            ]
+        return files
+
+
+class GlobTool(_SearchTool):
+    """Find files by name pattern using the cached workspace file index."""
+
+    _DEFAULT_MAX = 200
+
+    @property
+    def name(self) -> str:
+        return "glob"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Find files by glob pattern, e.g. '*.py' (any depth) or 'src/**/*.ts' "
+            "(relative to path). Respects .gitignore and skips noise directories. "
+            "Faster than list_dir for locating files."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Glob pattern to match file paths"},
+                "path": {
+                    "type": "string",
+                    "description": "Directory to search (default: workspace root)",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum paths to return (default 200)",
+                    "minimum": 1,
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    async def execute(
+        self, pattern: str | None = None, path: str | None = None,
+        max_results: int | None = None, **kwargs: Any,
+    ) -> str:
+        try:
+            if not pattern:
+                raise ValueError("Unknown pattern")
+            root = self._search_root(path)
+            if not root.is_dir():
+                return f"Error: Not a directory: {path}"
+            matches = await asyncio.to_thread(self._candidate_files, root, pattern)
+            if not matches:
+                return f"No files matching '{pattern}'"
+
+            cap = max_results or self._DEFAULT_MAX
+            result = "\n".join(matches[:cap])
+            if len(matches) > cap:
+                result += f"\n\n(truncated, showing first {cap} of {len(matches)} files)"
+            return result
+        except PermissionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error searching files: {e}"
+
+
+class GrepTool(_SearchTool):
+    """Search file contents by regular expression using the cached file index."""
+
+    _DEFAULT_MAX = 100
+    _MAX_LINE_CHARS = 300
+    _MAX_FILE_BYTES = 8 * 1024 * 1024
+
+    @property
+    def name(self) -> str:
+        return "grep"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search file contents with a regular expression. Returns matching lines as "
+            "path:line: text. Respects .gitignore and skips binary files. Use include "
+            "to filter files by glob (e.g. '*.py'). Prefer this over exec grep or "
+            "reading files one by one."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Regular expression to search for"},
+                "path": {
+                    "type": "string",
+                    "description": "File or directory to search (default: workspace root)",
+                },
+                "include": {
+                    "type": "string",
+                    "description": "Only search files matching this glob (e.g. '*.ts')",
+                },
+                "ignore_case": {
+                    "type": "boolean",
+                    "description": "Case-insensitive search (default false)",
+                },
+                "max_matches": {
+                    "type": "integer",
+                    "description": "Maximum matching lines to return (default 100)",
+                    "minimum": 1,
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    async def execute(
+        self, pattern: str | None = None, path: str | None = None,
+        include: str | None = None, ignore_case: bool = False,
+        max_matches: int | None = None, **kwargs: Any,
+    ) -> str:
+        try:
+            if not pattern:
+                raise ValueError("Unknown pattern")
+            try:
+                rx = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+            except re.error as e:
+                return f"Error: Invalid regular expression: {e}"
+            root = self._search_root(path)
+            cap = max_matches or self._DEFAULT_MAX
+            lines, truncated = await asyncio.to_thread(self._search, root, rx, include, cap)
+            if not lines:
+                return f"No matches for '{pattern}'"
+            result = "\n".join(lines)
+            if truncated:
+                result += f"\n\n(showing first {cap} matches; narrow the pattern or path)"
+            return result
+        except PermissionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error searching files: {e}"
+
+    def _search(
+        self, root: Path, rx: re.Pattern[str], include: str | None, cap: int,
+    ) -> tuple[list[str], bool]:
+        if root.is_file():
+            targets = [(root, root.name)]
+        else:
+            targets = [(root / f, f) for f in self._candidate_files(root, include)]
+
+        # A whole-file search skips files with no match before splitting them
+        # into lines.  It needs MULTILINE so ^ and $ still match at every line;
+        # \A and \Z mean "line start/end" per line but "file start/end" here,
+        # so patterns using them go straight to the per-line search.  Files
+        # with other line breaks (CRLF, lone CR, form feeds...) are checked as
+        # "\n"-joined lines, since MULTILINE only treats "\n" as a boundary.
+        whole = None
+        if "\\A" not in rx.pattern and "\\Z" not in rx.pattern:
+            whole = re.compile(rx.pattern, rx.flags | re.MULTILINE)
+
+        out: list[str] = []
+        for fp, rel in targets:
+            try:
+                if fp.stat().st_size > self._MAX_FILE_BYTES:
+                    continue
+                raw = fp.read_bytes()
+            except OSError:
+                continue
+            if not _looks_like_text(raw[:8192]):
+                continue
+            text = raw.decode("utf-8", errors="replace")
+            lines = None
+            if whole is not None:
+                haystack = text
+                if _OTHER_LINE_BREAKS.search(text):
+                    lines = text.splitlines()
+                    haystack = "\n".join(lines)
+                if not whole.search(haystack):
+                    continue
+            for lineno, line in enumerate(lines or text.splitlines(), 1):
+                if rx.search(line):
+                    if len(line) > self._MAX_LINE_CHARS:
+                        line = line[: self._MAX_LINE_CHARS] + "…"
+                    out.append(f"{rel}:{lineno}: {line}")
+                    if len(out) > cap:
+                        return out[:cap], True
+        return out, False
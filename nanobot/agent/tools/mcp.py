@@ -1,16 +1,44 @@
 """MCP client: connects to MCP servers and wraps their tools as native nanobot tools."""
 
 import asyncio
-from contextlib import AsyncExitStack
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 import httpx
 from loguru import logger
 
+from nanobot.agent.artifacts import ArtifactStore
 from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.registry import ToolRegistry
 
+_progress_sink: ContextVar[Callable[..., Awaitable[None]] | None] = ContextVar(
+    "mcp_progress_sink", default=None
+)
+
+
+@contextmanager
+def mcp_progress(callback: Callable[..., Awaitable[None]] | None) -> Iterator[None]:
+    """Forward MCP progress notifications from tool calls in this block to *callback*.
+
+    *callback* is called like the agent loop's ``on_progress`` hook, with
+    ``tool_hint=True``.
+    """
+    token = _progress_sink.set(callback)
+    try:
+        yield
+    finally:
+        _progress_sink.reset(token)
+
 
 @dataclass
 class MCPServerConnectResult:
@@ -100,9 +128,24 @@ def _normalize_schema_for_openai(schema: Any) -> dict[str, Any]:
 
 
 class MCPToolWrapper(Tool):
-    """Wraps a single MCP server tool as a nanobot Tool."""
-
-    def __init__(self, session, server_name: str, tool_def, tool_timeout: int = 30):
+    """Wraps a single MCP server tool as a nanobot Tool.
+
+    Results longer than ``max_result_chars`` are saved to the workspace
+    ``artifacts`` store and replaced with its preview; without a store they
+    are cut to that size with a marker.
+    """
+
+    _PROGRESS_INTERVAL_S = 1.0
+
+    def __init__(
+        self,
+        session,
+        server_name: str,
+        tool_def,
+        tool_timeout: int = 30,
+        max_result_chars: int = 0,
+        artifacts: ArtifactStore | None = None,
+    ):
         self._session = session
         self._original_name = tool_def.name
         self._name = f"mcp_{server_name}_{tool_def.name}"
@@ -110,6 +153,8 @@ class MCPToolWrapper(Tool):
         raw_schema = tool_def.inputSchema or {"type": "object", "properties": {}}
         self._parameters = _normalize_schema_for_openai(raw_schema)
         self._tool_timeout = tool_timeout
+        self._max_result_chars = max_result_chars
+        self._artifacts = artifacts
 
     @property
     def name(self) -> str:
@@ -123,12 +168,39 @@ class MCPToolWrapper(Tool):
     def parameters(self) -> dict[str, Any]:
         return self._parameters
 
+    def _progress_callback(self) -> Callable[..., Awaitable[None]] | None:
+        sink = _progress_sink.get()
+        if sink is None:
+            return None
+        last_sent = 0.0
+
+        async def _on_progress(progress: float, total: float | None, message: str | None) -> None:
+            nonlocal last_sent
+            now = time.monotonic()
+            if now - last_sent < self._PROGRESS_INTERVAL_S:
+                return
+            last_sent = now
+            if total:
+                detail = f"{progress / total:.0%}"
+            else:
+                detail = f"{progress:g}"
+            hint = f"{self._name}: {message} ({detail})" if message else f"{self._name}: {detail}"
+            try:
+                await sink(hint, tool_hint=True)
+            except Exception as exc:
+                logger.debug("MCP progress hint for '{}' dropped: {}", self._name, exc)
+
+        return _on_progress
+
     async def execute(self, **kwargs: Any) -> str:
         from mcp import types
 
+        call_kwargs: dict[str, Any] = {"arguments": kwargs}
+        if (on_progress := self._progress_callback()) is not None:
+            call_kwargs["progress_callback"] = on_progress
         try:
             result = await asyncio.wait_for(
-                self._session.call_tool(self._original_name, arguments=kwargs),
+                self._session.call_tool(self._original_name, **call_kwargs),
                 timeout=self._tool_timeout,
             )
         except asyncio.TimeoutError:
@@ -151,137 +223,509 @@ class MCPToolWrapper(Tool):
             )
             return f"(MCP tool call failed: {type(exc).__name__})"
 
-        parts = []
-        for block in result.content:
-            if isinstance(block, types.TextContent):
-                parts.append(block.text)
-            else:
-                parts.append(str(block))
+        parts = [
+            block.text if isinstance(block, types.TextContent) else str(block)
+            for block in result.content
+        ]
+        if 0 < self._max_result_chars < sum(len(part) + 1 for part in parts) - 1:
+            # Storing a large result does file I/O; keep it off the event loop.
+            return await asyncio.to_thread(self._bounded_text, parts)
         return "\n".join(parts) or "(no output)"
 
+    def _bounded_text(self, parts: Iterable[str]) -> str:
+        """Fit an oversized result: an artifact preview if possible, else a truncation."""
+        text = "\n".join(parts)
+        limit = self._max_result_chars
+        logger.info("MCP tool '{}' returned {:,} chars (limit {:,})", self._name, len(text), limit)
+        if self._artifacts is not None:
+            preview = self._artifacts.store(self._name, text)
+            if preview is not None:
+                return preview
+        return (
+            f"{text[:limit]}\n\n"
+            f"... (MCP result truncated: showing the first {limit:,} of {len(text):,} chars)"
+        )
 
-async def connect_mcp_servers(
-    mcp_servers: dict, registry: ToolRegistry, stack: AsyncExitStack
-) -> dict[str, MCPServerConnectResult]:
-    """Connect to configured MCP servers and register their tools."""
-    results = {name: MCPServerConnectResult(name=name) for name in mcp_servers}
 
-    try:
-        from mcp import ClientSession, StdioServerParameters
-        from mcp.client.sse import sse_client
-        from mcp.client.stdio import stdio_client
-        from mcp.client.streamable_http import streamable_http_client
-    except Exception as exc:
-        err = f"{type(exc).__name__}: {exc}"
-        for name, result in results.items():
-            result.error = err
-            logger.error("MCP server '{}': failed to load MCP SDK: {}", name, err)
-        return results
+@dataclass
+class MCPServerStats:
+    """Call latency, error and reconnect counters for one MCP server."""
+
+    calls: int = 0
+    errors: int = 0
+    reconnects: int = 0
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    ping_ms: float | None = None
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=50))
+
+    def record_call(self, elapsed_ms: float, error: str | None = None) -> None:
+        self.calls += 1
+        self.latencies_ms.append(elapsed_ms)
+        if error:
+            self.errors += 1
+            self.last_error = error
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+            "ping_ms": self.ping_ms,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+        }
+
+
+class _MCPConfigError(Exception):
+    """A server entry that cannot be connected as configured."""
+
+
+class MCPToolCache:
+    """On-disk copy of each server's tool list.
+
+    Lets the agent register a server's tools before its handshake completes.
+    Entries are keyed by server name and only used while the server's
+    connection settings still match the ones the list was fetched with.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data: dict[str, Any] | None = None
 
-    for name, cfg in mcp_servers.items():
-        result = results[name]
+    @staticmethod
+    def fingerprint(cfg: Any) -> str:
+        raw = json.dumps(
+            [cfg.type, cfg.command, cfg.args, cfg.env, cfg.url, cfg.headers],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _load(self) -> dict[str, Any]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def get(self, name: str, cfg: Any) -> list[Any] | None:
+        entry = self._load().get(name)
+        if not isinstance(entry, dict) or entry.get("fingerprint") != self.fingerprint(cfg):
+            return None
+        return [SimpleNamespace(**tool) for tool in entry.get("tools", [])]
+
+    def put(self, name: str, cfg: Any, tool_defs: list[Any]) -> None:
+        data = self._load()
+        data[name] = {
+            "fingerprint": self.fingerprint(cfg),
+            "tools": [
+                {
+                    "name": tool_def.name,
+                    "description": tool_def.description,
+                    "inputSchema": tool_def.inputSchema,
+                }
+                for tool_def in tool_defs
+            ],
+        }
+        tmp = self.path.with_suffix(".tmp")
         try:
-            transport_type = _resolve_transport_type(cfg)
-            if not transport_type:
-                msg = "no command or url configured"
-                result.error = msg
-                logger.warning("MCP server '{}': {}, skipping", name, msg)
-                continue
-            result.transport = transport_type
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, ensure_ascii=False, default=str), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Failed to write MCP tool cache: {}", exc)
+
+
+async def _open_session(name: str, cfg: Any, stack: AsyncExitStack, result: MCPServerConnectResult):
+    """Enter the transport and client session for one server on *stack*."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.sse import sse_client
+    from mcp.client.stdio import stdio_client
+    from mcp.client.streamable_http import streamable_http_client
+
+    transport_type = _resolve_transport_type(cfg)
+    if not transport_type:
+        raise _MCPConfigError("no command or url configured")
+    result.transport = transport_type
+
+    if transport_type == "stdio":
+        params = StdioServerParameters(command=cfg.command, args=cfg.args, env=cfg.env or None)
+        read, write = await stack.enter_async_context(stdio_client(params))
+    elif transport_type == "sse":
+
+        def httpx_client_factory(
+            headers: dict[str, str] | None = None,
+            timeout: httpx.Timeout | None = None,
+            auth: httpx.Auth | None = None,
+        ) -> httpx.AsyncClient:
+            merged_headers = {**(cfg.headers or {}), **(headers or {})}
+            return httpx.AsyncClient(
+                headers=merged_headers or None,
+                follow_redirects=True,
+                timeout=timeout,
+                auth=auth,
+            )
 
-            if transport_type == "stdio":
-                params = StdioServerParameters(
-                    command=cfg.command, args=cfg.args, env=cfg.env or None
-                )
-                read, write = await stack.enter_async_context(stdio_client(params))
-            elif transport_type == "sse":
-
-                def httpx_client_factory(
-                    headers: dict[str, str] | None = None,
-                    timeout: httpx.Timeout | None = None,
-                    auth: httpx.Auth | None = None,
-                ) -> httpx.AsyncClient:
-                    merged_headers = {**(cfg.headers or {}), **(headers or {})}
-                    return httpx.AsyncClient(
-                        headers=merged_headers or None,
-                        follow_redirects=True,
-                        timeout=timeout,
-                        auth=auth,
-                    )
-
-                read, write = await stack.enter_async_context(
-                    sse_client(cfg.url, httpx_client_factory=httpx_client_factory)
-                )
-            elif transport_type == "streamableHttp":
-                # Always provide an explicit httpx client so MCP HTTP transport does not
-                # inherit httpx's default 5s timeout and preempt the higher-level tool timeout.
-                http_client = await stack.enter_async_context(
-                    httpx.AsyncClient(
-                        headers=cfg.headers or None,
-                        follow_redirects=True,
-                        timeout=None,
-                    )
+        read, write = await stack.enter_async_context(
+            sse_client(cfg.url, httpx_client_factory=httpx_client_factory)
+        )
+    elif transport_type == "streamableHttp":
+        # Always provide an explicit httpx client so MCP HTTP transport does not
+        # inherit httpx's default 5s timeout and preempt the higher-level tool timeout.
+        http_client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                headers=cfg.headers or None,
+                follow_redirects=True,
+                timeout=None,
+            )
+        )
+        read, write, _ = await stack.enter_async_context(
+            streamable_http_client(cfg.url, http_client=http_client)
+        )
+    else:
+        raise _MCPConfigError(f"unknown transport type '{transport_type}'")
+
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+def _register_tools(
+    name: str,
+    cfg: Any,
+    tool_defs: list[Any],
+    registry: ToolRegistry,
+    caller: Any,
+    artifacts: ArtifactStore | None = None,
+) -> list[str]:
+    """Register wrappers for one server's tools, dropping ones it no longer offers."""
+    enabled_tools = set(cfg.enabled_tools)
+    allow_all_tools = "*" in enabled_tools
+    registered: list[str] = []
+    matched_enabled_tools: set[str] = set()
+    available_raw_names = [tool_def.name for tool_def in tool_defs]
+    available_wrapped_names = [f"mcp_{name}_{tool_def.name}" for tool_def in tool_defs]
+    for tool_def in tool_defs:
+        wrapped_name = f"mcp_{name}_{tool_def.name}"
+        if (
+            not allow_all_tools
+            and tool_def.name not in enabled_tools
+            and wrapped_name not in enabled_tools
+        ):
+            logger.debug(
+                "MCP: skipping tool '{}' from server '{}' (not in enabledTools)",
+                wrapped_name,
+                name,
+            )
+            continue
+        wrapper = MCPToolWrapper(
+            caller,
+            name,
+            tool_def,
+            tool_timeout=cfg.tool_timeout,
+            max_result_chars=getattr(cfg, "max_result_chars", 0),
+            artifacts=artifacts,
+        )
+        registry.register(wrapper)
+        logger.debug("MCP: registered tool '{}' from server '{}'", wrapper.name, name)
+        registered.append(wrapper.name)
+        if enabled_tools:
+            if tool_def.name in enabled_tools:
+                matched_enabled_tools.add(tool_def.name)
+            if wrapped_name in enabled_tools:
+                matched_enabled_tools.add(wrapped_name)
+
+    prefix = f"mcp_{name}_"
+    for stale in [t for t in registry.tool_names if t.startswith(prefix) and t not in registered]:
+        registry.unregister(stale)
+
+    if enabled_tools and not allow_all_tools:
+        unmatched_enabled_tools = sorted(enabled_tools - matched_enabled_tools)
+        if unmatched_enabled_tools:
+            logger.warning(
+                "MCP server '{}': enabledTools entries not found: {}. Available raw names: {}. "
+                "Available wrapped names: {}",
+                name,
+                ", ".join(unmatched_enabled_tools),
+                ", ".join(available_raw_names) or "(none)",
+                ", ".join(available_wrapped_names) or "(none)",
+            )
+    return registered
+
+
+class MCPServerConnection:
+    """One MCP server's session, owned by a dedicated task.
+
+    The MCP SDK transports use anyio cancel scopes that must be exited by the
+    task that entered them, so each server's contexts are entered, held and
+    closed inside its own task.  That also lets servers connect in parallel.
+    Registered wrappers call tools through this object rather than a raw
+    session, so tools loaded from the cache work before the handshake finishes
+    and (re)connect the server on first use.
+
+    Once :meth:`start_health_checks` is called, the server is pinged every
+    ``cfg.health_check_interval`` seconds and reconnected with exponential
+    backoff when it drops, without touching any other server.
+    """
+
+    _CLOSE_TIMEOUT_S = 5.0
+    _PING_TIMEOUT_S = 10.0
+    _RECONNECT_BASE_S = 1.0
+    _RECONNECT_MAX_S = 300.0
+
+    def __init__(
+        self,
+        name: str,
+        cfg: Any,
+        registry: ToolRegistry,
+        cache: MCPToolCache | None = None,
+        artifacts: ArtifactStore | None = None,
+    ):
+        self.name = name
+        self.cfg = cfg
+        self.registry = registry
+        self.cache = cache
+        self.artifacts = artifacts
+        self.result = MCPServerConnectResult(name=name)
+        self.stats = MCPServerStats()
+        self.session: Any | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._monitor_task: asyncio.Task[None] | None = None
+        self._misconfigured = False
+        self._was_connected = False
+        self._stopped = False
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    @property
+    def connecting(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._ready.is_set()
+
+    def register_cached_tools(self) -> list[str]:
+        """Register wrappers from the on-disk tool list, if one matches this server."""
+        tool_defs = self.cache.get(self.name, self.cfg) if self.cache else None
+        if not tool_defs:
+            return []
+        registered = _register_tools(
+            self.name, self.cfg, tool_defs, self.registry, self, self.artifacts
+        )
+        logger.info("MCP server '{}': {} cached tools registered", self.name, len(registered))
+        return registered
+
+    async def connect(self) -> MCPServerConnectResult:
+        """Connect (or reconnect) the server, waiting at most ``cfg.connect_timeout``."""
+        async with self._connect_lock:
+            if self.connected:
+                return self.result
+            await self.close()
+            self.result = MCPServerConnectResult(
+                name=self.name, transport=_resolve_transport_type(self.cfg) or "unknown"
+            )
+            self._ready = asyncio.Event()
+            self._closing = asyncio.Event()
+            self._task = asyncio.create_task(self._serve(), name=f"mcp:{self.name}")
+            timeout = getattr(self.cfg, "connect_timeout", 0) or None
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.result.error = f"connect timed out after {timeout}s"
+                logger.error("MCP server '{}': {}", self.name, self.result.error)
+                await self.close()
+            if self.result.connected:
+                if self._was_connected:
+                    self.stats.reconnects += 1
+                self._was_connected = True
+                self.stats.consecutive_failures = 0
+            else:
+                self.stats.consecutive_failures += 1
+                self.stats.last_error = self.result.error
+            return self.result
+
+    async def _serve(self) -> None:
+        result = self.result
+        try:
+            async with AsyncExitStack() as stack:
+                session = await _open_session(self.name, self.cfg, stack, result)
+                tools = await session.list_tools()
+                result.available_tools = [tool_def.name for tool_def in tools.tools]
+                result.registered_tools = _register_tools(
+                    self.name, self.cfg, tools.tools, self.registry, self, self.artifacts
                 )
-                read, write, _ = await stack.enter_async_context(
-                    streamable_http_client(cfg.url, http_client=http_client)
+                if self.cache:
+                    self.cache.put(self.name, self.cfg, tools.tools)
+                self.session = session
+                result.session = session
+                result.connected = True
+                logger.info(
+                    "MCP server '{}': connected, {} tools registered",
+                    self.name,
+                    len(result.registered_tools),
                 )
+                self._ready.set()
+                await self._closing.wait()
+        except _MCPConfigError as e:
+            self._misconfigured = True
+            result.error = str(e)
+            logger.warning("MCP server '{}': {}, skipping", self.name, e)
+        except Exception as e:
+            if result.connected:
+                result.connected = False
+                result.session = None
+                result.error = f"connection lost: {type(e).__name__}: {e}"
+                self.stats.last_error = result.error
+                logger.warning("MCP server '{}': connection lost: {}", self.name, e)
             else:
-                logger.warning("MCP server '{}': unknown transport type '{}'", name, transport_type)
-                result.error = f"unknown transport type '{transport_type}'"
-                continue
+                result.error = f"{type(e).__name__}: {e}"
+                logger.error("MCP server '{}': failed to connect: {}", self.name, e)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self) -> None:
+        """Close the server's session from inside its owner task."""
+        self._closing.set()
+        task, self._task = self._task, None
+        self.session = None
+        if task is None or task.done():
+            return
+        if not self._ready.is_set():
+            task.cancel()  # still handshaking; nothing to close gracefully
+        try:
+            await asyncio.wait_for(task, timeout=self._CLOSE_TIMEOUT_S)
+        except (asyncio.TimeoutError, RuntimeError, BaseExceptionGroup):
+            pass  # MCP SDK cancel scope cleanup is noisy but harmless
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling() > 0:
+                raise
+
+    async def shutdown(self) -> None:
+        """Stop health checks and close the session for good."""
+        # The flag also ends the monitor if wait_for() swallows the cancellation.
+        self._stopped = True
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+            self._monitor_task = None
+        await self.close()
+
+    async def ping(self) -> bool:
+        """Ping the server, recording round-trip time; False if it is unreachable."""
+        session = self.session
+        if session is None:
+            return False
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout=self._PING_TIMEOUT_S)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling() > 0:
+                raise
+            error = "ping cancelled"
+        except Exception as e:
+            error = f"ping failed: {type(e).__name__}: {e}"
+        else:
+            self.stats.ping_ms = (time.monotonic() - started) * 1000
+            return True
+        self.stats.last_error = self.result.error = error
+        logger.warning("MCP server '{}': {}", self.name, error)
+        return False
+
+    async def check(self) -> MCPServerConnectResult:
+        """Ping a connected server, reconnecting it if the ping fails or it is down."""
+        if self.connected and await self.ping():
+            return self.result
+        if self._misconfigured:
+            return self.result
+        await self.close()
+        return await self.connect()
+
+    def start_health_checks(self) -> None:
+        interval = getattr(self.cfg, "health_check_interval", 0)
+        if interval <= 0 or self._misconfigured:
+            return
+        self._stopped = False
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(
+                self._monitor(interval), name=f"mcp-health:{self.name}"
+            )
 
-            session = await stack.enter_async_context(ClientSession(read, write))
-            await session.initialize()
-
-            tools = await session.list_tools()
-            result.session = session
-            enabled_tools = set(cfg.enabled_tools)
-            allow_all_tools = "*" in enabled_tools
-            registered_count = 0
-            matched_enabled_tools: set[str] = set()
-            available_raw_names = [tool_def.name for tool_def in tools.tools]
-            result.available_tools = available_raw_names
-            available_wrapped_names = [f"mcp_{name}_{tool_def.name}" for tool_def in tools.tools]
-            for tool_def in tools.tools:
-                wrapped_name = f"mcp_{name}_{tool_def.name}"
-                if (
-                    not allow_all_tools
-                    and tool_def.name not in enabled_tools
-                    and wrapped_name not in enabled_tools
-                ):
-                    logger.debug(
-                        "MCP: skipping tool '{}' from server '{}' (not in enabledTools)",
-                        wrapped_name,
-                        name,
-                    )
-                    continue
-                wrapper = MCPToolWrapper(session, name, tool_def, tool_timeout=cfg.tool_timeout)
-                registry.register(wrapper)
-                logger.debug("MCP: registered tool '{}' from server '{}'", wrapper.name, name)
-                result.registered_tools.append(wrapper.name)
-                registered_count += 1
-                if enabled_tools:
-                    if tool_def.name in enabled_tools:
-                        matched_enabled_tools.add(tool_def.name)
-                    if wrapped_name in enabled_tools:
-                        matched_enabled_tools.add(wrapped_name)
-
-            if enabled_tools and not allow_all_tools:
-                unmatched_enabled_tools = sorted(enabled_tools - matched_enabled_tools)
-                if unmatched_enabled_tools:
-                    logger.warning(
-                        "MCP server '{}': enabledTools entries not found: {}. Available raw names: {}. "
-                        "Available wrapped names: {}",
-                        name,
-                        ", ".join(unmatched_enabled_tools),
-                        ", ".join(available_raw_names) or "(none)",
-                        ", ".join(available_wrapped_names) or "(none)",
-                    )
-
-            result.connected = True
-            logger.info("MCP server '{}': connected, {} tools registered", name, registered_count)
+    def _reconnect_delay(self) -> float:
+        exponent = max(0, self.stats.consecutive_failures - 1)
+        return min(self._RECONNECT_MAX_S, self._RECONNECT_BASE_S * 2**exponent)
+
+    async def _monitor(self, interval: float) -> None:
+        while not (self._misconfigured or self._stopped):
+            task = self._task
+            if task is not None and self.connected:
+                # Wakes early if the session task ends (server exited, transport closed).
+                await asyncio.wait({task}, timeout=interval)
+                if self.connected and not await self.ping():
+                    await self.close()
+                continue
+            await asyncio.sleep(self._reconnect_delay())
+            if not (self.connected or self._stopped):
+                logger.info("MCP server '{}': reconnecting", self.name)
+                await self.connect()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None, **kwargs: Any):
+        if not self.connected:
+            await self.connect()
+        session = self.session
+        if session is None:
+            raise RuntimeError(
+                f"MCP server '{self.name}' is not connected ({self.result.error or 'unknown error'})"
+            )
+        started = time.monotonic()
+        try:
+            result = await session.call_tool(name, arguments=arguments, **kwargs)
+        except asyncio.CancelledError:
+            self.stats.record_call((time.monotonic() - started) * 1000, "call cancelled or timed out")
+            raise
         except Exception as e:
-            result.error = f"{type(e).__name__}: {e}"
-            logger.error("MCP server '{}': failed to connect: {}", name, e)
+            self.stats.record_call((time.monotonic() - started) * 1000, f"{type(e).__name__}: {e}")
+            raise
+        self.stats.record_call((time.monotonic() - started) * 1000)
+        return result
+
+
+async def connect_mcp_servers(
+    mcp_servers: dict,
+    registry: ToolRegistry,
+    stack: AsyncExitStack,
+    cache: MCPToolCache | None = None,
+) -> dict[str, MCPServerConnectResult]:
+    """Connect to configured MCP servers concurrently and register their tools.
+
+    Each connection is closed when *stack* is.
+    """
+    try:
+        import mcp  # noqa: F401
+    except Exception as exc:
+        err = f"{type(exc).__name__}: {exc}"
+        results = {name: MCPServerConnectResult(name=name, error=err) for name in mcp_servers}
+        for name in results:
+            logger.error("MCP server '{}': failed to load MCP SDK: {}", name, err)
+        return results
 
-    return results
+    connections = [
+        MCPServerConnection(name, cfg, registry, cache) for name, cfg in mcp_servers.items()
+    ]
+    for connection in connections:
+        stack.push_async_callback(connection.shutdown)
+    results = await asyncio.gather(*(connection.connect() for connection in connections))
+    return {result.name: result for result in results}
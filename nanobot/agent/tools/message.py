@@ -1,13 +1,26 @@
 """Message tool for sending messages to users."""
 
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any, Awaitable, Callable
 
 from nanobot.agent.tools.base import Tool
 from nanobot.bus.events import OutboundMessage
 
 
+@dataclass
+class _TurnState:
+    """Mutable per-turn flags, shared by every task spawned during the turn."""
+
+    sent: bool = False
+
+
 class MessageTool(Tool):
-    """Tool to send messages to users on chat channels."""
+    """Tool to send messages to users on chat channels.
+
+    The default target and the per-turn "already sent" flag live in context
+    variables, so concurrent sessions sharing this instance each see their own.
+    """
 
     def __init__(
         self,
@@ -17,16 +30,14 @@ class MessageTool(Tool):
         default_message_id: str | None = None,
     ):
         self._send_callback = send_callback
-        self._default_channel = default_channel
-        self._default_chat_id = default_chat_id
-        self._default_message_id = default_message_id
-        self._sent_in_turn: bool = False
+        self._route: ContextVar[tuple[str, str, str | None]] = ContextVar(
+            "message_route", default=(default_channel, default_chat_id, default_message_id)
+        )
+        self._turn: ContextVar[_TurnState | None] = ContextVar("message_turn", default=None)
 
     def set_context(self, channel: str, chat_id: str, message_id: str | None = None) -> None:
         """Set the current message context."""
-        self._default_channel = channel
-        self._default_chat_id = chat_id
-        self._default_message_id = message_id
+        self._route.set((channel, chat_id, message_id))
 
     def set_send_callback(self, callback: Callable[[OutboundMessage], Awaitable[None]]) -> None:
         """Set the callback for sending messages."""
@@ -34,7 +45,21 @@ class MessageTool(Tool):
 
     def start_turn(self) -> None:
         """Reset per-turn send tracking."""
-        self._sent_in_turn = False
+        self._turn.set(_TurnState())
+
+    @property
+    def sent_in_turn(self) -> bool:
+        """Whether this turn already messaged its own chat."""
+        turn = self._turn.get()
+        return turn is not None and turn.sent
+
+    @sent_in_turn.setter
+    def sent_in_turn(self, value: bool) -> None:
+        turn = self._turn.get()
+        if turn is None:
+            turn = _TurnState()
+            self._turn.set(turn)
+        turn.sent = value
 
     @property
     def name(self) -> str:
@@ -84,9 +109,10 @@ class MessageTool(Tool):
         media: list[str] | None = None,
         **kwargs: Any
     ) -> str:
-        channel = channel or self._default_channel
-        chat_id = chat_id or self._default_chat_id
-        message_id = message_id or self._default_message_id
+        default_channel, default_chat_id, default_message_id = self._route.get()
+        channel = channel or default_channel
+        chat_id = chat_id or default_chat_id
+        message_id = message_id or default_message_id
 
         if not channel or not chat_id:
             return "Error: No target channel/chat specified"
@@ -106,8 +132,8 @@ class MessageTool(Tool):
 
         try:
             await self._send_callback(msg)
-            if channel == self._default_channel and chat_id == self._default_chat_id:
-                self._sent_in_turn = True
+            if channel == default_channel and chat_id == default_chat_id:
+                self.sent_in_turn = True
             media_info = f" with {len(media)} attachments" if media else ""
             return f"Message sent to {channel}:{chat_id}{media_info}"
         except Exception as e:
@@ -3,15 +3,157 @@
 import asyncio
 import os
 import re
+import shlex
+import shutil
+import signal
 import sys
+import time
+import uuid
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from loguru import logger
 
 from nanobot.agent.tools.base import Tool
 
 
+class _OutputCapture:
+    """Bounded capture of one process stream: a fixed head plus a rolling tail.
+
+    Only the first and last *limit* bytes are kept; everything in between is
+    counted but discarded, so memory stays constant no matter how much the
+    command prints.
+    """
+
+    __slots__ = ("limit", "head", "tail", "total")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def feed(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.limit:
+                del self.tail[: len(self.tail) - self.limit]
+
+    @property
+    def dropped(self) -> int:
+        """Number of bytes discarded between head and tail."""
+        return self.total - len(self.head) - len(self.tail)
+
+    def text(self) -> str:
+        return bytes(self.head + self.tail).decode("utf-8", errors="replace")
+
+
+class _ShellSession:
+    """A long-lived shell that runs one command at a time.
+
+    Commands are written to the shell's stdin and each one is followed by a
+    sentinel line on stdout (carrying the exit status) and on stderr, so the
+    reader knows where one command's output ends.  ``cd``, exported variables
+    and activated virtualenvs survive between commands.
+    """
+
+    def __init__(self, cwd: str, env: dict[str, str]):
+        self.cwd = cwd
+        self.env = env
+        self.process: asyncio.subprocess.Process | None = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self._token = f"__nanobot_{uuid.uuid4().hex}__".encode()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        bash = shutil.which("bash")
+        argv = [bash, "--noprofile", "--norc"] if bash else ["/bin/sh"]
+        self.process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            env=self.env,
+            start_new_session=True,
+        )
+
+    async def run(
+        self,
+        command: str,
+        stdout: _OutputCapture,
+        stderr: _OutputCapture,
+        on_chunk: Callable[[], None],
+    ) -> int | None:
+        """Run *command* and return its exit status (``None`` if the shell died)."""
+        assert self.process is not None
+        token = self._token.decode()
+        script = (
+            f"eval {shlex.quote(command)} < /dev/null\n"
+            f"printf '\\n{token} %d\\n' \"$?\"\n"
+            f"printf '\\n{token}\\n' >&2\n"
+        )
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+        status, _ = await asyncio.gather(
+            self._read_framed(self.process.stdout, stdout, on_chunk),
+            self._read_framed(self.process.stderr, stderr, on_chunk),
+        )
+        self.last_used = time.monotonic()
+        return status
+
+    async def _read_framed(
+        self,
+        stream: asyncio.StreamReader,
+        capture: _OutputCapture,
+        on_chunk: Callable[[], None],
+    ) -> int | None:
+        """Feed *stream* into *capture* up to the sentinel; return the status after it."""
+        needle = b"\n" + self._token
+        keep = len(needle)
+        pending = bytearray()
+        while True:
+            chunk = await stream.read(ExecTool._READ_CHUNK)
+            if not chunk:
+                capture.feed(bytes(pending))
+                return None
+            pending += chunk
+            idx = pending.find(needle)
+            if idx >= 0:
+                capture.feed(bytes(pending[:idx]))
+                on_chunk()
+                rest = bytes(pending[idx + len(needle):])
+                while b"\n" not in rest:
+                    more = await stream.read(64)
+                    if not more:
+                        break
+                    rest += more
+                try:
+                    return int(rest.split(b"\n", 1)[0].strip() or b"0")
+                except ValueError:
+                    return None
+            if len(pending) > keep:
+                capture.feed(bytes(pending[:-keep]))
+                del pending[:-keep]
+                on_chunk()
+
+    async def close(self) -> None:
+        if self.process is None:
+            return
+        await ExecTool._kill(self.process)
+        self.process = None
+
+
 class ExecTool(Tool):
     """Tool to execute shell commands."""
 
@@ -23,6 +165,8 @@ class ExecTool(Tool):
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
         path_append: str = "",
+        persistent: bool = False,
+        session_idle_timeout: int = 600,
     ):
         self.timeout = timeout
         self.working_dir = working_dir
@@ -40,6 +184,14 @@ class ExecTool(Tool):
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
         self.path_append = path_append
+        self.persistent = persistent and sys.platform != "win32"
+        self.session_idle_timeout = session_idle_timeout
+        self._session_key: ContextVar[str] = ContextVar("exec_session_key", default="cli:direct")
+        self._sessions: dict[str, _ShellSession] = {}
+
+    def set_context(self, session_key: str) -> None:
+        """Set the conversation whose shell session subsequent commands run in."""
+        self._session_key.set(session_key)
 
     @property
     def name(self) -> str:
@@ -47,9 +199,17 @@ class ExecTool(Tool):
 
     _MAX_TIMEOUT = 600
     _MAX_OUTPUT = 10_000
+    _MAX_CAPTURE_BYTES = 16 * 1024 * 1024  # hard cap: kill the command past this much output
+    _READ_CHUNK = 64 * 1024
 
     @property
     def description(self) -> str:
+        if self.persistent:
+            return (
+                "Execute a shell command and return its output. Use with caution. "
+                "Commands share one shell per conversation: cd, exported variables "
+                "and activated virtualenvs persist between calls."
+            )
         return "Execute a shell command and return its output. Use with caution."
 
     @property
@@ -89,9 +249,10 @@ class ExecTool(Tool):
 
         effective_timeout = min(timeout or self.timeout, self._MAX_TIMEOUT)
 
-        env = os.environ.copy()
-        if self.path_append:
-            env["PATH"] = env.get("PATH", "") + os.pathsep + self.path_append
+        if self.persistent:
+            return await self._execute_in_session(command, working_dir, effective_timeout)
+
+        env = self._build_env()
 
         try:
             process = await asyncio.create_subprocess_shell(
@@ -100,55 +261,182 @@ class ExecTool(Tool):
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
                 env=env,
+                # Own process group so the whole tree can be killed, not just the shell.
+                start_new_session=sys.platform != "win32",
             )
 
+            stdout = _OutputCapture(self._MAX_OUTPUT)
+            stderr = _OutputCapture(self._MAX_OUTPUT)
+            capped = False
+
+            async def _pump(stream: asyncio.StreamReader, capture: _OutputCapture) -> None:
+                nonlocal capped
+                while chunk := await stream.read(self._READ_CHUNK):
+                    if capped:
+                        continue  # drain until EOF so the killed process can be reaped
+                    capture.feed(chunk)
+                    if stdout.total + stderr.total > self._MAX_CAPTURE_BYTES:
+                        capped = True
+                        self._kill_tree(process)
+
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        _pump(process.stdout, stdout),
+                        _pump(process.stderr, stderr),
+                        process.wait(),
+                    ),
                     timeout=effective_timeout,
                 )
             except asyncio.TimeoutError:
-                process.kill()
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    pass
-                finally:
-                    if sys.platform != "win32":
-                        try:
-                            os.waitpid(process.pid, os.WNOHANG)
-                        except (ProcessLookupError, ChildProcessError) as e:
-                            logger.debug("Process already reaped or not found: {}", e)
+                await self._kill(process)
                 return f"Error: Command timed out after {effective_timeout} seconds"
 
-            output_parts = []
+            return self._format_output(stdout, stderr, capped, process.returncode)
 
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
 
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                if stderr_text.strip():
-                    output_parts.append(f"STDERR:\n{stderr_text}")
+    def _format_output(
+        self,
+        stdout: _OutputCapture,
+        stderr: _OutputCapture,
+        capped: bool,
+        returncode: int | None,
+    ) -> str:
+        """Render captured streams as the tool result, truncating head + tail."""
+        output_parts = []
 
-            output_parts.append(f"\nExit code: {process.returncode}")
+        if stdout.total:
+            output_parts.append(stdout.text())
 
-            result = "\n".join(output_parts) if output_parts else "(no output)"
+        if stderr.total:
+            stderr_text = stderr.text()
+            if stderr_text.strip():
+                output_parts.append(f"STDERR:\n{stderr_text}")
 
-            # Head + tail truncation to preserve both start and end of output
-            max_len = self._MAX_OUTPUT
-            if len(result) > max_len:
-                half = max_len // 2
-                result = (
-                    result[:half]
-                    + f"\n\n... ({len(result) - max_len:,} chars truncated) ...\n\n"
-                    + result[-half:]
-                )
+        if capped:
+            output_parts.append(
+                f"\nOutput exceeded {self._MAX_CAPTURE_BYTES:,} bytes; command was killed."
+            )
 
-            return result
+        if returncode is not None:
+            output_parts.append(f"\nExit code: {returncode}")
+
+        result = "\n".join(output_parts) if output_parts else "(no output)"
+
+        # Head + tail truncation to preserve both start and end of output.
+        # Bytes dropped from the middle of each stream during capture are
+        # counted here too, so the notice reflects the full output size.
+        max_len = self._MAX_OUTPUT
+        dropped = stdout.dropped + stderr.dropped
+        if len(result) > max_len:
+            half = max_len // 2
+            result = (
+                result[:half]
+                + f"\n\n... ({len(result) - max_len + dropped:,} chars truncated) ...\n\n"
+                + result[-half:]
+            )
 
-        except Exception as e:
-            return f"Error executing command: {str(e)}"
+        return result
+
+    def _build_env(self) -> dict[str, str]:
+        env = os.environ.copy()
+        if self.path_append:
+            env["PATH"] = env.get("PATH", "") + os.pathsep + self.path_append
+        return env
+
+    async def _execute_in_session(
+        self, command: str, working_dir: str | None, timeout: int,
+    ) -> str:
+        """Run *command* in the current conversation's persistent shell."""
+        await self._reap_idle_sessions()
+        key = self._session_key.get()
+        session = self._sessions.get(key)
+        if session is None:
+            session = _ShellSession(self.working_dir or os.getcwd(), self._build_env())
+            self._sessions[key] = session
+
+        async with session.lock:
+            try:
+                if not session.alive:
+                    await session.start()
+                if working_dir:
+                    command = f"cd {shlex.quote(working_dir)} && {command}"
+
+                stdout = _OutputCapture(self._MAX_OUTPUT)
+                stderr = _OutputCapture(self._MAX_OUTPUT)
+                capped = False
+
+                def _check_cap() -> None:
+                    nonlocal capped
+                    if not capped and stdout.total + stderr.total > self._MAX_CAPTURE_BYTES:
+                        capped = True
+                        self._kill_tree(session.process)
+
+                try:
+                    status = await asyncio.wait_for(
+                        session.run(command, stdout, stderr, _check_cap),
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    await session.close()
+                    return (
+                        f"Error: Command timed out after {timeout} seconds "
+                        "(shell session was reset)"
+                    )
+
+                if status is None:
+                    # The shell itself exited (`exit`, `set -e`, or the output cap).
+                    await session.close()
+                    result = self._format_output(stdout, stderr, capped, None)
+                    return result + "\n(shell session ended; a new one starts on the next command)"
+                return self._format_output(stdout, stderr, capped, status)
+            except Exception as e:
+                await session.close()
+                return f"Error executing command: {str(e)}"
+
+    async def _reap_idle_sessions(self) -> None:
+        """Close shell sessions that have been idle longer than the idle timeout."""
+        if self.session_idle_timeout <= 0:
+            return
+        cutoff = time.monotonic() - self.session_idle_timeout
+        for key, session in list(self._sessions.items()):
+            if session.last_used < cutoff and not session.lock.locked():
+                del self._sessions[key]
+                await session.close()
+
+    async def close_sessions(self) -> None:
+        """Terminate every persistent shell session."""
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            await session.close()
+
+    @staticmethod
+    def _kill_tree(process: asyncio.subprocess.Process) -> None:
+        """Kill the shell and everything it spawned."""
+        try:
+            if sys.platform != "win32":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @classmethod
+    async def _kill(cls, process: asyncio.subprocess.Process) -> None:
+        """Kill a child process tree and reap it without blocking for long."""
+        cls._kill_tree(process)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if sys.platform != "win32":
+                try:
+                    os.waitpid(process.pid, os.WNOHANG)
+                except (ProcessLookupError, ChildProcessError) as e:
+                    logger.debug("Process already reaped or not found: {}", e)
 
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
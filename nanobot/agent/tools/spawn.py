@@ -1,6 +1,7 @@
 """Spawn tool for creating background subagents."""
 
-from typing import TYPE_CHECKING, Any
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from nanobot.agent.tools.base import Tool
 
@@ -8,15 +9,21 @@ if TYPE_CHECKING:
     from nanobot.agent.subagent import SubagentManager
 
 
+class _SpawnOrigin(NamedTuple):
+    channel: str = "cli"
+    chat_id: str = "direct"
+    session_key: str = "cli:direct"
+    reasoning_effort: str | None = None
+
+
 class SpawnTool(Tool):
     """Tool to spawn a subagent for background task execution."""
 
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
-        self._session_key = "cli:direct"
-        self._reasoning_effort: str | None = None
+        self._origin: ContextVar[_SpawnOrigin] = ContextVar(
+            "spawn_origin", default=_SpawnOrigin()
+        )
 
     def set_context(
         self,
@@ -26,10 +33,9 @@ class SpawnTool(Tool):
         reasoning_effort: str | None = None,
     ) -> None:
         """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
-        self._session_key = session_key or f"{channel}:{chat_id}"
-        self._reasoning_effort = reasoning_effort
+        self._origin.set(
+            _SpawnOrigin(channel, chat_id, session_key or f"{channel}:{chat_id}", reasoning_effort)
+        )
 
     @property
     def name(self) -> str:
@@ -64,11 +70,12 @@ class SpawnTool(Tool):
 
     async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
         """Spawn a subagent to execute the given task."""
+        origin = self._origin.get()
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
-            session_key=self._session_key,
-            reasoning_effort=self._reasoning_effort,
+            origin_channel=origin.channel,
+            origin_chat_id=origin.chat_id,
+            session_key=origin.session_key,
+            reasoning_effort=origin.reasoning_effort,
         )
@@ -404,12 +404,51 @@ def _onboard_plugins(config_path: Path) -> None:
 def _make_provider(config: Config):
     """Create the appropriate LLM provider from config.
 
-    Routing is driven by ``ProviderSpec.backend`` in the registry.
+    Routing is driven by ``ProviderSpec.backend`` in the registry.  When
+    ``agents.defaults.fallbackModels`` is set, the primary model and its
+    fallbacks are wrapped in a :class:`FailoverProvider`.
     """
+    defaults = config.agents.defaults
+    provider = _make_model_provider(config, defaults.model)
+    if not defaults.fallback_models:
+        return provider
+
+    from nanobot.providers.failover import FailoverProvider, FailoverTarget
+
+    targets = [FailoverTarget(provider, defaults.model)]
+    for model in defaults.fallback_models:
+        targets.append(FailoverTarget(_make_model_provider(config, model), model))
+    failover = FailoverProvider(targets, hedge=defaults.hedge_requests)
+    failover.generation = provider.generation
+    return failover
+
+
+def _make_auxiliary_provider(config: Config, provider):
+    """Return the (provider, model) pair used for internal classification and summaries.
+
+    Without ``agents.defaults.auxiliary.model`` this is the agent's own
+    provider and model.  Otherwise the auxiliary model gets its own provider
+    instance, so its concurrency and token budget are tracked separately.
+    """
+    from nanobot.providers.scheduler import RequestScheduler
+
+    aux = config.agents.defaults.auxiliary
+    if not aux.model:
+        return provider, config.agents.defaults.model
+    aux_provider = _make_model_provider(config, aux.model)
+    aux_provider.scheduler = RequestScheduler(
+        max_concurrent=aux.max_concurrent_requests,
+        tokens_per_minute=aux.tokens_per_minute,
+    )
+    return aux_provider, aux.model
+
+
+def _make_model_provider(config: Config, model: str):
+    """Create the provider that serves *model*."""
     from nanobot.providers.base import GenerationSettings
     from nanobot.providers.registry import find_by_name
+    from nanobot.providers.scheduler import RequestScheduler
 
-    model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
     spec = find_by_name(provider_name) if provider_name else None
@@ -487,9 +526,32 @@ def _make_provider(config: Config):
         max_tokens=defaults.max_tokens,
         reasoning_effort=defaults.reasoning_effort,
     )
+    if p:
+        provider.scheduler = RequestScheduler(
+            max_concurrent=p.max_concurrent_requests,
+            tokens_per_minute=p.tokens_per_minute,
+        )
+    if defaults.response_cache.enabled:
+        from nanobot.config.paths import get_runtime_subdir
+        from nanobot.providers.response_cache import ResponseCache
+
+        provider.response_cache = ResponseCache(
+            get_runtime_subdir("llm_cache"),
+            max_entries=defaults.response_cache.max_entries,
+            ttl_s=defaults.response_cache.ttl_s,
+        )
     return provider
 
 
+def _mcp_tool_cache_path(config: Config) -> Path | None:
+    """Where MCP tool lists are cached between runs (only when servers are configured)."""
+    if not config.tools.mcp_servers:
+        return None
+    from nanobot.config.paths import get_runtime_subdir
+
+    return get_runtime_subdir("mcp") / "tools.json"
+
+
 def _load_runtime_config(config: str | None = None, workspace: str | None = None) -> Config:
     """Load config and optionally override the active workspace."""
     from nanobot.config.loader import load_config, set_config_path
@@ -575,6 +637,7 @@ def gateway(
         sync_workspace_templates(config.workspace_path, memory_backend=config.memory.backend)
     bus = MessageBus()
     provider = _make_provider(config)
+    aux_provider, aux_model = _make_auxiliary_provider(config, provider)
     session_manager = SessionManager(config.workspace_path)
 
     # Preserve existing single-workspace installs, but keep custom workspaces clean.
@@ -583,7 +646,11 @@ def gateway(
 
     # Create cron service with workspace-scoped store
     cron_store_path = config.workspace_path / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(
+        cron_store_path,
+        max_concurrent_jobs=config.gateway.cron.max_concurrent_jobs,
+        run_timeout_s=config.gateway.cron.run_timeout_s,
+    )
 
     # Create agent with cron service
     agent = AgentLoop(
@@ -594,6 +661,8 @@ def gateway(
         max_iterations=config.agents.defaults.max_tool_iterations,
         context_window_tokens=config.agents.defaults.context_window_tokens,
         context_budget_tokens=config.agents.defaults.context_budget_tokens,
+        compact_tool_results=config.agents.defaults.compact_tool_results,
+        turn_budget_tokens=config.agents.defaults.turn_budget_tokens,
         web_search_config=config.tools.web.search,
         web_proxy=config.tools.web.proxy or None,
         exec_config=config.tools.exec,
@@ -605,6 +674,12 @@ def gateway(
         channels_config=config.channels,
         runtime_timezone=config.agents.defaults.timezone,
         memory_config=config.memory,
+        speculative_tools=config.agents.defaults.speculative_tools,
+        auxiliary_provider=aux_provider,
+        auxiliary_model=aux_model,
+        subagent_config=config.agents.defaults.subagents,
+        mcp_tool_cache_path=_mcp_tool_cache_path(config),
+        artifact_config=config.agents.defaults.artifacts,
     )
 
     # Set cron callback (needs agent)
@@ -642,15 +717,15 @@ def gateway(
         response = resp.content if resp else ""
 
         message_tool = agent.tools.get("message")
-        if isinstance(message_tool, MessageTool) and message_tool._sent_in_turn:
+        if isinstance(message_tool, MessageTool) and message_tool.sent_in_turn:
             return response
 
         if job.payload.deliver and job.payload.to and response:
             should_notify = await evaluate_response(
                 response,
                 job.payload.message,
-                provider,
-                agent.model,
+                aux_provider,
+                aux_model,
             )
             if should_notify:
                 from nanobot.bus.events import OutboundMessage
@@ -724,11 +799,12 @@ def gateway(
     hb_cfg = config.gateway.heartbeat
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
-        provider=provider,
-        model=agent.model,
+        provider=aux_provider,
+        model=aux_model,
         on_execute=on_heartbeat_execute,
         on_notify=on_heartbeat_notify,
         interval_s=hb_cfg.interval_s,
+        idle_recheck_s=hb_cfg.idle_recheck_s,
         enabled=hb_cfg.enabled,
         runtime_timezone=config.agents.defaults.timezone,
     )
@@ -802,6 +878,7 @@ def agent(
 
     bus = MessageBus()
     provider = _make_provider(config)
+    aux_provider, aux_model = _make_auxiliary_provider(config, provider)
 
     # Preserve existing single-workspace installs, but keep custom workspaces clean.
     if is_default_workspace(config.workspace_path):
@@ -824,6 +901,8 @@ def agent(
         max_iterations=config.agents.defaults.max_tool_iterations,
         context_window_tokens=config.agents.defaults.context_window_tokens,
         context_budget_tokens=config.agents.defaults.context_budget_tokens,
+        compact_tool_results=config.agents.defaults.compact_tool_results,
+        turn_budget_tokens=config.agents.defaults.turn_budget_tokens,
         web_search_config=config.tools.web.search,
         web_proxy=config.tools.web.proxy or None,
         exec_config=config.tools.exec,
@@ -834,6 +913,12 @@ def agent(
         channels_config=config.channels,
         runtime_timezone=config.agents.defaults.timezone,
         memory_config=config.memory,
+        speculative_tools=config.agents.defaults.speculative_tools,
+        auxiliary_provider=aux_provider,
+        auxiliary_model=aux_model,
+        subagent_config=config.agents.defaults.subagents,
+        mcp_tool_cache_path=_mcp_tool_cache_path(config),
+        artifact_config=config.agents.defaults.artifacts,
     )
 
     # Shared reference for progress callbacks
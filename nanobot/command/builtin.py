@@ -101,6 +101,9 @@ async def cmd_status(ctx: CommandContext) -> OutboundMessage:
     if ctx_est <= 0:
         ctx_est = loop._last_usage.get("prompt_tokens", 0)
     thinking_level, thinking_source = describe_session_reasoning_effort(session, default_effort)
+    subagents = None
+    if (manager := getattr(loop, "subagents", None)) is not None:
+        subagents = manager.get_status()
     return OutboundMessage(
         channel=ctx.msg.channel,
         chat_id=ctx.msg.chat_id,
@@ -114,6 +117,7 @@ async def cmd_status(ctx: CommandContext) -> OutboundMessage:
             context_tokens_estimate=ctx_est,
             thinking_level=thinking_level,
             thinking_source=thinking_source,
+            subagents=subagents,
         ),
         metadata={"render_as": "text"},
     )
@@ -145,10 +149,29 @@ def _format_mcp_status_content(statuses: list[dict]) -> str:
         error = item.get("error")
         if error and state != "connected":
             lines.append(f"    error: {error}")
+        stats = item.get("stats") or {}
+        if stats:
+            lines.append(f"    {_format_mcp_stats(stats)}")
+            last_error = stats.get("last_error")
+            if last_error and last_error != error:
+                lines.append(f"    last error: {last_error}")
 
     return "\n".join(lines)
 
 
+def _format_mcp_stats(stats: dict) -> str:
+    """Summarize one server's call latency, error and reconnect counters."""
+
+    def _ms(value: float | None) -> str:
+        return "-" if value is None else f"{value:.0f}ms"
+
+    return (
+        f"calls: {stats.get('calls', 0)}, errors: {stats.get('errors', 0)}"
+        f" - latency p50 {_ms(stats.get('p50_ms'))}, p95 {_ms(stats.get('p95_ms'))}"
+        f" - ping {_ms(stats.get('ping_ms'))} - reconnects: {stats.get('reconnects', 0)}"
+    )
+
+
 async def cmd_mcp(ctx: CommandContext) -> OutboundMessage:
     """Run a live MCP health check and summarize status for all configured servers."""
     check = getattr(ctx.loop, "refresh_mcp_status", None)
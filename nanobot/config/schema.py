@@ -32,6 +32,45 @@ class ChannelsConfig(Base):
     )  # Max delivery attempts (initial send included)
 
 
+class AuxiliaryModelConfig(Base):
+    """Cheaper model for internal calls (memory decisions, consolidation, heartbeat, evaluation)."""
+
+    model: str | None = None  # None = use the agent model and its provider budget
+    max_concurrent_requests: int = 0  # 0 = unlimited
+    tokens_per_minute: int = 0  # 0 = unlimited
+
+
+class SubagentConfig(Base):
+    """Background subagent pool limits."""
+
+    max_concurrent: int = 2  # Running subagents; later spawns wait in a queue (0 = unlimited)
+    max_iterations: int = 15
+    max_tokens: int = 0  # Prompt + completion tokens per subagent run (0 = unlimited)
+    timeout_s: int = 0  # Wall-clock budget per subagent run (0 = unlimited)
+
+
+class ResponseCacheConfig(Base):
+    """On-disk cache of temperature-0 responses for memory and evaluation calls.
+
+    The agent loop never uses it.  Heartbeat prompts carry the current time, so
+    repeat heartbeat checks are skipped by the heartbeat's own decision memo instead.
+    """
+
+    enabled: bool = False
+    max_entries: int = 512
+    ttl_s: int = 24 * 60 * 60
+
+
+class ArtifactConfig(Base):
+    """Large tool results kept under workspace/.artifacts instead of in the conversation."""
+
+    enabled: bool = True
+    threshold_chars: int = 16_000  # results longer than this are stored as artifacts
+    preview_chars: int = 2_000  # head + tail kept inline
+    max_total_mb: int = 200  # least recently used artifacts are pruned past this (0 = no cap)
+    ttl_s: int = 7 * 24 * 60 * 60  # artifacts unused this long are pruned (0 = keep)
+
+
 class AgentDefaults(Base):
     """Default agent configuration."""
 
@@ -45,8 +84,20 @@ class AgentDefaults(Base):
     temperature: float = 0.1
     max_tool_iterations: int = 40
     context_budget_tokens: int = 0  # Max old-history tokens during tool iterations (0 = no trim)
+    # Stub file reads superseded later in the same turn. Stubs rewrite earlier messages, which
+    # breaks the provider's prompt cache from there on, so they are applied in batches only
+    # when they save a good share of what they invalidate.
+    compact_tool_results: bool = True
+    turn_budget_tokens: int = 0  # Condense older tool results once a turn exceeds this (0 = off)
     reasoning_effort: str | None = None  # low / medium / high — enables LLM thinking mode
     timezone: str = "UTC"  # IANA timezone, e.g. "Asia/Shanghai", "America/New_York"
+    speculative_tools: bool = False  # Start read-only tool calls while the model is still streaming
+    fallback_models: list[str] = Field(default_factory=list)  # Tried in order when the model fails
+    hedge_requests: bool = False  # Race a request slower than its p95 against the next fallback
+    auxiliary: AuxiliaryModelConfig = Field(default_factory=AuxiliaryModelConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
+    subagents: SubagentConfig = Field(default_factory=SubagentConfig)
+    artifacts: ArtifactConfig = Field(default_factory=ArtifactConfig)
 
 
 class AgentsConfig(Base):
@@ -63,6 +114,8 @@ class ProviderConfig(Base):
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
     api_mode: Literal["auto", "chat", "responses"] = "auto"
     prompt_cache_retention: Literal["in-memory", "24h"] | None = "24h"
+    max_concurrent_requests: int = 0  # Per model; 0 = unlimited
+    tokens_per_minute: int = 0  # Per model; 0 = unlimited
 
 
 class ProvidersConfig(Base):
@@ -122,6 +175,8 @@ class MemoryConfig(Base):
 
     backend: Literal["local", "supermemory"] = "local"
     supermemory: SupermemoryConfig = Field(default_factory=SupermemoryConfig)
+    decision_batch_size: int = 8  # Post-turn memory decisions per model call; <=1 disables batching
+    decision_batch_window_s: float = 0.25  # How long a decision waits for others to join its batch
 
 
 class HeartbeatConfig(Base):
@@ -129,15 +184,24 @@ class HeartbeatConfig(Base):
 
     enabled: bool = True
     interval_s: int = 30 * 60  # 30 minutes
+    idle_recheck_s: int = 2 * 60 * 60  # Max wait before re-reviewing an unchanged, idle HEARTBEAT.md
     keep_recent_messages: int = 8
 
 
+class CronConfig(Base):
+    """Cron executor configuration."""
+
+    max_concurrent_jobs: int = 4
+    run_timeout_s: int = 0  # 0 = no per-run timeout
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
     host: str = "0.0.0.0"
     port: int = 18790
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
+    cron: CronConfig = Field(default_factory=CronConfig)
 
 
 class WebSearchConfig(Base):
@@ -164,6 +228,8 @@ class ExecToolConfig(Base):
     enable: bool = True
     timeout: int = 60
     path_append: str = ""
+    persistent_session: bool = False  # Keep one shell per chat session (cd/env/venv persist)
+    session_idle_timeout: int = 600  # Seconds before an idle persistent shell is closed
 
 
 class InputLimitsConfig(Base):
@@ -183,6 +249,9 @@ class MCPServerConfig(Base):
     url: str = ""  # HTTP/SSE: endpoint URL
     headers: dict[str, str] = Field(default_factory=dict)  # HTTP/SSE: custom headers
     tool_timeout: int = 30  # seconds before a tool call is cancelled
+    connect_timeout: int = 30  # seconds to wait for the server handshake (0 = no limit)
+    health_check_interval: int = 60  # seconds between pings/reconnect checks (0 = off)
+    max_result_chars: int = 50_000  # longer results are truncated and saved to a file (0 = off)
     enabled_tools: list[str] = Field(
         default_factory=lambda: ["*"]
     )  # Only register these tools; accepts raw MCP names or wrapped mcp_<server>_<tool> names; ["*"] = all tools; [] = no tools
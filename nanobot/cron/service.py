@@ -1,21 +1,27 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
+import heapq
 import json
 import time
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Literal
 
 from loguru import logger
 
 from nanobot.cron.types import (
+    CRON_CATCH_UP_POLICIES,
+    CRON_OVERLAP_POLICIES,
     DEFAULT_CRON_HISTORY_PROFILE,
     LEGACY_CRON_HISTORY_PROFILE,
+    CronCatchUpPolicy,
     CronHistoryProfile,
     CronJob,
     CronJobState,
+    CronOverlapPolicy,
     CronPayload,
     CronRunRecord,
     CronSchedule,
@@ -30,28 +36,45 @@ def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
-    """Compute next run time in ms."""
+@lru_cache(maxsize=1024)
+def _compiled_cron(expr: str) -> Any:
+    """Parse a cron expression once; callers reposition it with ``set_current``."""
+    from croniter import croniter
+
+    return croniter(expr)
+
+
+def _compute_next_run(
+    schedule: CronSchedule, now_ms: int, anchor_ms: int | None = None
+) -> int | None:
+    """Compute next run time in ms.
+
+    ``every`` schedules with an ``anchor_ms`` stay on the ``anchor + k * every``
+    grid, returning the first slot after ``now_ms``, so intervals do not drift
+    by however long each run (or each timer tick) took.
+    """
     if schedule.kind == "at":
         return schedule.at_ms if schedule.at_ms and schedule.at_ms > now_ms else None
 
     if schedule.kind == "every":
         if not schedule.every_ms or schedule.every_ms <= 0:
             return None
-        # Next interval from now
-        return now_ms + schedule.every_ms
+        if anchor_ms is None:
+            # Next interval from now
+            return now_ms + schedule.every_ms
+        periods = (now_ms - anchor_ms) // schedule.every_ms + 1
+        return anchor_ms + periods * schedule.every_ms
 
     if schedule.kind == "cron" and schedule.expr:
         try:
             from zoneinfo import ZoneInfo
 
-            from croniter import croniter
-
             # Use caller-provided reference time for deterministic scheduling
             base_time = now_ms / 1000
             tz = ZoneInfo(schedule.tz) if schedule.tz else datetime.now().astimezone().tzinfo
             base_dt = datetime.fromtimestamp(base_time, tz=tz)
-            cron = croniter(schedule.expr, base_dt)
+            cron = _compiled_cron(schedule.expr)
+            cron.set_current(base_dt)
             next_dt = cron.get_next(datetime)
             return int(next_dt.timestamp() * 1000)
         except Exception:
@@ -60,6 +83,22 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
     return None
 
 
+def _normalize_overlap(value: str | None) -> CronOverlapPolicy:
+    """Normalize a persisted overlap policy, defaulting to ``skip``."""
+    normalized = (value or "").strip().lower()
+    if normalized in CRON_OVERLAP_POLICIES:
+        return CRON_OVERLAP_POLICIES[CRON_OVERLAP_POLICIES.index(normalized)]
+    return "skip"
+
+
+def _normalize_catch_up(value: str | None) -> CronCatchUpPolicy:
+    """Normalize a persisted catch-up policy, defaulting to ``skip``."""
+    normalized = (value or "").strip().lower()
+    if normalized in CRON_CATCH_UP_POLICIES:
+        return CRON_CATCH_UP_POLICIES[CRON_CATCH_UP_POLICIES.index(normalized)]
+    return "skip"
+
+
 def _validate_schedule_for_add(schedule: CronSchedule) -> None:
     """Validate schedule fields that would otherwise create non-runnable jobs."""
     if schedule.tz and schedule.kind != "cron":
@@ -84,21 +123,49 @@ def apply_cron_history_profile(session: Session, profile: CronHistoryProfile) ->
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """Service for managing and executing scheduled jobs.
+
+    Due jobs are dispatched to at most ``max_concurrent_jobs`` concurrent
+    runs, so one slow job does not hold back the others scheduled for the
+    same moment.  Each job's ``overlap`` policy decides what happens when it
+    comes due while its previous run is still going: ``skip`` the new run,
+    ``queue`` it behind the current one (at most one pending run), or
+    ``allow`` both to run.  Runs
+    longer than ``run_timeout_s`` (when positive) are cancelled and recorded
+    as errors.
+
+    Pending runs sit in a min-heap of ``(next_run_at_ms, job_id)`` entries.
+    Entries are never updated in place: a job that is rescheduled, disabled or
+    removed just leaves a stale entry behind, which is dropped when it reaches
+    the top.  Runs missed while the service was down, or while a tick was late,
+    follow the job's ``catch_up`` policy: ``skip`` them, run ``once``, or run
+    ``all`` of them (up to ``_MAX_CATCH_UP_RUNS``, queued behind each other).
+    """
 
     _MAX_RUN_HISTORY = 20
+    _MAX_CATCH_UP_RUNS = 50
 
     def __init__(
         self,
         store_path: Path,
         on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        max_concurrent_jobs: int = 4,
+        run_timeout_s: float = 0,
     ):
         self.store_path = store_path
         self.on_job = on_job
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.run_timeout_s = run_timeout_s
         self._store: CronStore | None = None
         self._last_mtime: float = 0.0
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self._workers = asyncio.Semaphore(self.max_concurrent_jobs)
+        self._run_tasks: set[asyncio.Task] = set()
+        self._active_runs: dict[str, int] = {}
+        self._queued_runs: dict[str, list[int | None]] = {}
+        self._jobs_by_id: dict[str, CronJob] = {}
+        self._heap: list[tuple[int, str]] = []
 
     def _load_store(self) -> CronStore:
         """Load jobs from disk. Reloads automatically if file was modified externally."""
@@ -149,6 +216,7 @@ class CronService:
                                         status=r["status"],
                                         duration_ms=r.get("durationMs", 0),
                                         error=r.get("error"),
+                                        lag_ms=r.get("lagMs", 0),
                                     )
                                     for r in j.get("state", {}).get("runHistory", [])
                                 ],
@@ -156,6 +224,8 @@ class CronService:
                             created_at_ms=j.get("createdAtMs", 0),
                             updated_at_ms=j.get("updatedAtMs", 0),
                             delete_after_run=j.get("deleteAfterRun", False),
+                            overlap=_normalize_overlap(j.get("overlap")),
+                            catch_up=_normalize_catch_up(j.get("catchUp")),
                         )
                     )
                 self._store = CronStore(jobs=jobs)
@@ -165,6 +235,7 @@ class CronService:
         else:
             self._store = CronStore()
 
+        self._reindex()
         return self._store
 
     def _save_store(self) -> None:
@@ -207,6 +278,7 @@ class CronService:
                                 "status": r.status,
                                 "durationMs": r.duration_ms,
                                 "error": r.error,
+                                "lagMs": r.lag_ms,
                             }
                             for r in j.state.run_history
                         ],
@@ -214,6 +286,8 @@ class CronService:
                     "createdAtMs": j.created_at_ms,
                     "updatedAtMs": j.updated_at_ms,
                     "deleteAfterRun": j.delete_after_run,
+                    "overlap": j.overlap,
+                    "catchUp": j.catch_up,
                 }
                 for j in self._store.jobs
             ],
@@ -239,24 +313,70 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for task in self._run_tasks:
+            task.cancel()
+        self._queued_runs.clear()
 
     def _recompute_next_runs(self) -> None:
-        """Recompute next run times for all enabled jobs."""
+        """Recompute next run times for all enabled jobs.
+
+        A run that came due while the service was down is left due when the
+        job's catch-up policy wants it replayed, so the first tick picks it up.
+        """
         if not self._store:
             return
         now = _now_ms()
         for job in self._store.jobs:
-            if job.enabled:
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+            if not job.enabled:
+                continue
+            missed = job.state.next_run_at_ms
+            if missed and missed <= now and job.catch_up != "skip":
+                logger.info("Cron: job '{}' missed a run while stopped, catching up", job.name)
+                continue
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, now, anchor_ms=missed)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the job index and the next-run heap from the store."""
+        jobs = self._store.jobs if self._store else []
+        self._jobs_by_id = {j.id: j for j in jobs}
+        self._heap = [
+            (j.state.next_run_at_ms, j.id) for j in jobs if j.enabled and j.state.next_run_at_ms
+        ]
+        heapq.heapify(self._heap)
+
+    def _schedule(self, job: CronJob) -> None:
+        """Push a job's current next run onto the heap."""
+        if not job.enabled or not job.state.next_run_at_ms:
+            return
+        heapq.heappush(self._heap, (job.state.next_run_at_ms, job.id))
+        if len(self._heap) > 2 * len(self._jobs_by_id) + 64:
+            self._reindex()  # too many stale entries
+
+    def _heap_job(self, entry: tuple[int, str]) -> CronJob | None:
+        """Return the job a heap entry refers to, or None if the entry is stale."""
+        run_at_ms, job_id = entry
+        job = self._jobs_by_id.get(job_id)
+        if job is None or not job.enabled or job.state.next_run_at_ms != run_at_ms:
+            return None
+        return job
 
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
-        if not self._store:
-            return None
-        times = [
-            j.state.next_run_at_ms for j in self._store.jobs if j.enabled and j.state.next_run_at_ms
-        ]
-        return min(times) if times else None
+        while self._heap and self._heap_job(self._heap[0]) is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _advance(self, job: CronJob, scheduled_ms: int, now: int, replay: bool) -> None:
+        """Move a dispatched job to its next slot, skipping missed slots unless replaying."""
+        if job.schedule.kind == "at":
+            job.state.next_run_at_ms = None
+            return
+        next_run = _compute_next_run(job.schedule, scheduled_ms, anchor_ms=scheduled_ms)
+        if next_run is not None and next_run <= now and not (replay and job.catch_up == "all"):
+            next_run = _compute_next_run(job.schedule, now, anchor_ms=scheduled_ms)
+        job.state.next_run_at_ms = next_run
+        self._schedule(job)
 
     def _arm_timer(self) -> None:
         """Schedule the next timer tick."""
@@ -284,60 +404,155 @@ class CronService:
             return
 
         now = _now_ms()
-        due_jobs = [
-            j
-            for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
-
-        for job in due_jobs:
-            await self._execute_job(job)
+        replays: dict[str, int] = {}
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            job = self._heap_job(entry)
+            if job is None:
+                continue
+            scheduled_ms = entry[0]
+            replays[job.id] = replays.get(job.id, 0) + 1
+            # Advance the schedule at dispatch time so the job is not picked up
+            # again by the next tick while this run is still in flight.
+            self._advance(job, scheduled_ms, now, replay=replays[job.id] < self._MAX_CATCH_UP_RUNS)
+            self._dispatch(job, scheduled_ms)
 
         self._save_store()
         self._arm_timer()
 
-    async def _execute_job(self, job: CronJob) -> None:
-        """Execute a single job."""
+    def _dispatch(self, job: CronJob, scheduled_ms: int | None) -> None:
+        """Start a due run, or skip/queue it if the job is still running."""
+        if self._active_runs.get(job.id) and job.overlap != "allow":
+            if job.overlap == "queue" or job.catch_up == "all":
+                # A job slower than its interval would otherwise queue runs
+                # without bound; keep one pending run (or the catch-up backlog).
+                queued = self._queued_runs.setdefault(job.id, [])
+                limit = self._MAX_CATCH_UP_RUNS if job.catch_up == "all" else 1
+                if len(queued) < limit:
+                    queued.append(scheduled_ms)
+                    logger.info("Cron: job '{}' still running, queued next run", job.name)
+                    return
+                logger.warning(
+                    "Cron: job '{}' still running with {} run(s) queued, dropping this run",
+                    job.name,
+                    len(queued),
+                )
+                self._record_skipped(job, scheduled_ms, "run queue full")
+                return
+            logger.info("Cron: job '{}' still running, skipping this run", job.name)
+            self._record_skipped(job, scheduled_ms, "previous run still in progress")
+            return
+
+        self._active_runs[job.id] = self._active_runs.get(job.id, 0) + 1
+        task = asyncio.create_task(self._run_dispatched(job, scheduled_ms))
+        self._run_tasks.add(task)
+        task.add_done_callback(self._run_tasks.discard)
+
+    async def _run_dispatched(self, job: CronJob, scheduled_ms: int | None) -> None:
+        """Run one dispatched job once a worker slot is free, then drain its queue."""
+        try:
+            async with self._workers:
+                await self._execute_job(job, scheduled_ms)
+            self._save_store()
+        finally:
+            remaining = self._active_runs.get(job.id, 1) - 1
+            if remaining > 0:
+                self._active_runs[job.id] = remaining
+            else:
+                self._active_runs.pop(job.id, None)
+
+        queued = self._queued_runs.get(job.id)
+        if queued and self._running:
+            next_scheduled = queued.pop(0)
+            if not queued:
+                del self._queued_runs[job.id]
+            live = self.get_job(job.id)
+            if live is not None and live.enabled:
+                self._dispatch(live, next_scheduled)
+
+    def _record_skipped(self, job: CronJob, scheduled_ms: int | None, reason: str) -> None:
+        now = _now_ms()
+        self._append_run(
+            job,
+            CronRunRecord(
+                run_at_ms=now,
+                status="skipped",
+                error=reason,
+                lag_ms=max(0, now - scheduled_ms) if scheduled_ms else 0,
+            ),
+        )
+
+    def _append_run(self, job: CronJob, record: CronRunRecord) -> None:
+        job.state.run_history.append(record)
+        job.state.run_history = job.state.run_history[-self._MAX_RUN_HISTORY :]
+
+    async def _execute_job(self, job: CronJob, scheduled_ms: int | None = None) -> None:
+        """Execute a single job.
+
+        ``scheduled_ms`` is the run's due time for timer-dispatched runs; its
+        schedule has already been advanced.  Manual runs leave it unset.
+        """
         start_ms = _now_ms()
-        logger.info("Cron: executing job '{}' ({})", job.name, job.id)
+        lag_ms = max(0, start_ms - scheduled_ms) if scheduled_ms else 0
+        logger.info("Cron: executing job '{}' ({}), lag {}ms", job.name, job.id, lag_ms)
 
+        status: Literal["ok", "error"] = "ok"
+        error: str | None = None
         try:
             if self.on_job:
-                await self.on_job(job)
-
-            job.state.last_status = "ok"
-            job.state.last_error = None
+                if self.run_timeout_s > 0:
+                    await asyncio.wait_for(self.on_job(job), timeout=self.run_timeout_s)
+                else:
+                    await self.on_job(job)
             logger.info("Cron: job '{}' completed", job.name)
 
+        except asyncio.TimeoutError:
+            status, error = "error", f"timed out after {self.run_timeout_s:g}s"
+            logger.error("Cron: job '{}' {}", job.name, error)
+
         except Exception as e:
-            job.state.last_status = "error"
-            job.state.last_error = str(e)
+            status, error = "error", str(e)
             logger.error("Cron: job '{}' failed: {}", job.name, e)
 
         end_ms = _now_ms()
+        # The store may have been reloaded (or the job removed) while it ran.
+        store = self._load_store()
+        if not any(j is job for j in store.jobs):
+            live = next((j for j in store.jobs if j.id == job.id), None)
+            if live is None:
+                return
+            job = live
+
+        job.state.last_status = status
+        job.state.last_error = error
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = end_ms
 
-        job.state.run_history.append(
+        self._append_run(
+            job,
             CronRunRecord(
                 run_at_ms=start_ms,
-                status=job.state.last_status,
+                status=status,
                 duration_ms=end_ms - start_ms,
-                error=job.state.last_error,
-            )
+                error=error,
+                lag_ms=lag_ms,
+            ),
         )
-        job.state.run_history = job.state.run_history[-self._MAX_RUN_HISTORY :]
 
         # Handle one-shot jobs
         if job.schedule.kind == "at":
             if job.delete_after_run:
                 self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
+                self._jobs_by_id.pop(job.id, None)
             else:
                 job.enabled = False
                 job.state.next_run_at_ms = None
-        else:
-            # Compute next run
-            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+        elif scheduled_ms is None:
+            # Manual run: keep the job on its existing schedule grid
+            job.state.next_run_at_ms = _compute_next_run(
+                job.schedule, _now_ms(), anchor_ms=job.state.next_run_at_ms
+            )
+            self._schedule(job)
 
     # ========== Public API ==========
 
@@ -357,6 +572,8 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        overlap: CronOverlapPolicy = "skip",
+        catch_up: CronCatchUpPolicy = "skip",
     ) -> CronJob:
         """Add a new job."""
         store = self._load_store()
@@ -383,9 +600,13 @@ class CronService:
             created_at_ms=now,
             updated_at_ms=now,
             delete_after_run=delete_after_run,
+            overlap=_normalize_overlap(overlap),
+            catch_up=_normalize_catch_up(catch_up),
         )
 
         store.jobs.append(job)
+        self._jobs_by_id[job.id] = job
+        self._schedule(job)
         self._save_store()
         self._arm_timer()
 
@@ -398,6 +619,7 @@ class CronService:
         before = len(store.jobs)
         store.jobs = [j for j in store.jobs if j.id != job_id]
         removed = len(store.jobs) < before
+        self._jobs_by_id.pop(job_id, None)
 
         if removed:
             self._save_store()
@@ -415,6 +637,7 @@ class CronService:
                 job.updated_at_ms = _now_ms()
                 if enabled:
                     job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+                    self._schedule(job)
                 else:
                     job.state.next_run_at_ms = None
                 self._save_store()
@@ -447,4 +670,5 @@ class CronService:
             "enabled": self._running,
             "jobs": len(store.jobs),
             "next_wake_at_ms": self._get_next_wake_ms(),
+            "running_jobs": sum(self._active_runs.values()),
         }
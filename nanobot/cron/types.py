@@ -12,6 +12,12 @@ CRON_HISTORY_PROFILE_MAX_MESSAGES: dict[CronHistoryProfile, int] = {
     "compact": 8,
     "normal": 24,
 }
+# What to do when a job comes due while its previous run is still in progress.
+CronOverlapPolicy = Literal["skip", "queue", "allow"]
+CRON_OVERLAP_POLICIES: tuple[CronOverlapPolicy, ...] = ("skip", "queue", "allow")
+# What to do with runs missed while the service was down (or a tick was late).
+CronCatchUpPolicy = Literal["skip", "once", "all"]
+CRON_CATCH_UP_POLICIES: tuple[CronCatchUpPolicy, ...] = ("skip", "once", "all")
 
 
 def normalize_cron_history_profile(
@@ -66,6 +72,8 @@ class CronRunRecord:
     status: Literal["ok", "error", "skipped"]
     duration_ms: int = 0
     error: str | None = None
+    # Actual start minus the scheduled time (0 for manual runs)
+    lag_ms: int = 0
 
 
 @dataclass
@@ -93,6 +101,8 @@ class CronJob:
     created_at_ms: int = 0
     updated_at_ms: int = 0
     delete_after_run: bool = False
+    overlap: CronOverlapPolicy = "skip"
+    catch_up: CronCatchUpPolicy = "skip"
 
 
 @dataclass
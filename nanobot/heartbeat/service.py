@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import re
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from loguru import logger
 
+from nanobot.providers.scheduler import request_priority
+
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
 
@@ -30,6 +35,11 @@ _HEARTBEAT_TOOL = [
                         "type": "string",
                         "description": "Natural-language summary of active tasks (required for run)",
                     },
+                    "next_check_in_minutes": {
+                        "type": "integer",
+                        "description": "For skip: minutes until a time-based condition in the file "
+                        "could next become due. Omit if nothing in the file depends on the time.",
+                    },
                 },
                 "required": ["action"],
             },
@@ -40,6 +50,15 @@ _HEARTBEAT_TOOL = [
 _HEARTBEAT_CONTROL_RE = re.compile(r"^HEARTBEAT_[A-Z0-9_]+$")
 
 
+@dataclass
+class _Decision:
+    """The last Phase 1 decision and the HEARTBEAT.md content it was made on."""
+
+    digest: str
+    action: str
+    recheck_at: float  # monotonic time after which an unchanged file is reviewed again
+
+
 class HeartbeatService:
     """
     Periodic heartbeat service that wakes the agent to check for tasks.
@@ -51,8 +70,17 @@ class HeartbeatService:
     Phase 2 (execution): only triggered when Phase 1 returns ``run``.  The
     ``on_execute`` callback runs the task through the full agent loop and
     returns the result to deliver.
+
+    After a ``skip`` reported through the heartbeat tool, an unchanged
+    HEARTBEAT.md is not reviewed again until the model's
+    ``next_check_in_minutes`` hint (kept between ``interval_s`` and
+    ``idle_recheck_s``, and ``idle_recheck_s`` without one) has passed; the
+    service sleeps until then or until the file's mtime changes.  Errors and
+    replies without the tool call are not remembered, so the next tick asks again.
     """
 
+    _FILE_POLL_S = 10.0
+
     def __init__(
         self,
         workspace: Path,
@@ -63,6 +91,7 @@ class HeartbeatService:
         interval_s: int = 30 * 60,
         enabled: bool = True,
         runtime_timezone: str | None = None,
+        idle_recheck_s: int = 2 * 60 * 60,
     ):
         self.workspace = workspace
         self.provider = provider
@@ -72,8 +101,10 @@ class HeartbeatService:
         self.interval_s = interval_s
         self.enabled = enabled
         self.runtime_timezone = runtime_timezone
+        self.idle_recheck_s = idle_recheck_s
         self._running = False
         self._task: asyncio.Task | None = None
+        self._last_decision: _Decision | None = None
 
     @property
     def heartbeat_file(self) -> Path:
@@ -87,6 +118,24 @@ class HeartbeatService:
                 return None
         return None
 
+    def _file_stamp(self) -> tuple[int, int] | None:
+        try:
+            stat = self.heartbeat_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _idle_decision(self, content: str | None) -> _Decision | None:
+        """Return the last decision if it was a ``skip`` made on this exact *content*."""
+        last = self._last_decision
+        if last is None or last.action != "skip" or content is None:
+            return None
+        return last if self._digest(content) == last.digest else None
+
     @staticmethod
     def _is_control_output(text: str | None) -> bool:
         """Return whether *text* is a raw heartbeat control token."""
@@ -107,30 +156,44 @@ class HeartbeatService:
         """
         from nanobot.utils.helpers import current_time_str
 
-        response = await self.provider.chat_with_retry(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision.",
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        f"Current Time: {current_time_str(self.runtime_timezone)}\n\n"
-                        "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
-                        f"{content}"
-                    ),
-                },
-            ],
-            tools=_HEARTBEAT_TOOL,
-            model=self.model,
-        )
-
-        if not response.has_tool_calls:
+        with request_priority("background"):
+            response = await self.provider.chat_with_retry(
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision.",
+                    },
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Current Time: {current_time_str(self.runtime_timezone)}\n\n"
+                            "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
+                            f"{content}"
+                        ),
+                    },
+                ],
+                tools=_HEARTBEAT_TOOL,
+                model=self.model,
+                temperature=0.0,
+            )
+
+        call = response.tool_calls[0] if response.has_tool_calls else None
+        if response.finish_reason == "error" or call is None or call.name != "heartbeat":
             return "skip", ""
 
-        args = response.tool_calls[0].arguments
-        return args.get("action", "skip"), args.get("tasks", "")
+        args = call.arguments
+        action = args.get("action", "skip")
+        self._remember_decision(content, action, args.get("next_check_in_minutes"))
+        return action, args.get("tasks", "")
+
+    def _remember_decision(self, content: str, action: str, next_check_in_minutes: Any) -> None:
+        delay = float(self.idle_recheck_s)
+        try:
+            if next_check_in_minutes is not None:
+                delay = min(delay, max(self.interval_s, float(next_check_in_minutes) * 60))
+        except (TypeError, ValueError):
+            pass
+        self._last_decision = _Decision(self._digest(content), action, time.monotonic() + delay)
 
     async def start(self) -> None:
         """Start the heartbeat service."""
@@ -156,7 +219,7 @@ class HeartbeatService:
         """Main heartbeat loop."""
         while self._running:
             try:
-                await asyncio.sleep(self.interval_s)
+                await self._sleep_until_due()
                 if self._running:
                     await self._tick()
             except asyncio.CancelledError:
@@ -164,6 +227,17 @@ class HeartbeatService:
             except Exception as e:
                 logger.error("Heartbeat error: {}", e)
 
+    async def _sleep_until_due(self) -> None:
+        """Sleep one interval, or while idle until the file changes or its recheck time arrives."""
+        stamp = self._file_stamp()
+        idle = self._idle_decision(self._read_heartbeat_file())
+        due = idle.recheck_at if idle else time.monotonic() + self.interval_s
+        while (remaining := due - time.monotonic()) > 0:
+            await asyncio.sleep(min(remaining, self._FILE_POLL_S) if idle else remaining)
+            if idle and self._file_stamp() != stamp:
+                logger.debug("Heartbeat: HEARTBEAT.md changed, reviewing early")
+                return
+
     async def _tick(self) -> None:
         """Execute a single heartbeat tick."""
         from nanobot.utils.evaluator import evaluate_response
@@ -172,6 +246,10 @@ class HeartbeatService:
         if not content:
             logger.debug("Heartbeat: HEARTBEAT.md missing or empty")
             return
+        idle = self._idle_decision(content)
+        if idle and time.monotonic() < idle.recheck_at:
+            logger.debug("Heartbeat: HEARTBEAT.md unchanged since last skip, not re-checking yet")
+            return
 
         logger.info("Heartbeat: checking for tasks...")
 
@@ -12,6 +12,7 @@ import json_repair
 from loguru import logger
 
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.scheduler import parse_retry_after
 
 _ALNUM = string.ascii_letters + string.digits
 
@@ -67,40 +68,28 @@ class AnthropicProvider(LLMProvider):
         raw: list[dict[str, Any]] = []
 
         for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content")
-
-            if role == "system":
+            if msg.get("role") == "system":
+                content = self._sanitize_empty_content([msg])[0].get("content")
                 system = content if isinstance(content, (str, list)) else str(content or "")
                 continue
-
-            if role == "tool":
-                block = self._tool_result_block(msg)
-                if raw and raw[-1]["role"] == "user":
-                    prev_c = raw[-1]["content"]
-                    if isinstance(prev_c, list):
-                        prev_c.append(block)
-                    else:
-                        raw[-1]["content"] = [
-                            {"type": "text", "text": prev_c or ""}, block,
-                        ]
-                else:
-                    raw.append({"role": "user", "content": [block]})
-                continue
-
-            if role == "assistant":
-                raw.append({"role": "assistant", "content": self._assistant_blocks(msg)})
-                continue
-
-            if role == "user":
-                raw.append({
-                    "role": "user",
-                    "content": self._convert_user_content(content),
-                })
-                continue
+            converted = self._prepared.get(msg, self._convert_message)
+            if converted is not None:
+                raw.append(converted)
 
         return system, self._merge_consecutive(raw)
 
+    def _convert_message(self, msg: dict[str, Any]) -> dict[str, Any] | None:
+        """Convert one non-system message; memoized across iterations."""
+        msg = self._sanitize_empty_content([msg])[0]
+        role = msg.get("role", "")
+        if role == "tool":
+            return {"role": "user", "content": [self._tool_result_block(msg)]}
+        if role == "assistant":
+            return {"role": "assistant", "content": self._assistant_blocks(msg)}
+        if role == "user":
+            return {"role": "user", "content": self._convert_user_content(msg.get("content"))}
+        return None
+
     @staticmethod
     def _tool_result_block(msg: dict[str, Any]) -> dict[str, Any]:
         content = msg.get("content")
@@ -188,21 +177,29 @@ class AnthropicProvider(LLMProvider):
 
     @staticmethod
     def _merge_consecutive(msgs: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Anthropic requires alternating user/assistant roles."""
+        """Anthropic requires alternating user/assistant roles.
+
+        Inputs may be shared memoized conversions, so a merge copies the
+        previous message before extending it rather than mutating it.
+        """
         merged: list[dict[str, Any]] = []
+        owned = False
         for msg in msgs:
             if merged and merged[-1]["role"] == msg["role"]:
-                prev_c = merged[-1]["content"]
+                if not owned:
+                    prev_c = merged[-1]["content"]
+                    if isinstance(prev_c, str):
+                        prev_c = [{"type": "text", "text": prev_c}]
+                    merged[-1] = {**merged[-1], "content": list(prev_c)}
+                    owned = True
                 cur_c = msg["content"]
-                if isinstance(prev_c, str):
-                    prev_c = [{"type": "text", "text": prev_c}]
                 if isinstance(cur_c, str):
                     cur_c = [{"type": "text", "text": cur_c}]
                 if isinstance(cur_c, list):
-                    prev_c.extend(cur_c)
-                merged[-1]["content"] = prev_c
+                    merged[-1]["content"].extend(cur_c)
             else:
                 merged.append(msg)
+                owned = False
         return merged
 
     # ------------------------------------------------------------------
@@ -251,33 +248,70 @@ class AnthropicProvider(LLMProvider):
     # Prompt caching
     # ------------------------------------------------------------------
 
-    @staticmethod
+    @classmethod
     def _apply_cache_control(
+        cls,
         system: str | list[dict[str, Any]],
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
     ) -> tuple[str | list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]] | None]:
+        """Place cache breakpoints at prompt segment boundaries.
+
+        Same priority as the OpenAI-compatible path: stable system prompt,
+        prior history, newest message, memory section, then the last tool
+        only when there is no system prompt to cover it.
+        """
         marker = {"type": "ephemeral"}
+        budget = cls._MAX_CACHE_BREAKPOINTS
+        memory_block: dict[str, Any] | None = None
 
         if isinstance(system, str) and system:
-            system = [{"type": "text", "text": system, "cache_control": marker}]
+            system = [{"type": "text", "text": part} for part in cls._split_system_prompt(system)]
+            system[0]["cache_control"] = marker
+            if len(system) > 1:
+                memory_block = system[-1]
+            budget -= 1
         elif isinstance(system, list) and system:
             system = list(system)
             system[-1] = {**system[-1], "cache_control": marker}
+            budget -= 1
+
+        def _is_turn_start(m: dict[str, Any]) -> bool:
+            if m.get("role") != "user":
+                return False
+            c = m.get("content")
+            return not (
+                isinstance(c, list)
+                and c
+                and all(isinstance(b, dict) and b.get("type") == "tool_result" for b in c)
+            )
 
         new_msgs = list(messages)
-        if len(new_msgs) >= 3:
-            m = new_msgs[-2]
+        turn_start = next(
+            (i for i in range(len(new_msgs) - 1, -1, -1) if _is_turn_start(new_msgs[i])),
+            None,
+        )
+        for idx in cls._history_cache_points(turn_start, len(new_msgs) - 1):
+            if budget <= 0:
+                break
+            m = new_msgs[idx]
             c = m.get("content")
             if isinstance(c, str):
-                new_msgs[-2] = {**m, "content": [{"type": "text", "text": c, "cache_control": marker}]}
+                new_msgs[idx] = {**m, "content": [{"type": "text", "text": c, "cache_control": marker}]}
             elif isinstance(c, list) and c:
                 nc = list(c)
                 nc[-1] = {**nc[-1], "cache_control": marker}
-                new_msgs[-2] = {**m, "content": nc}
+                new_msgs[idx] = {**m, "content": nc}
+            else:
+                continue
+            budget -= 1
+
+        if memory_block is not None and budget > 0:
+            memory_block["cache_control"] = marker
+            budget -= 1
 
         new_tools = tools
-        if tools:
+        if tools and not system and budget > 0:
             new_tools = list(tools)
             new_tools[-1] = {**new_tools[-1], "cache_control": marker}
 
@@ -299,7 +333,7 @@ class AnthropicProvider(LLMProvider):
         supports_caching: bool = True,
     ) -> dict[str, Any]:
         model_name = self._strip_prefix(model or self.default_model)
-        system, anthropic_msgs = self._convert_messages(self._sanitize_empty_content(messages))
+        system, anthropic_msgs = self._convert_messages(messages)
         anthropic_tools = self._convert_tools(tools)
 
         if supports_caching:
@@ -370,15 +404,19 @@ class AnthropicProvider(LLMProvider):
 
         usage: dict[str, int] = {}
         if response.usage:
+            # input_tokens excludes cached input; report the full prompt size so
+            # cache hit rates compare with OpenAI-style usage.
+            cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
+            cache_write = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
+            prompt_tokens = response.usage.input_tokens + cache_read + cache_write
             usage = {
-                "prompt_tokens": response.usage.input_tokens,
+                "prompt_tokens": prompt_tokens,
                 "completion_tokens": response.usage.output_tokens,
-                "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+                "total_tokens": prompt_tokens + response.usage.output_tokens,
             }
-            for attr in ("cache_creation_input_tokens", "cache_read_input_tokens"):
-                val = getattr(response.usage, attr, 0)
-                if val:
-                    usage[attr] = val
+            if cache_read or cache_write:
+                usage["cached_tokens"] = cache_read
+                usage["cache_write_tokens"] = cache_write
 
         return LLMResponse(
             content="".join(content_parts) or None,
@@ -388,6 +426,15 @@ class AnthropicProvider(LLMProvider):
             thinking_blocks=thinking_blocks or None,
         )
 
+    @staticmethod
+    def _handle_error(e: Exception) -> LLMResponse:
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        return LLMResponse(
+            content=f"Error calling LLM: {e}",
+            finish_reason="error",
+            retry_after=parse_retry_after(headers),
+        )
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -410,7 +457,7 @@ class AnthropicProvider(LLMProvider):
             response = await self._client.messages.create(**kwargs)
             return self._parse_response(response)
         except Exception as e:
-            return LLMResponse(content=f"Error calling LLM: {e}", finish_reason="error")
+            return self._handle_error(e)
 
     async def chat_stream(
         self,
@@ -422,6 +469,7 @@ class AnthropicProvider(LLMProvider):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         kwargs = self._build_kwargs(
             messages, tools, model, max_tokens, temperature,
@@ -435,7 +483,7 @@ class AnthropicProvider(LLMProvider):
                 response = await stream.get_final_message()
             return self._parse_response(response)
         except Exception as e:
-            return LLMResponse(content=f"Error calling LLM: {e}", finish_reason="error")
+            return self._handle_error(e)
 
     def get_default_model(self) -> str:
         return self.default_model
@@ -12,6 +12,8 @@ import httpx
 import json_repair
 
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.openai_compat_provider import ChatStreamAccumulator
+from nanobot.providers.scheduler import parse_retry_after
 
 _AZURE_MSG_KEYS = frozenset({"role", "content", "tool_calls", "tool_call_id", "name"})
 
@@ -152,6 +154,7 @@ class AzureOpenAIProvider(LLMProvider):
                     return LLMResponse(
                         content=f"Azure OpenAI API Error {response.status_code}: {response.text}",
                         finish_reason="error",
+                        retry_after=parse_retry_after(response.headers),
                     )
                 
                 response_data = response.json()
@@ -220,6 +223,7 @@ class AzureOpenAIProvider(LLMProvider):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         """Stream a chat completion via Azure OpenAI SSE."""
         deployment_name = model or self.default_model
@@ -239,8 +243,9 @@ class AzureOpenAIProvider(LLMProvider):
                         return LLMResponse(
                             content=f"Azure OpenAI API Error {response.status_code}: {text.decode('utf-8', 'ignore')}",
                             finish_reason="error",
+                            retry_after=parse_retry_after(response.headers),
                         )
-                    return await self._consume_stream(response, on_content_delta)
+                    return await self._consume_stream(response, on_content_delta, on_tool_call)
         except Exception as e:
             return LLMResponse(content=f"Error calling Azure OpenAI: {repr(e)}", finish_reason="error")
 
@@ -248,11 +253,10 @@ class AzureOpenAIProvider(LLMProvider):
         self,
         response: httpx.Response,
         on_content_delta: Callable[[str], Awaitable[None]] | None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         """Parse Azure OpenAI SSE stream into an LLMResponse."""
-        content_parts: list[str] = []
-        tool_call_buffers: dict[int, dict[str, str]] = {}
-        finish_reason = "stop"
+        acc = ChatStreamAccumulator()
 
         async for line in response.aiter_lines():
             if not line.startswith("data: "):
@@ -265,44 +269,14 @@ class AzureOpenAIProvider(LLMProvider):
             except Exception:
                 continue
 
-            choices = chunk.get("choices") or []
-            if not choices:
-                continue
-            choice = choices[0]
-            if choice.get("finish_reason"):
-                finish_reason = choice["finish_reason"]
-            delta = choice.get("delta") or {}
-
-            text = delta.get("content")
-            if text:
-                content_parts.append(text)
-                if on_content_delta:
-                    await on_content_delta(text)
-
-            for tc in delta.get("tool_calls") or []:
-                idx = tc.get("index", 0)
-                buf = tool_call_buffers.setdefault(idx, {"id": "", "name": "", "arguments": ""})
-                if tc.get("id"):
-                    buf["id"] = tc["id"]
-                fn = tc.get("function") or {}
-                if fn.get("name"):
-                    buf["name"] = fn["name"]
-                if fn.get("arguments"):
-                    buf["arguments"] += fn["arguments"]
-
-        tool_calls = [
-            ToolCallRequest(
-                id=buf["id"], name=buf["name"],
-                arguments=json_repair.loads(buf["arguments"]) if buf["arguments"] else {},
-            )
-            for buf in tool_call_buffers.values()
-        ]
+            text = acc.feed(chunk)
+            if text and on_content_delta:
+                await on_content_delta(text)
+            if on_tool_call:
+                for call in acc.take_ready_tool_calls():
+                    await on_tool_call(call)
 
-        return LLMResponse(
-            content="".join(content_parts) or None,
-            tool_calls=tool_calls,
-            finish_reason=finish_reason,
-        )
+        return acc.build()
 
     def get_default_model(self) -> str:
         """Get the default model (also used as default deployment name)."""
@@ -3,12 +3,18 @@
 import asyncio
 import json
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from loguru import logger
 
+from nanobot.providers.scheduler import RequestScheduler
+
+if TYPE_CHECKING:
+    from nanobot.providers.response_cache import ResponseCache
+
 
 @dataclass
 class ToolCallRequest:
@@ -48,6 +54,7 @@ class LLMResponse:
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
     thinking_blocks: list[dict] | None = None  # Anthropic extended thinking
+    retry_after: float | None = None  # Seconds advertised by a rate-limit response
     
     @property
     def has_tool_calls(self) -> bool:
@@ -70,6 +77,51 @@ class GenerationSettings:
     reasoning_effort: str | None = None
 
 
+_T = TypeVar("_T")
+_MISSING = object()
+
+
+class PreparedMessageCache:
+    """Memoize per-message request preparation by object identity.
+
+    The agent loop re-sends the same message dicts on every iteration and only
+    appends to the tail, so converting each message once keeps request building
+    linear over a run instead of quadratic.  An entry holds the source dict and
+    a snapshot of its values, so a message that was reassigned in place is
+    simply prepared again.  Prepared values are shared between calls and must
+    be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[dict[str, Any], tuple, Any]] = OrderedDict()
+
+    def get(self, msg: dict[str, Any], prepare: Callable[[dict[str, Any]], _T]) -> _T:
+        key = id(msg)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is msg:
+            snapshot = entry[1]
+            if len(snapshot) == len(msg) and all(
+                msg.get(k, _MISSING) is v for k, v in snapshot
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+
+        self.misses += 1
+        prepared = prepare(msg)
+        self._entries[key] = (msg, tuple(msg.items()), prepared)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return prepared
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -93,13 +145,48 @@ class LLMProvider(ABC):
         "server error",
         "temporarily unavailable",
     )
+    _RATE_LIMIT_MARKERS = ("429", "rate limit", "too many requests", "overloaded")
 
     _SENTINEL = object()
 
+    # Anthropic-style prompt caching allows at most this many cache_control markers.
+    _MAX_CACHE_BREAKPOINTS = 4
+    _PROMPT_SECTION_SEP = "\n\n---\n\n"
+
     def __init__(self, api_key: str | None = None, api_base: str | None = None):
         self.api_key = api_key
         self.api_base = api_base
         self.generation: GenerationSettings = GenerationSettings()
+        self._prepared = PreparedMessageCache()
+        self.scheduler = RequestScheduler()
+        self.response_cache: ResponseCache | None = None
+
+    @classmethod
+    def _split_system_prompt(cls, prompt: str) -> list[str]:
+        """Split a system prompt into its stable head and its memory section.
+
+        ContextBuilder orders sections from most to least stable and puts the
+        memory section last, so each part can end in its own cache breakpoint.
+        Joining the parts gives back the original prompt.
+        """
+        cut = prompt.find(cls._PROMPT_SECTION_SEP + "# Memory")
+        if cut <= 0:
+            return [prompt]
+        return [prompt[:cut], prompt[cut:]]
+
+    @staticmethod
+    def _history_cache_points(turn_start: int | None, last: int, first: int = 0) -> list[int]:
+        """Message indexes to mark: the end of prior history, then the newest message.
+
+        *turn_start* is the index of the current user message, whose runtime
+        context changes every turn; everything before it is stable history.
+        """
+        points: list[int] = []
+        if turn_start is not None and turn_start - 1 >= first:
+            points.append(turn_start - 1)
+        if last >= first and last not in points:
+            points.append(last)
+        return points
 
     @staticmethod
     def _sanitize_empty_content(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -196,6 +283,15 @@ class LLMProvider(ABC):
         err = (content or "").lower()
         return any(marker in err for marker in cls._TRANSIENT_ERROR_MARKERS)
 
+    def _backoff_delay(self, response: LLMResponse, delay: float) -> float:
+        """Pick the retry delay and, after a rate limit, pause the whole provider."""
+        if response.retry_after is not None:
+            delay = max(delay, response.retry_after)
+        err = (response.content or "").lower()
+        if response.retry_after is not None or any(m in err for m in self._RATE_LIMIT_MARKERS):
+            self.scheduler.backoff(delay)
+        return delay
+
     @staticmethod
     def _strip_image_content(messages: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
         """Replace image_url blocks with text placeholder. Returns None if no images found."""
@@ -218,14 +314,18 @@ class LLMProvider(ABC):
                 result.append(msg)
         return result if found else None
 
-    async def _safe_chat(self, **kwargs: Any) -> LLMResponse:
-        """Call chat() and convert unexpected exceptions to error responses."""
+    async def _safe_chat(self, resumed: bool = False, **kwargs: Any) -> LLMResponse:
+        """Call chat() through the scheduler and convert unexpected exceptions to error responses."""
+        model = kwargs.get("model") or self.get_default_model()
         try:
-            return await self.chat(**kwargs)
+            async with self.scheduler.slot(model, resumed=resumed):
+                response = await self.chat(**kwargs)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
             return LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+        self.scheduler.record_usage(model, response.usage)
+        return response
 
     async def chat_stream(
         self,
@@ -237,6 +337,7 @@ class LLMProvider(ABC):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         """Stream a chat completion, calling *on_content_delta* for each text chunk.
 
@@ -244,6 +345,10 @@ class LLMProvider(ABC):
         implementation falls back to a non-streaming call and delivers the
         full content as a single delta.  Providers that support native
         streaming should override this method.
+
+        Providers that can tell when a streamed tool call is complete pass it
+        to *on_tool_call* before the stream ends; the final response still
+        lists every tool call.
         """
         response = await self.chat(
             messages=messages, tools=tools, model=model,
@@ -254,14 +359,18 @@ class LLMProvider(ABC):
             await on_content_delta(response.content)
         return response
 
-    async def _safe_chat_stream(self, **kwargs: Any) -> LLMResponse:
-        """Call chat_stream() and convert unexpected exceptions to error responses."""
+    async def _safe_chat_stream(self, resumed: bool = False, **kwargs: Any) -> LLMResponse:
+        """Call chat_stream() through the scheduler and convert unexpected exceptions to error responses."""
+        model = kwargs.get("model") or self.get_default_model()
         try:
-            return await self.chat_stream(**kwargs)
+            async with self.scheduler.slot(model, resumed=resumed):
+                response = await self.chat_stream(**kwargs)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
             return LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+        self.scheduler.record_usage(model, response.usage)
+        return response
 
     async def chat_stream_with_retry(
         self,
@@ -273,6 +382,7 @@ class LLMProvider(ABC):
         reasoning_effort: object = _SENTINEL,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         """Call chat_stream() with retry on transient provider failures."""
         if max_tokens is self._SENTINEL:
@@ -288,9 +398,12 @@ class LLMProvider(ABC):
             reasoning_effort=reasoning_effort, tool_choice=tool_choice,
             on_content_delta=on_content_delta,
         )
+        if on_tool_call is not None:
+            kw["on_tool_call"] = on_tool_call
 
+        resumed = False
         for attempt, delay in enumerate(self._CHAT_RETRY_DELAYS, start=1):
-            response = await self._safe_chat_stream(**kw)
+            response = await self._safe_chat_stream(resumed, **kw)
 
             if response.finish_reason != "error":
                 return response
@@ -302,14 +415,16 @@ class LLMProvider(ABC):
                     return await self._safe_chat_stream(**{**kw, "messages": stripped})
                 return response
 
+            delay = self._backoff_delay(response, delay)
             logger.warning(
                 "LLM transient error (attempt {}/{}), retrying in {}s: {}",
                 attempt, len(self._CHAT_RETRY_DELAYS), delay,
                 (response.content or "")[:120].lower(),
             )
             await asyncio.sleep(delay)
+            resumed = True
 
-        return await self._safe_chat_stream(**kw)
+        return await self._safe_chat_stream(resumed, **kw)
 
     async def chat_with_retry(
         self,
@@ -320,12 +435,17 @@ class LLMProvider(ABC):
         temperature: object = _SENTINEL,
         reasoning_effort: object = _SENTINEL,
         tool_choice: str | dict[str, Any] | None = None,
+        cache: bool = False,
     ) -> LLMResponse:
         """Call chat() with retry on transient provider failures.
 
         Parameters default to ``self.generation`` when not explicitly passed,
         so callers no longer need to thread temperature / max_tokens /
         reasoning_effort through every layer.
+
+        ``cache=True`` lets a temperature-0 call use ``self.response_cache``.
+        Only internal deterministic calls (memory, evaluation) opt in; the
+        agent loop never does, so tool-call decisions are not replayed.
         """
         if max_tokens is self._SENTINEL:
             max_tokens = self.generation.max_tokens
@@ -340,8 +460,33 @@ class LLMProvider(ABC):
             reasoning_effort=reasoning_effort, tool_choice=tool_choice,
         )
 
+        store, cache_key = self.response_cache if cache else None, None
+        if store is not None and temperature == 0:
+            cache_key = store.key(
+                model or self.get_default_model(), messages, tools, tool_choice, temperature,
+                max_tokens=max_tokens, reasoning_effort=reasoning_effort,
+            )
+            if (cached := store.get(cache_key)) is not None:
+                return cached
+
+        response = await self._chat_with_retry(kw)
+        if cache_key is not None and self._is_cacheable(response, tool_choice):
+            store.put(cache_key, response)
+        return response
+
+    @staticmethod
+    def _is_cacheable(response: LLMResponse, tool_choice: str | dict[str, Any] | None) -> bool:
+        """Only keep answers worth replaying: no errors, and a forced tool call that happened."""
+        if response.finish_reason == "error":
+            return False
+        forced = isinstance(tool_choice, dict) or tool_choice == "required"
+        return response.has_tool_calls or not forced
+
+    async def _chat_with_retry(self, kw: dict[str, Any]) -> LLMResponse:
+        messages = kw["messages"]
+        resumed = False
         for attempt, delay in enumerate(self._CHAT_RETRY_DELAYS, start=1):
-            response = await self._safe_chat(**kw)
+            response = await self._safe_chat(resumed, **kw)
 
             if response.finish_reason != "error":
                 return response
@@ -353,14 +498,16 @@ class LLMProvider(ABC):
                     return await self._safe_chat(**{**kw, "messages": stripped})
                 return response
 
+            delay = self._backoff_delay(response, delay)
             logger.warning(
                 "LLM transient error (attempt {}/{}), retrying in {}s: {}",
                 attempt, len(self._CHAT_RETRY_DELAYS), delay,
                 (response.content or "")[:120].lower(),
             )
             await asyncio.sleep(delay)
+            resumed = True
 
-        return await self._safe_chat(**kw)
+        return await self._safe_chat(resumed, **kw)
 
     @abstractmethod
     def get_default_model(self) -> str:
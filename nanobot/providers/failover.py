@@ -0,0 +1,256 @@
+"""Composite provider that fails over (and optionally hedges) across model targets."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+@dataclass(eq=False)
+class FailoverTarget:
+    """One provider/model pair with its circuit breaker and latency history."""
+
+    provider: LLMProvider
+    model: str
+    failures: int = 0
+    open_until: float = 0.0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=50))
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def p95(self, min_samples: int) -> float | None:
+        """Return the 95th-percentile latency once enough samples are recorded."""
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class _StreamGate:
+    """Lets only one racing attempt forward stream callbacks to the caller."""
+
+    def __init__(self) -> None:
+        self.owner: FailoverTarget | None = None
+        self.started = asyncio.Event()
+        self.rivals: dict[FailoverTarget, asyncio.Task[LLMResponse]] = {}
+
+    def claim(self, target: FailoverTarget) -> bool:
+        if self.owner is None:
+            self.owner = target
+            self.started.set()
+            for other, task in self.rivals.items():
+                if other is not target:
+                    task.cancel()
+        return self.owner is target
+
+
+class FailoverProvider(LLMProvider):
+    """Route each request to the first healthy target, falling back down the list.
+
+    A target is skipped for ``cooldown_s`` after ``failure_threshold``
+    consecutive transient failures (rate limits, timeouts, 5xx once its own
+    retries are exhausted); a non-transient error fails over for that request
+    only.  With ``hedge`` enabled, a request still waiting on its target after
+    that target's p95 latency (time to first token when streaming) is raced
+    against the next target, and the slower attempt is cancelled.
+    """
+
+    _HEDGE_MIN_SAMPLES = 10
+
+    def __init__(
+        self,
+        targets: list[FailoverTarget],
+        *,
+        hedge: bool = False,
+        failure_threshold: int = 3,
+        cooldown_s: float = 30.0,
+    ):
+        if not targets:
+            raise ValueError("FailoverProvider needs at least one target")
+        super().__init__()
+        self.targets = targets
+        self.hedge = hedge
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+
+    def get_default_model(self) -> str:
+        return self.targets[0].model
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def chat(self, **kwargs: Any) -> LLMResponse:
+        return await self._dispatch(kwargs, retry=False, stream=False)
+
+    async def chat_stream(self, **kwargs: Any) -> LLMResponse:
+        return await self._dispatch(kwargs, retry=False, stream=True)
+
+    async def chat_with_retry(self, **kwargs: Any) -> LLMResponse:
+        return await self._dispatch(self._with_generation(kwargs), retry=True, stream=False)
+
+    async def chat_stream_with_retry(self, **kwargs: Any) -> LLMResponse:
+        return await self._dispatch(self._with_generation(kwargs), retry=True, stream=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _with_generation(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Fill generation defaults from this provider, not the wrapped ones."""
+        return {
+            "max_tokens": self.generation.max_tokens,
+            "temperature": self.generation.temperature,
+            "reasoning_effort": self.generation.reasoning_effort,
+            **kwargs,
+        }
+
+    def _ordered_targets(self) -> list[FailoverTarget]:
+        """Healthy targets in configured order, then open circuits as a last resort."""
+        healthy = [t for t in self.targets if t.available]
+        return healthy + [t for t in self.targets if not t.available]
+
+    async def _dispatch(self, kwargs: dict[str, Any], *, retry: bool, stream: bool) -> LLMResponse:
+        remaining = self._ordered_targets()
+        response: LLMResponse | None = None
+        while remaining:
+            target = remaining.pop(0)
+            backup = remaining[0] if self.hedge and remaining else None
+            tried, response = await self._attempt(target, backup, kwargs, retry, stream)
+            if response.finish_reason != "error":
+                return response
+            if backup is not None and backup in tried:
+                remaining.pop(0)
+            if remaining:
+                logger.warning(
+                    "LLM target {} failed, failing over to {}: {}",
+                    target.model, remaining[0].model, (response.content or "")[:120],
+                )
+        assert response is not None
+        return response
+
+    async def _attempt(
+        self,
+        target: FailoverTarget,
+        backup: FailoverTarget | None,
+        kwargs: dict[str, Any],
+        retry: bool,
+        stream: bool,
+    ) -> tuple[list[FailoverTarget], LLMResponse]:
+        """Run *target*, hedging to *backup* if it is slower than its usual p95."""
+        gate = _StreamGate()
+        threshold = target.p95(self._HEDGE_MIN_SAMPLES) if backup is not None else None
+        if threshold is None:
+            return [target], await self._call(target, kwargs, retry, stream, gate)
+
+        gate.rivals[target] = asyncio.create_task(self._call(target, kwargs, retry, stream, gate))
+        waiters: set[asyncio.Future[Any]] = {gate.rivals[target]}
+        started = asyncio.ensure_future(gate.started.wait())
+        if stream:
+            waiters.add(started)
+        try:
+            await asyncio.wait(waiters, timeout=threshold, return_when=asyncio.FIRST_COMPLETED)
+            if not gate.rivals[target].done() and gate.owner is None:
+                logger.info(
+                    "LLM target {} exceeded p95 {:.2f}s, hedging with {}",
+                    target.model, threshold, backup.model,
+                )
+                gate.rivals[backup] = asyncio.create_task(
+                    self._call(backup, kwargs, retry, stream, gate)
+                )
+            return list(gate.rivals), await self._first_success(gate)
+        finally:
+            started.cancel()
+            for task in gate.rivals.values():
+                task.cancel()
+            await asyncio.gather(*gate.rivals.values(), return_exceptions=True)
+
+    @staticmethod
+    async def _first_success(gate: _StreamGate) -> LLMResponse:
+        owners = {task: target for target, task in gate.rivals.items()}
+        pending: set[asyncio.Task[LLMResponse]] = set(owners)
+        failed: LLMResponse | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    continue
+                response = task.result()
+                if gate.owner is not None and owners[task] is not gate.owner:
+                    continue  # the caller already saw the other attempt's stream
+                if response.finish_reason != "error":
+                    return response
+                failed = response
+        return failed or LLMResponse(content="Error calling LLM: hedged request cancelled", finish_reason="error")
+
+    async def _call(
+        self,
+        target: FailoverTarget,
+        kwargs: dict[str, Any],
+        retry: bool,
+        stream: bool,
+        gate: _StreamGate,
+    ) -> LLMResponse:
+        """Call one target, recording latency and breaker state."""
+        requested = kwargs.get("model")
+        model = requested if requested and target is self.targets[0] else target.model
+        call_kw = {**kwargs, "model": model}
+        started = time.monotonic()
+        first_token: float | None = None
+
+        def _gated(callback: Callable[..., Awaitable[None]] | None):
+            if callback is None:
+                return None
+
+            async def _forward(value: Any) -> None:
+                nonlocal first_token
+                if first_token is None:
+                    first_token = time.monotonic()
+                if gate.claim(target):
+                    await callback(value)
+
+            return _forward
+
+        if stream:
+            call_kw["on_content_delta"] = _gated(kwargs.get("on_content_delta"))
+            on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = _gated(
+                kwargs.get("on_tool_call")
+            )
+            if on_tool_call is None:
+                call_kw.pop("on_tool_call", None)
+            else:
+                call_kw["on_tool_call"] = on_tool_call
+            method = target.provider.chat_stream_with_retry if retry else target.provider.chat_stream
+        else:
+            method = target.provider.chat_with_retry if retry else target.provider.chat
+
+        try:
+            response = await method(**call_kw)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            response = LLMResponse(content=f"Error calling LLM: {exc}", finish_reason="error")
+
+        if response.finish_reason != "error":
+            target.failures = 0
+            target.open_until = 0.0
+            target.latencies.append((first_token or time.monotonic()) - started)
+        elif self._is_transient_error(response.content):
+            target.failures += 1
+            if target.failures >= self.failure_threshold:
+                target.open_until = time.monotonic() + self.cooldown_s
+                logger.warning(
+                    "LLM target {} failed {} times, skipping it for {:.0f}s",
+                    target.model, target.failures, self.cooldown_s,
+                )
+        return response
@@ -39,6 +39,7 @@ class OpenAICodexProvider(LLMProvider):
         reasoning_effort: str | None,
         tool_choice: str | dict[str, Any] | None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         """Shared request logic for both chat() and chat_stream()."""
         model = model or self.default_model
@@ -73,6 +74,7 @@ class OpenAICodexProvider(LLMProvider):
                     body,
                     verify=True,
                     on_content_delta=on_content_delta,
+                    on_tool_call=on_tool_call,
                 )
             except Exception as e:
                 if "CERTIFICATE_VERIFY_FAILED" not in str(e):
@@ -84,6 +86,7 @@ class OpenAICodexProvider(LLMProvider):
                     body,
                     verify=False,
                     on_content_delta=on_content_delta,
+                    on_tool_call=on_tool_call,
                 )
             return LLMResponse(content=content, tool_calls=tool_calls, finish_reason=finish_reason)
         except Exception as e:
@@ -111,9 +114,10 @@ class OpenAICodexProvider(LLMProvider):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         return await self._call_codex(
-            messages, tools, model, reasoning_effort, tool_choice, on_content_delta
+            messages, tools, model, reasoning_effort, tool_choice, on_content_delta, on_tool_call
         )
 
     def get_default_model(self) -> str:
@@ -144,6 +148,7 @@ async def _request_codex(
     body: dict[str, Any],
     verify: bool,
     on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+    on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
 ) -> tuple[str, list[ToolCallRequest], str]:
     async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
         async with client.stream("POST", url, headers=headers, json=body) as response:
@@ -152,7 +157,7 @@ async def _request_codex(
                 raise RuntimeError(
                     _friendly_error(response.status_code, text.decode("utf-8", "ignore"))
                 )
-            return await _consume_sse(response, on_content_delta)
+            return await _consume_sse(response, on_content_delta, on_tool_call)
 
 
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -203,8 +208,9 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
 async def _consume_sse(
     response: httpx.Response,
     on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+    on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
 ) -> tuple[str, list[ToolCallRequest], str]:
-    content = ""
+    content_parts: list[str] = []
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
     finish_reason = "stop"
@@ -220,47 +226,49 @@ async def _consume_sse(
                 tool_call_buffers[call_id] = {
                     "id": item.get("id") or "fc_0",
                     "name": item.get("name"),
-                    "arguments": item.get("arguments") or "",
+                    "arguments": [item.get("arguments") or ""],
                 }
         elif event_type == "response.output_text.delta":
             delta_text = event.get("delta") or ""
-            content += delta_text
-            if on_content_delta and delta_text:
-                await on_content_delta(delta_text)
+            if delta_text:
+                content_parts.append(delta_text)
+                if on_content_delta:
+                    await on_content_delta(delta_text)
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
-                tool_call_buffers[call_id]["arguments"] += event.get("delta") or ""
+                tool_call_buffers[call_id]["arguments"].append(event.get("delta") or "")
         elif event_type == "response.function_call_arguments.done":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
-                tool_call_buffers[call_id]["arguments"] = event.get("arguments") or ""
+                tool_call_buffers[call_id]["arguments"] = [event.get("arguments") or ""]
         elif event_type == "response.output_item.done":
             item = event.get("item") or {}
             if item.get("type") == "function_call":
                 call_id = item.get("call_id")
                 if not call_id:
                     continue
-                buf = tool_call_buffers.get(call_id) or {}
-                args_raw = buf.get("arguments") or item.get("arguments") or "{}"
+                buf = tool_call_buffers.pop(call_id, None) or {}
+                args_raw = "".join(buf.get("arguments") or ()) or item.get("arguments") or "{}"
                 try:
                     args = json.loads(args_raw)
                 except Exception:
                     args = {"raw": args_raw}
-                tool_calls.append(
-                    ToolCallRequest(
-                        id=f"{call_id}|{buf.get('id') or item.get('id') or 'fc_0'}",
-                        name=buf.get("name") or item.get("name"),
-                        arguments=args,
-                    )
+                call = ToolCallRequest(
+                    id=f"{call_id}|{buf.get('id') or item.get('id') or 'fc_0'}",
+                    name=buf.get("name") or item.get("name"),
+                    arguments=args,
                 )
+                tool_calls.append(call)
+                if on_tool_call:
+                    await on_tool_call(call)
         elif event_type == "response.completed":
             status = (event.get("response") or {}).get("status")
             finish_reason = _map_finish_reason(status)
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    return "".join(content_parts), tool_calls, finish_reason
 
 
 _FINISH_REASON_MAP = {
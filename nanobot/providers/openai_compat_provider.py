@@ -14,7 +14,12 @@ import json_repair
 from openai import AsyncOpenAI
 
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
-from nanobot.providers.openai_responses_common import normalize_openai_usage
+from nanobot.providers.openai_responses_common import (
+    extract_text_content,
+    maybe_mapping,
+    normalize_openai_usage,
+)
+from nanobot.providers.scheduler import parse_retry_after
 
 if TYPE_CHECKING:
     from nanobot.providers.registry import ProviderSpec
@@ -103,6 +108,134 @@ def _extract_tc_extras(
     return extra_content, prov, fn_prov
 
 
+class ChatStreamAccumulator:
+    """Fold Chat Completions stream chunks into compact buffers as they arrive.
+
+    Only text parts and per-call argument fragments are kept, so memory grows
+    with the generated output rather than with the number of chunk objects.
+    Tool calls are streamed in index order: once a later call starts (or a
+    finish reason arrives) the earlier ones are final and
+    :meth:`ready_tool_calls` returns them before the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._text: list[str] = []
+        self._calls: dict[int, dict[str, Any]] = {}
+        self._ready: dict[int, ToolCallRequest] = {}
+        self._taken = 0
+        self.finish_reason: str | None = None
+        self.usage: dict[str, int] = {}
+
+    def feed(self, chunk: Any) -> str | None:
+        """Fold one chunk in and return its text delta, if any."""
+        if isinstance(chunk, str):
+            self._text.append(chunk)
+            return chunk
+
+        text: str | None = None
+        chunk_map = maybe_mapping(chunk)
+        if chunk_map is not None:
+            choices = chunk_map.get("choices") or []
+            if not choices:
+                self.usage = normalize_openai_usage(chunk_map) or self.usage
+                text = extract_text_content(
+                    chunk_map.get("content") or chunk_map.get("output_text")
+                )
+            else:
+                choice = maybe_mapping(choices[0]) or {}
+                if choice.get("finish_reason"):
+                    self.finish_reason = str(choice["finish_reason"])
+                delta = maybe_mapping(choice.get("delta")) or {}
+                text = extract_text_content(delta.get("content"))
+                for idx, tc in enumerate(delta.get("tool_calls") or []):
+                    self._feed_tool_call(tc, idx)
+                self.usage = normalize_openai_usage(chunk_map) or self.usage
+        elif not chunk.choices:
+            self.usage = normalize_openai_usage(chunk) or self.usage
+        else:
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                self.finish_reason = choice.finish_reason
+            delta = choice.delta
+            if delta:
+                text = delta.content or None
+                for tc in delta.tool_calls or []:
+                    self._feed_tool_call(tc, getattr(tc, "index", 0))
+
+        if text:
+            self._text.append(text)
+        return text
+
+    def _feed_tool_call(self, tc: Any, idx_hint: int) -> None:
+        tc_index: int = _get(tc, "index") if _get(tc, "index") is not None else idx_hint
+        buf = self._calls.get(tc_index)
+        if buf is None:
+            buf = self._calls[tc_index] = {
+                "id": "",
+                "name": "",
+                "arguments": [],
+                "extra_content": None,
+                "prov": None,
+                "fn_prov": None,
+            }
+        tc_id = _get(tc, "id")
+        if tc_id:
+            buf["id"] = str(tc_id)
+        fn = _get(tc, "function")
+        if fn is not None:
+            fn_name = _get(fn, "name")
+            if fn_name:
+                buf["name"] = str(fn_name)
+            fn_args = _get(fn, "arguments")
+            if fn_args:
+                buf["arguments"].append(str(fn_args))
+        ec, prov, fn_prov = _extract_tc_extras(tc)
+        if ec:
+            buf["extra_content"] = ec
+        if prov:
+            buf["prov"] = prov
+        if fn_prov:
+            buf["fn_prov"] = fn_prov
+
+    def _finalize(self, index: int) -> ToolCallRequest:
+        call = self._ready.get(index)
+        if call is None:
+            b = self._calls[index]
+            args = "".join(b["arguments"])
+            call = self._ready[index] = ToolCallRequest(
+                id=b["id"] or _short_tool_id(),
+                name=b["name"],
+                arguments=json_repair.loads(args) if args else {},
+                extra_content=b["extra_content"],
+                provider_specific_fields=b["prov"],
+                function_provider_specific_fields=b["fn_prov"],
+            )
+        return call
+
+    def ready_tool_calls(self) -> list[ToolCallRequest]:
+        """Return the tool calls whose arguments can no longer change."""
+        indexes = sorted(self._calls)
+        if self.finish_reason is None:
+            indexes = indexes[:-1]
+        return [self._finalize(i) for i in indexes]
+
+    def take_ready_tool_calls(self) -> list[ToolCallRequest]:
+        """Return ready tool calls not handed out by a previous call."""
+        ready = self.ready_tool_calls()
+        fresh = ready[self._taken:]
+        self._taken = len(ready)
+        return fresh
+
+    def build(self) -> LLMResponse:
+        """Assemble the final response from the folded buffers."""
+        return LLMResponse(
+            content="".join(self._text) or None,
+            tool_calls=[self._finalize(i) for i in self._calls],
+            finish_reason=self.finish_reason or "stop",
+            usage=self.usage,
+        )
+
+
 class OpenAICompatProvider(LLMProvider):
     """Unified provider for all OpenAI-compatible APIs.
 
@@ -151,14 +284,22 @@ class OpenAICompatProvider(LLMProvider):
             resolved = env_val.replace("{api_key}", api_key).replace("{api_base}", effective_base)
             os.environ.setdefault(env_name, resolved)
 
-    @staticmethod
+    @classmethod
     def _apply_cache_control(
+        cls,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
-        """Inject cache_control markers for prompt caching."""
+        """Inject cache_control markers at prompt segment boundaries.
+
+        In priority order, breakpoints go after the stable system prompt, after
+        prior history, after the newest message and after the memory section,
+        up to the provider limit.  Tools sit before the system prompt in the
+        cached prefix, so the last tool is only marked when there is none.
+        """
         cache_marker = {"type": "ephemeral"}
         new_messages = list(messages)
+        budget = cls._MAX_CACHE_BREAKPOINTS
 
         def _mark(msg: dict[str, Any]) -> dict[str, Any]:
             content = msg.get("content")
@@ -175,13 +316,39 @@ class OpenAICompatProvider(LLMProvider):
                 return {**msg, "content": nc}
             return msg
 
-        if new_messages and new_messages[0].get("role") == "system":
-            new_messages[0] = _mark(new_messages[0])
-        if len(new_messages) >= 3:
-            new_messages[-2] = _mark(new_messages[-2])
+        has_system = bool(new_messages) and new_messages[0].get("role") == "system"
+        memory_block: dict[str, Any] | None = None
+        if has_system:
+            system = new_messages[0]
+            content = system.get("content")
+            if isinstance(content, str) and content:
+                blocks = [{"type": "text", "text": part} for part in cls._split_system_prompt(content)]
+                blocks[0]["cache_control"] = cache_marker
+                if len(blocks) > 1:
+                    memory_block = blocks[-1]
+                new_messages[0] = {**system, "content": blocks}
+            else:
+                new_messages[0] = _mark(system)
+            budget -= 1
+
+        turn_start = next(
+            (i for i in range(len(new_messages) - 1, -1, -1) if new_messages[i].get("role") == "user"),
+            None,
+        )
+        for idx in cls._history_cache_points(turn_start, len(new_messages) - 1, int(has_system)):
+            if budget <= 0:
+                break
+            marked = _mark(new_messages[idx])
+            if marked is not new_messages[idx]:
+                new_messages[idx] = marked
+                budget -= 1
+
+        if memory_block is not None and budget > 0:
+            memory_block["cache_control"] = cache_marker
+            budget -= 1
 
         new_tools = tools
-        if tools:
+        if tools and not has_system and budget > 0:
             new_tools = list(tools)
             new_tools[-1] = {**new_tools[-1], "cache_control": cache_marker}
         return new_messages, new_tools
@@ -220,6 +387,10 @@ class OpenAICompatProvider(LLMProvider):
                 clean["tool_call_id"] = map_id(clean["tool_call_id"])
         return sanitized
 
+    def _prepare_message(self, msg: dict[str, Any]) -> dict[str, Any]:
+        """Sanitize one message for the wire; memoized across iterations."""
+        return self._sanitize_messages(self._sanitize_empty_content([msg]))[0]
+
     # ------------------------------------------------------------------
     # Build kwargs
     # ------------------------------------------------------------------
@@ -237,6 +408,9 @@ class OpenAICompatProvider(LLMProvider):
         model_name = model or self.default_model
         spec = self._spec
 
+        # Per-message sanitizing is memoized; only position-dependent cache
+        # markers are applied fresh, on copies, for every request.
+        messages = [self._prepared.get(m, self._prepare_message) for m in messages]
         if spec and spec.supports_prompt_caching:
             messages, tools = self._apply_cache_control(messages, tools)
 
@@ -245,7 +419,7 @@ class OpenAICompatProvider(LLMProvider):
 
         kwargs: dict[str, Any] = {
             "model": model_name,
-            "messages": self._sanitize_messages(self._sanitize_empty_content(messages)),
+            "messages": messages,
             "temperature": temperature,
         }
 
@@ -426,106 +600,17 @@ class OpenAICompatProvider(LLMProvider):
 
     @classmethod
     def _parse_chunks(cls, chunks: list[Any]) -> LLMResponse:
-        content_parts: list[str] = []
-        tc_bufs: dict[int, dict[str, Any]] = {}
-        finish_reason = "stop"
-        usage: dict[str, int] = {}
-
-        def _accum_tc(tc: Any, idx_hint: int) -> None:
-            """Accumulate one streaming tool-call delta into *tc_bufs*."""
-            tc_index: int = _get(tc, "index") if _get(tc, "index") is not None else idx_hint
-            buf = tc_bufs.setdefault(
-                tc_index,
-                {
-                    "id": "",
-                    "name": "",
-                    "arguments": "",
-                    "extra_content": None,
-                    "prov": None,
-                    "fn_prov": None,
-                },
-            )
-            tc_id = _get(tc, "id")
-            if tc_id:
-                buf["id"] = str(tc_id)
-            fn = _get(tc, "function")
-            if fn is not None:
-                fn_name = _get(fn, "name")
-                if fn_name:
-                    buf["name"] = str(fn_name)
-                fn_args = _get(fn, "arguments")
-                if fn_args:
-                    buf["arguments"] += str(fn_args)
-            ec, prov, fn_prov = _extract_tc_extras(tc)
-            if ec:
-                buf["extra_content"] = ec
-            if prov:
-                buf["prov"] = prov
-            if fn_prov:
-                buf["fn_prov"] = fn_prov
-
+        acc = ChatStreamAccumulator()
         for chunk in chunks:
-            if isinstance(chunk, str):
-                content_parts.append(chunk)
-                continue
-
-            chunk_map = cls._maybe_mapping(chunk)
-            if chunk_map is not None:
-                choices = chunk_map.get("choices") or []
-                if not choices:
-                    usage = cls._extract_usage(chunk_map) or usage
-                    text = cls._extract_text_content(
-                        chunk_map.get("content") or chunk_map.get("output_text")
-                    )
-                    if text:
-                        content_parts.append(text)
-                    continue
-                choice = cls._maybe_mapping(choices[0]) or {}
-                if choice.get("finish_reason"):
-                    finish_reason = str(choice["finish_reason"])
-                delta = cls._maybe_mapping(choice.get("delta")) or {}
-                text = cls._extract_text_content(delta.get("content"))
-                if text:
-                    content_parts.append(text)
-                for idx, tc in enumerate(delta.get("tool_calls") or []):
-                    _accum_tc(tc, idx)
-                usage = cls._extract_usage(chunk_map) or usage
-                continue
-
-            if not chunk.choices:
-                usage = cls._extract_usage(chunk) or usage
-                continue
-            choice = chunk.choices[0]
-            if choice.finish_reason:
-                finish_reason = choice.finish_reason
-            delta = choice.delta
-            if delta and delta.content:
-                content_parts.append(delta.content)
-            for tc in (delta.tool_calls or []) if delta else []:
-                _accum_tc(tc, getattr(tc, "index", 0))
-
-        return LLMResponse(
-            content="".join(content_parts) or None,
-            tool_calls=[
-                ToolCallRequest(
-                    id=b["id"] or _short_tool_id(),
-                    name=b["name"],
-                    arguments=json_repair.loads(b["arguments"]) if b["arguments"] else {},
-                    extra_content=b.get("extra_content"),
-                    provider_specific_fields=b.get("prov"),
-                    function_provider_specific_fields=b.get("fn_prov"),
-                )
-                for b in tc_bufs.values()
-            ],
-            finish_reason=finish_reason,
-            usage=usage,
-        )
+            acc.feed(chunk)
+        return acc.build()
 
     @staticmethod
     def _handle_error(e: Exception) -> LLMResponse:
         body = getattr(e, "doc", None) or getattr(getattr(e, "response", None), "text", None)
         msg = f"Error: {body.strip()[:500]}" if body and body.strip() else f"Error calling LLM: {e}"
-        return LLMResponse(content=msg, finish_reason="error")
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        return LLMResponse(content=msg, finish_reason="error", retry_after=parse_retry_after(headers))
 
     # ------------------------------------------------------------------
     # Public API
@@ -565,6 +650,7 @@ class OpenAICompatProvider(LLMProvider):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         kwargs = self._build_kwargs(
             messages,
@@ -579,14 +665,15 @@ class OpenAICompatProvider(LLMProvider):
         kwargs["stream_options"] = {"include_usage": True}
         try:
             stream = await self._client.chat.completions.create(**kwargs)
-            chunks: list[Any] = []
+            acc = ChatStreamAccumulator()
             async for chunk in stream:
-                chunks.append(chunk)
-                if on_content_delta and chunk.choices:
-                    text = getattr(chunk.choices[0].delta, "content", None)
-                    if text:
-                        await on_content_delta(text)
-            return self._parse_chunks(chunks)
+                text = acc.feed(chunk)
+                if on_content_delta and text:
+                    await on_content_delta(text)
+                if on_tool_call:
+                    for call in acc.take_ready_tool_calls():
+                        await on_tool_call(call)
+            return acc.build()
         except Exception as e:
             return self._handle_error(e)
 
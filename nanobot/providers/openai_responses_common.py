@@ -97,9 +97,18 @@ def normalize_openai_usage(value: Any) -> dict[str, int]:
     cached_tokens = _nested_int(usage_map, "prompt_tokens_details", "cached_tokens")
     if cached_tokens is None:
         cached_tokens = _nested_int(usage_map, "input_token_details", "cached_tokens")
+    if cached_tokens is None:
+        cached_tokens = _nested_int(usage_map, "cache_read_input_tokens")
     if cached_tokens is not None:
         normalized["cached_tokens"] = int(cached_tokens)
 
+    # Cache writes are reported by Anthropic-backed gateways such as OpenRouter.
+    cache_write_tokens = _nested_int(usage_map, "prompt_tokens_details", "cache_write_tokens")
+    if cache_write_tokens is None:
+        cache_write_tokens = _nested_int(usage_map, "cache_creation_input_tokens")
+    if cache_write_tokens is not None:
+        normalized["cache_write_tokens"] = int(cache_write_tokens)
+
     return normalized
 
 
@@ -22,6 +22,7 @@ from nanobot.providers.openai_responses_common import (
     maybe_mapping,
     normalize_openai_usage,
 )
+from nanobot.providers.scheduler import parse_retry_after
 
 if TYPE_CHECKING:
     from nanobot.providers.registry import ProviderSpec
@@ -224,7 +225,10 @@ class OpenAIResponsesProvider(LLMProvider):
             for marker in ("/responses", "responses api", "unknown url", "not found")
         ):
             raw = f"Responses mode is not supported by this endpoint. {raw}"
-        return LLMResponse(content=f"Error: {raw}", finish_reason="error")
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        return LLMResponse(
+            content=f"Error: {raw}", finish_reason="error", retry_after=parse_retry_after(headers),
+        )
 
     async def chat(
         self,
@@ -255,6 +259,7 @@ class OpenAIResponsesProvider(LLMProvider):
         reasoning_effort: str | None = None,
         tool_choice: str | dict[str, Any] | None = None,
         on_content_delta: Callable[[str], Awaitable[None]] | None = None,
+        on_tool_call: Callable[[ToolCallRequest], Awaitable[None]] | None = None,
     ) -> LLMResponse:
         kwargs = self._build_kwargs(
             messages, tools, model, max_tokens, temperature, reasoning_effort, tool_choice
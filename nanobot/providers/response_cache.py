@@ -0,0 +1,110 @@
+"""On-disk cache of deterministic (temperature 0) chat responses."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+
+class ResponseCache:
+    """LRU cache of chat responses stored as one JSON file per request hash.
+
+    Only requests that ask for ``temperature == 0`` are looked up or stored;
+    sampling at any other temperature is not meant to repeat.  Entries expire
+    after ``ttl_s`` seconds, and the least recently used entries are removed
+    once more than ``max_entries`` are stored.  A hit refreshes the entry's
+    mtime, which is what the LRU order is based on.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 512, ttl_s: float = 24 * 60 * 60):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        tool_choice: str | dict[str, Any] | None,
+        temperature: float,
+        **extra: Any,
+    ) -> str:
+        """Return the canonical hash of one request."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            **extra,
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> LLMResponse | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - data["created"] > self.ttl_s:
+                path.unlink(missing_ok=True)
+                raise KeyError(key)
+            payload = data["response"]
+            payload["tool_calls"] = [ToolCallRequest(**tc) for tc in payload.get("tool_calls", [])]
+            response = LLMResponse(**payload)
+            os.utime(path)
+        except (OSError, KeyError, TypeError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.debug("LLM response cache hit ({} hits / {} misses)", self.hits, self.misses)
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        payload = dataclasses.asdict(response)
+        payload["usage"] = {}  # a replayed response costs nothing
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(
+                json.dumps({"created": time.time(), "response": payload}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            logger.warning("Failed to write LLM response cache entry {}", key[:12])
+            tmp.unlink(missing_ok=True)
+            return
+        self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries and trim the cache to ``max_entries``."""
+        now = time.time()
+        entries: list[tuple[float, Path]] = []
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime > self.ttl_s:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((mtime, path))
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
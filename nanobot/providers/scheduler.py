@@ -0,0 +1,175 @@
+"""Per-provider request scheduling: concurrency, token budgets and shared backoff."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Literal
+
+RequestPriority = Literal["interactive", "background"]
+
+_PRIORITY_RANK: dict[str, int] = {"interactive": 0, "background": 1}
+
+_request_priority: contextvars.ContextVar[RequestPriority] = contextvars.ContextVar(
+    "nanobot_request_priority", default="interactive"
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Schedule provider calls made inside the block (and tasks it spawns) at *priority*."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def parse_retry_after(headers: Mapping[str, Any] | Any) -> float | None:
+    """Return the wait in seconds advertised by ``retry-after-ms`` / ``retry-after``."""
+    get = getattr(headers, "get", None)
+    if get is None:
+        return None
+    millis = get("retry-after-ms")
+    if millis:
+        try:
+            return max(float(millis) / 1000, 0.0)
+        except (TypeError, ValueError):
+            pass
+    value = get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class _ModelLane:
+    """Concurrency slots and the recent token window for one model."""
+
+    __slots__ = ("active", "waiters", "window", "window_tokens")
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self.window: deque[tuple[float, int]] = deque()
+        self.window_tokens = 0
+
+
+class RequestScheduler:
+    """Gate provider requests per model.
+
+    Each model gets at most ``max_concurrent`` requests in flight and
+    ``tokens_per_minute`` tokens of recorded usage per rolling minute; zero
+    disables a limit.  Interactive callers are admitted before background ones
+    when slots are contended, and background callers leave a fifth of the
+    token budget as headroom.  After a rate-limit response every request on
+    the provider waits out the shared backoff, with jitter so waiters do not
+    resume in lockstep.
+    """
+
+    _WINDOW_S = 60.0
+    _BACKGROUND_TOKEN_SHARE = 0.8
+
+    def __init__(self, max_concurrent: int = 0, tokens_per_minute: int = 0):
+        self.max_concurrent = max_concurrent
+        self.tokens_per_minute = tokens_per_minute
+        self._lanes: dict[str, _ModelLane] = {}
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+
+    def _lane(self, model: str | None) -> _ModelLane:
+        key = model or ""
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _ModelLane()
+        return lane
+
+    def backoff(self, delay: float) -> None:
+        """Hold new requests for *delay* seconds after a rate-limit response."""
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def record_usage(self, model: str | None, usage: Mapping[str, int] | None) -> None:
+        """Charge a finished request's tokens against the model's minute budget."""
+        if self.tokens_per_minute <= 0 or not usage:
+            return
+        tokens = usage.get("total_tokens") or (
+            (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+        )
+        if tokens > 0:
+            lane = self._lane(model)
+            lane.window.append((time.monotonic(), tokens))
+            lane.window_tokens += tokens
+
+    @asynccontextmanager
+    async def slot(self, model: str | None, *, resumed: bool = False) -> AsyncIterator[None]:
+        """Hold one request slot for *model*.
+
+        *resumed* marks a caller that has just slept through the backoff it
+        triggered itself, so it is not made to wait a second time.
+        """
+        lane = self._lane(model)
+        rank = _PRIORITY_RANK[_request_priority.get()]
+        if not resumed:
+            await self._wait_backoff(rank)
+        await self._wait_budget(lane, rank)
+        await self._acquire(lane, rank)
+        try:
+            yield
+        finally:
+            self._release(lane)
+
+    async def _wait_backoff(self, rank: int) -> None:
+        while (remaining := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(remaining + random.uniform(0, min(remaining, 1.0)) * (1 + rank))
+
+    async def _wait_budget(self, lane: _ModelLane, rank: int) -> None:
+        if self.tokens_per_minute <= 0:
+            return
+        limit = self.tokens_per_minute * (1.0 if rank == 0 else self._BACKGROUND_TOKEN_SHARE)
+        while True:
+            now = time.monotonic()
+            while lane.window and now - lane.window[0][0] >= self._WINDOW_S:
+                lane.window_tokens -= lane.window.popleft()[1]
+            if lane.window_tokens < limit or not lane.window:
+                return
+            await asyncio.sleep(self._WINDOW_S - (now - lane.window[0][0]))
+
+    async def _acquire(self, lane: _ModelLane, rank: int) -> None:
+        if self.max_concurrent <= 0 or (lane.active < self.max_concurrent and not lane.waiters):
+            lane.active += 1
+            return
+        entry = (rank, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(lane.waiters, entry)
+        try:
+            await entry[2]
+        except asyncio.CancelledError:
+            if entry[2].done() and not entry[2].cancelled():
+                # The slot was handed over just before cancellation; pass it on.
+                self._release(lane)
+            elif entry in lane.waiters:
+                lane.waiters.remove(entry)
+                heapq.heapify(lane.waiters)
+            raise
+
+    def _release(self, lane: _ModelLane) -> None:
+        while lane.waiters:
+            _, _, waiter = heapq.heappop(lane.waiters)
+            if not waiter.done():
+                waiter.set_result(None)  # hand the slot over; active count is unchanged
+                return
+        lane.active -= 1
@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from nanobot.providers.scheduler import request_priority
+
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
 
@@ -63,19 +65,21 @@ async def evaluate_response(
     that important messages are never silently dropped.
     """
     try:
-        llm_response = await provider.chat_with_retry(
-            messages=[
-                {"role": "system", "content": _SYSTEM_PROMPT},
-                {"role": "user", "content": (
-                    f"## Original task\n{task_context}\n\n"
-                    f"## Agent response\n{response}"
-                )},
-            ],
-            tools=_EVALUATE_TOOL,
-            model=model,
-            max_tokens=256,
-            temperature=0.0,
-        )
+        with request_priority("background"):
+            llm_response = await provider.chat_with_retry(
+                messages=[
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": (
+                        f"## Original task\n{task_context}\n\n"
+                        f"## Agent response\n{response}"
+                    )},
+                ],
+                tools=_EVALUATE_TOOL,
+                model=model,
+                max_tokens=256,
+                temperature=0.0,
+                cache=True,
+            )
 
         if not llm_response.has_tool_calls:
             logger.warning("evaluate_response: no tool call returned, defaulting to notify")
@@ -349,6 +349,7 @@ def build_status_content(
     context_tokens_estimate: int,
     thinking_level: str | None = None,
     thinking_source: str | None = None,
+    subagents: dict[str, int] | None = None,
 ) -> str:
     """Build a human-readable runtime status snapshot."""
     uptime_s = int(time.time() - start_time)
@@ -360,6 +361,14 @@ def build_status_content(
     last_in = last_usage.get("prompt_tokens", 0)
     last_out = last_usage.get("completion_tokens", 0)
     cached_tokens = last_usage.get("cached_tokens")
+    cache_write_tokens = last_usage.get("cache_write_tokens")
+    cache_line = "\U0001f5c3 Cache: unavailable"
+    if cached_tokens is not None:
+        cache_line = f"\U0001f5c3 Cache: {cached_tokens} cached prompt tokens"
+        if cache_write_tokens:
+            cache_line += f", {cache_write_tokens} written"
+        if last_in > 0:
+            cache_line += f" ({cached_tokens * 100 // last_in}% hit)"
     ctx_total = max(context_window_tokens, 0)
     ctx_pct = int((context_tokens_estimate / ctx_total) * 100) if ctx_total > 0 else 0
     ctx_used_str = (
@@ -368,6 +377,12 @@ def build_status_content(
         else str(context_tokens_estimate)
     )
     ctx_total_str = f"{ctx_total // 1024}k" if ctx_total > 0 else "n/a"
+    subagent_lines = []
+    if subagents and (subagents.get("running") or subagents.get("queued")):
+        subagent_lines.append(
+            f"\U0001f916 Subagents: {subagents.get('running', 0)} running, "
+            f"{subagents.get('queued', 0)} queued"
+        )
     return "\n".join(
         [
             f"\U0001f408 nanobot v{version}",
@@ -378,13 +393,10 @@ def build_status_content(
                 else "\U0001f914 Thinking: unavailable"
             ),
             f"\U0001f4ca Tokens: {last_in} in / {last_out} out",
-            (
-                f"\U0001f5c3 Cache: {cached_tokens} cached prompt tokens"
-                if cached_tokens is not None
-                else "\U0001f5c3 Cache: unavailable"
-            ),
+            cache_line,
             f"\U0001f4da Context: {ctx_used_str}/{ctx_total_str} ({ctx_pct}%)",
             f"\U0001f4ac Session: {session_msg_count} messages",
+            *subagent_lines,
             f"\u23f1 Uptime: {uptime}",
         ]
     )
@@ -0,0 +1,111 @@
+"""Large tool results stored as workspace artifacts."""
+
+import os
+import time
+from typing import Any
+
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.runner import AgentRunner, AgentRunSpec
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import GrepTool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+_BIG = "\n".join(f"line {i}" for i in range(2000))
+
+
+class _DumpTool(Tool):
+    @property
+    def name(self) -> str:
+        return "dump"
+
+    @property
+    def description(self) -> str:
+        return "dump"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        return _BIG
+
+
+class _ToolThenDoneProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.requests: list[list[dict]] = []
+
+    async def chat(self, messages, **kwargs: Any) -> LLMResponse:
+        self.requests.append([dict(m) for m in messages])
+        if len(self.requests) == 1:
+            call = ToolCallRequest(id="call_1", name="dump", arguments={})
+            return LLMResponse(content=None, tool_calls=[call], finish_reason="tool_calls")
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+async def test_runner_replaces_large_tool_results_with_artifact_preview(tmp_path) -> None:
+    provider = _ToolThenDoneProvider()
+    tools = ToolRegistry()
+    tools.register(_DumpTool())
+    store = ArtifactStore(tmp_path, threshold_chars=1_000, preview_chars=300)
+
+    result = await AgentRunner(provider).run(
+        AgentRunSpec(
+            initial_messages=[{"role": "user", "content": "go"}],
+            tools=tools,
+            model="test",
+            max_iterations=3,
+            artifacts=store,
+        )
+    )
+
+    tool_message = provider.requests[1][-1]
+    assert tool_message["role"] == "tool"
+    content = tool_message["content"]
+    assert content.startswith("line 0\nline 1")
+    assert content.endswith("line 1999")
+    assert len(content) < 600
+    [artifact] = list((tmp_path / ".artifacts").iterdir())
+    assert f".artifacts/{artifact.name}" in content
+    assert artifact.read_text(encoding="utf-8") == _BIG
+    assert result.final_content == "done"
+    assert store.stored == 1 and store.chars_saved == len(_BIG) - len(content)
+
+
+async def test_small_results_and_artifact_reads_pass_through(tmp_path) -> None:
+    store = ArtifactStore(tmp_path, threshold_chars=100, preview_chars=20)
+    path = store.put(_BIG)
+
+    assert await store.offload("exec", {}, "short") == "short"
+    assert await store.offload("read_file", {"path": f".artifacts/{path.name}"}, _BIG) == _BIG
+    assert await store.offload("read_file", {"path": str(path)}, _BIG) == _BIG
+    assert await store.offload("read_file", {"path": "notes.md"}, _BIG) != _BIG
+    assert store.put(_BIG) == path
+    assert len(list(store.directory.iterdir())) == 1
+
+
+def test_store_prunes_expired_and_least_recently_used_artifacts(tmp_path) -> None:
+    store = ArtifactStore(tmp_path, max_total_bytes=0, ttl_s=0)
+    old, used, fresh = (store.put(f"{name}\n" + "x" * 1_000) for name in ("old", "used", "fresh"))
+    now = time.time()
+    for path, age in ((old, 2 * 3600), (used, 100), (fresh, 50)):
+        os.utime(path, (now - age, now - age))
+    store.max_total_bytes, store.ttl_s = 2_500, 3600
+    store.put("used\n" + "x" * 1_000)  # reuse refreshes its age
+
+    newest = store.put("newest\n" + "x" * 1_000)
+
+    assert sorted(p.name for p in store.directory.iterdir()) == sorted([used.name, newest.name])
+
+
+async def test_search_tools_skip_artifacts(tmp_path) -> None:
+    (tmp_path / "app.py").write_text("secret_token = 1\n", encoding="utf-8")
+    ArtifactStore(tmp_path).put("secret_token = 1\n")
+
+    result = await GrepTool(workspace=tmp_path).execute(pattern="secret_token")
+
+    assert result == "app.py:1: secret_token = 1"
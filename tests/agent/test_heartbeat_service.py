@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import pytest
 
@@ -347,3 +348,110 @@ async def test_decide_prompt_includes_current_time(tmp_path) -> None:
     user_msg = captured_messages[1]
     assert user_msg["role"] == "user"
     assert "Current Time:" in user_msg["content"]
+
+
+def _skip(**extra) -> LLMResponse:
+    return LLMResponse(
+        content="",
+        tool_calls=[
+            ToolCallRequest(id="hb_1", name="heartbeat", arguments={"action": "skip", **extra})
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_tick_skips_decide_while_file_is_unchanged_and_idle(tmp_path) -> None:
+    heartbeat = tmp_path / "HEARTBEAT.md"
+    heartbeat.write_text("- [ ] nothing yet", encoding="utf-8")
+    provider = DummyProvider([_skip(), _skip()])
+    service = HeartbeatService(workspace=tmp_path, provider=provider, model="openai/gpt-4o-mini")
+
+    await service._tick()
+    await service._tick()
+    assert provider.calls == 1
+
+    heartbeat.write_text("- [ ] water the plants", encoding="utf-8")
+    await service._tick()
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_next_check_hint_bounds_idle_period(tmp_path) -> None:
+    (tmp_path / "HEARTBEAT.md").write_text("- [ ] standup at 09:00", encoding="utf-8")
+    provider = DummyProvider([_skip(next_check_in_minutes=5), _skip()])
+    service = HeartbeatService(
+        workspace=tmp_path,
+        provider=provider,
+        model="openai/gpt-4o-mini",
+        interval_s=60,
+        idle_recheck_s=3600,
+    )
+
+    await service._tick()
+    remaining = service._last_decision.recheck_at - time.monotonic()
+    assert 290 < remaining <= 300
+
+    service._last_decision.recheck_at = time.monotonic() - 1
+    await service._tick()
+    assert provider.calls == 2
+    remaining = service._last_decision.recheck_at - time.monotonic()
+    assert 3590 < remaining <= 3600
+
+
+@pytest.mark.asyncio
+async def test_next_check_hint_is_floored_at_interval(tmp_path) -> None:
+    (tmp_path / "HEARTBEAT.md").write_text("- [ ] standup at 09:00", encoding="utf-8")
+    service = HeartbeatService(
+        workspace=tmp_path,
+        provider=DummyProvider([_skip(next_check_in_minutes=1)]),
+        model="openai/gpt-4o-mini",
+        interval_s=600,
+    )
+
+    await service._tick()
+
+    remaining = service._last_decision.recheck_at - time.monotonic()
+    assert 590 < remaining <= 600
+
+
+@pytest.mark.asyncio
+async def test_errors_and_replies_without_tool_call_are_not_remembered(tmp_path) -> None:
+    (tmp_path / "HEARTBEAT.md").write_text("- [ ] nothing yet", encoding="utf-8")
+    provider = DummyProvider(
+        [
+            LLMResponse(content="invalid api key", finish_reason="error"),
+            LLMResponse(content="Nothing to do."),
+            _skip(),
+        ]
+    )
+    service = HeartbeatService(workspace=tmp_path, provider=provider, model="openai/gpt-4o-mini")
+
+    await service._tick()
+    await service._tick()
+    assert service._last_decision is None
+
+    await service._tick()
+    await service._tick()
+    assert provider.calls == 3
+    assert service._last_decision.action == "skip"
+
+
+@pytest.mark.asyncio
+async def test_idle_sleep_wakes_when_file_changes(tmp_path) -> None:
+    heartbeat = tmp_path / "HEARTBEAT.md"
+    heartbeat.write_text("- [ ] nothing yet", encoding="utf-8")
+    service = HeartbeatService(
+        workspace=tmp_path,
+        provider=DummyProvider([_skip()]),
+        model="openai/gpt-4o-mini",
+        interval_s=0,
+    )
+    service._FILE_POLL_S = 0.01
+    await service._tick()
+
+    sleeper = asyncio.create_task(service._sleep_until_due())
+    await asyncio.sleep(0.05)
+    assert not sleeper.done()
+
+    heartbeat.write_text("- [ ] water the plants, updated", encoding="utf-8")
+    await asyncio.wait_for(sleeper, timeout=1)
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -406,9 +407,153 @@ async def test_model_memory_decision_without_tool_call_defaults_skip(tmp_path) -
 
     result = await loop.memory_consolidator.decide_turn_memory_action(
         [
-            {"role": "user", "content": "hello"},
-            {"role": "assistant", "content": "hi"},
+            {"role": "user", "content": "I reran the command and got a timeout once"},
+            {"role": "assistant", "content": "Try again with a longer timeout."},
         ]
     )
 
     assert result == "skip"
+    loop.provider.chat_with_retry.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_trivial_exchange_skips_memory_decision_call(tmp_path) -> None:
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+
+    for text in ("Thanks!", "hi 👋", "ok", "good morning"):
+        result = await loop.memory_consolidator.decide_turn_memory_action(
+            [
+                {"role": "user", "content": text},
+                {"role": "assistant", "content": "Anytime."},
+            ]
+        )
+        assert result == "skip"
+
+    loop.provider.chat_with_retry.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_answers_and_wordless_messages_still_get_memory_decision(tmp_path) -> None:
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+    loop.provider.chat_with_retry = AsyncMock(return_value=LLMResponse(content="no", tool_calls=[]))
+
+    for text in ("yes", "Nope.", "sure", "🥦🥦", "?!", "。", ""):
+        await loop.memory_consolidator.decide_turn_memory_action(
+            [
+                {"role": "assistant", "content": "Should I remember you're vegetarian?"},
+                {"role": "user", "content": text},
+                {"role": "assistant", "content": "Noted."},
+            ]
+        )
+
+    assert loop.provider.chat_with_retry.await_count == 7
+
+
+@pytest.mark.asyncio
+async def test_memory_calls_use_auxiliary_model_when_configured(tmp_path) -> None:
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+    aux = MagicMock()
+    aux.chat_with_retry = AsyncMock(return_value=LLMResponse(content="no", tool_calls=[]))
+    consolidator = memory_module.MemoryConsolidator(
+        workspace=tmp_path,
+        provider=loop.provider,
+        model="test-model",
+        sessions=loop.sessions,
+        context_window_tokens=200,
+        build_messages=loop.context.build_messages,
+        get_tool_definitions=loop.tools.get_definitions,
+        auxiliary_provider=aux,
+        auxiliary_model="cheap-model",
+    )
+    consolidator.store.consolidate = AsyncMock(return_value=True)  # type: ignore[method-assign]
+    messages = [
+        {"role": "user", "content": "my handle is evannotfound"},
+        {"role": "assistant", "content": "I'll remember that."},
+    ]
+
+    await consolidator.decide_turn_memory_action(messages)
+    await consolidator.consolidate_messages(messages)
+
+    assert aux.chat_with_retry.await_args.kwargs["model"] == "cheap-model"
+    consolidator.store.consolidate.assert_awaited_once_with(messages, aux, "cheap-model")
+    loop.provider.chat_with_retry.assert_not_awaited()
+
+
+def _decision(call_id: str, exchange: int, action: str) -> ToolCallRequest:
+    return ToolCallRequest(
+        id=call_id, name="memory_decision", arguments={"exchange": exchange, "action": action}
+    )
+
+
+def _exchange(text: str) -> list[dict[str, object]]:
+    return [
+        {"role": "user", "content": text},
+        {"role": "assistant", "content": "Noted."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_memory_decisions_share_one_batched_call(tmp_path) -> None:
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+    consolidator = loop.memory_consolidator
+    consolidator.decisions.window_s = 0.01
+    loop.provider.chat_with_retry = AsyncMock(
+        return_value=LLMResponse(
+            content=None,
+            tool_calls=[
+                _decision("c1", 1, "summary"),
+                _decision("c2", 2, "skip"),
+                _decision("c3", 3, "both"),
+            ],
+        )
+    )
+
+    actions = await asyncio.gather(*(
+        consolidator.decisions.decide(_exchange(f"my fact number {i}")) for i in range(3)
+    ))
+
+    assert actions == ["summary", "skip", "both"]
+    loop.provider.chat_with_retry.assert_awaited_once()
+    prompt = loop.provider.chat_with_retry.await_args.kwargs["messages"][1]["content"]
+    assert "## Exchange 3" in prompt
+    assert consolidator.decisions.calls_per_turn == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_batched_memory_decision_falls_back_for_unanswered_items(tmp_path) -> None:
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+    consolidator = loop.memory_consolidator
+    consolidator.decisions.max_items = 2
+    loop.provider.chat_with_retry = AsyncMock(
+        side_effect=[
+            LLMResponse(content=None, tool_calls=[_decision("c1", 2, "summary")]),
+            LLMResponse(content=None, tool_calls=[_decision("c2", 1, "both")]),
+        ]
+    )
+
+    actions = await asyncio.gather(
+        consolidator.decisions.decide(_exchange("my handle is a")),
+        consolidator.decisions.decide(_exchange("my handle is b")),
+    )
+
+    assert actions == ["both", "summary"]
+    assert loop.provider.chat_with_retry.await_count == 2
+    single = loop.provider.chat_with_retry.await_args_list[1].kwargs
+    assert single["tool_choice"] == {"type": "function", "function": {"name": "memory_decision"}}
+
+
+@pytest.mark.asyncio
+async def test_batched_memory_decision_error_falls_back_to_single_calls(tmp_path) -> None:
+    loop = _make_loop(tmp_path, estimated_tokens=100, context_window_tokens=200)
+    consolidator = loop.memory_consolidator
+    consolidator.decisions.max_items = 2
+    consolidator.decide_turn_memory_actions = AsyncMock(side_effect=RuntimeError("boom"))  # type: ignore[method-assign]
+    consolidator.decide_turn_memory_action = AsyncMock(return_value="summary")  # type: ignore[method-assign]
+
+    actions = await asyncio.gather(
+        consolidator.decisions.decide(_exchange("my handle is a")),
+        consolidator.decisions.decide(_exchange("my handle is b")),
+    )
+
+    assert actions == ["summary", "summary"]
+    assert consolidator.decide_turn_memory_action.await_count == 2
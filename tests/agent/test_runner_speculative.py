@@ -0,0 +1,102 @@
+"""Speculative tool dispatch while the model is still streaming."""
+
+import asyncio
+from typing import Any
+
+from nanobot.agent.runner import AgentRunner, AgentRunSpec
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class _RecordingTool(Tool):
+    def __init__(self, name: str, log: list[str], *, safe: bool):
+        self._name = name
+        self._log = log
+        self._safe = safe
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._name
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"n": {"type": "integer"}}}
+
+    @property
+    def parallel_safe(self) -> bool:
+        return self._safe
+
+    async def execute(self, **kwargs: Any) -> str:
+        self._log.append(f"start {self._name}")
+        return f"{self._name} done"
+
+
+class _StreamingProvider(LLMProvider):
+    """Streams two tool calls, then keeps generating before finishing."""
+
+    def __init__(self, log: list[str]):
+        super().__init__()
+        self._log = log
+        self.turn = 0
+
+    async def chat(self, **kwargs: Any) -> LLMResponse:
+        return LLMResponse(content="done")
+
+    async def chat_stream(self, on_tool_call=None, **kwargs: Any) -> LLMResponse:
+        self.turn += 1
+        if self.turn > 1:
+            return LLMResponse(content="done")
+        calls = [
+            ToolCallRequest(id="call_1", name="lookup", arguments={"n": 1}),
+            ToolCallRequest(id="call_2", name="mutate", arguments={"n": 2}),
+        ]
+        for call in calls:
+            if on_tool_call:
+                await on_tool_call(call)
+            await asyncio.sleep(0.01)
+        self._log.append("stream end")
+        return LLMResponse(content=None, tool_calls=calls, finish_reason="tool_calls")
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+def _spec(log: list[str], *, speculative: bool) -> AgentRunSpec:
+    tools = ToolRegistry()
+    tools.register(_RecordingTool("lookup", log, safe=True))
+    tools.register(_RecordingTool("mutate", log, safe=False))
+    return AgentRunSpec(
+        initial_messages=[{"role": "user", "content": "go"}],
+        tools=tools,
+        model="test",
+        max_iterations=3,
+        speculative_tools=speculative,
+    )
+
+
+async def test_parallel_safe_tools_start_before_stream_ends() -> None:
+    log: list[str] = []
+    result = await AgentRunner(_StreamingProvider(log)).run(_spec(log, speculative=True))
+
+    assert log == ["start lookup", "stream end", "start mutate"]
+    assert result.final_content == "done"
+    tool_msgs = [m for m in result.messages if m["role"] == "tool"]
+    assert [(m["tool_call_id"], m["content"]) for m in tool_msgs] == [
+        ("call_1", "lookup done"),
+        ("call_2", "mutate done"),
+    ]
+
+
+async def test_tools_wait_for_stream_when_speculation_is_off() -> None:
+    log: list[str] = []
+    provider = _StreamingProvider(log)
+    provider.chat = provider.chat_stream  # non-streaming path returns the same calls
+
+    await AgentRunner(provider).run(_spec(log, speculative=False))
+
+    assert log == ["stream end", "start lookup", "start mutate"]
@@ -0,0 +1,123 @@
+"""Bounded subagent pool, shared tools and per-run budgets."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from nanobot.agent.subagent import SubagentManager
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import SubagentConfig
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+
+def _manager(tmp_path, **config) -> SubagentManager:
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    return SubagentManager(
+        provider=provider, workspace=tmp_path, bus=MessageBus(), config=SubagentConfig(**config)
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_concurrency_and_starts_by_priority(tmp_path, monkeypatch) -> None:
+    mgr = _manager(tmp_path, max_concurrent=1)
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def fake_run(task_id, task, label, origin, reasoning_effort=None):
+        started.append(task)
+        await release.wait()
+
+    monkeypatch.setattr(mgr, "_run_subagent", fake_run)
+
+    await mgr.spawn("first")
+    await asyncio.sleep(0)
+    await mgr.spawn("later")
+    await mgr.spawn("urgent", priority=-1)
+    await asyncio.sleep(0)
+
+    assert started == ["first"]
+    assert mgr.get_status() == {"running": 1, "queued": 2}
+
+    release.set()
+    await asyncio.gather(*list(mgr._running_tasks.values()))
+
+    assert started == ["first", "urgent", "later"]
+    assert mgr.get_status() == {"running": 0, "queued": 0}
+    assert mgr._active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelling_queued_subagent_keeps_slots_consistent(tmp_path, monkeypatch) -> None:
+    mgr = _manager(tmp_path, max_concurrent=1)
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def fake_run(task_id, task, label, origin, reasoning_effort=None):
+        started.append(task)
+        await release.wait()
+
+    monkeypatch.setattr(mgr, "_run_subagent", fake_run)
+
+    await mgr.spawn("running", session_key="s:1")
+    await asyncio.sleep(0)
+    await mgr.spawn("queued", session_key="s:2")
+    await asyncio.sleep(0)
+    assert await mgr.cancel_by_session("s:2") == 1
+
+    await mgr.spawn("next")
+    release.set()
+    await asyncio.gather(*list(mgr._running_tasks.values()))
+
+    assert started == ["running", "next"]
+    assert mgr._active == 0
+
+
+@pytest.mark.asyncio
+async def test_subagents_share_one_tool_registry(tmp_path) -> None:
+    mgr = _manager(tmp_path)
+
+    assert mgr._get_tools() is mgr._get_tools()
+    assert mgr._get_tools().has("exec")
+    assert not mgr._get_tools().has("spawn")
+
+
+@pytest.mark.asyncio
+async def test_token_budget_stops_subagent(tmp_path, monkeypatch) -> None:
+    mgr = _manager(tmp_path, max_tokens=150)
+    calls = 0
+
+    async def chat_with_retry(**kwargs):
+        nonlocal calls
+        calls += 1
+        return LLMResponse(
+            content=None,
+            tool_calls=[ToolCallRequest(id=f"c{calls}", name="list_dir", arguments={"path": "."})],
+            usage={"prompt_tokens": 90, "completion_tokens": 10},
+        )
+
+    mgr.provider.chat_with_retry = chat_with_retry
+
+    await mgr._run_subagent("sub-1", "loop forever", "label", {"channel": "test", "chat_id": "c1"})
+
+    announced = await mgr.bus.consume_inbound()
+    assert calls == 2
+    assert "subagent used 200 tokens, over its 150 token budget" in announced.content
+
+
+@pytest.mark.asyncio
+async def test_time_budget_stops_subagent(tmp_path) -> None:
+    mgr = _manager(tmp_path)
+
+    async def chat_with_retry(**kwargs):
+        await asyncio.sleep(5)
+
+    mgr.provider.chat_with_retry = chat_with_retry
+    mgr.config.timeout_s = 0.05
+
+    await mgr._run_subagent("sub-1", "slow", "label", {"channel": "test", "chat_id": "c1"})
+
+    announced = await mgr.bus.consume_inbound()
+    assert "failed" in announced.content
+    assert "time budget" in announced.content
@@ -0,0 +1,147 @@
+"""In-turn compaction of superseded and old tool results."""
+
+import json
+from typing import Any
+
+from nanobot.agent.compaction import TurnCompactor
+from nanobot.agent.runner import AgentRunner, AgentRunSpec
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+_FILE = "\n".join(f"def f{i}(): pass" for i in range(100))
+
+
+def _call(call_id: str, name: str, **args: Any) -> dict[str, Any]:
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(args)},
+    }
+
+
+def _iteration(call_id: str, name: str, result: str, **args: Any) -> list[dict[str, Any]]:
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [_call(call_id, name, **args)]},
+        {"role": "tool", "tool_call_id": call_id, "name": name, "content": result},
+    ]
+
+
+def test_reads_superseded_by_edits_and_rereads_are_stubbed() -> None:
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "refactor"},
+        *_iteration("c1", "read_file", _FILE, path="a.py"),
+        *_iteration("c2", "read_file", _FILE, path="b.py"),
+        *_iteration("c3", "read_file", _FILE, path="b.py", offset=50),
+        *_iteration("c4", "edit_file", "Successfully edited a.py", path="./a.py"),
+        *_iteration("c5", "read_file", _FILE, path="b.py"),
+    ]
+    compactor = TurnCompactor(2)
+
+    compacted = compactor.compact(messages)
+
+    assert len(compacted) == len(messages)
+    assert compacted[3]["content"] == (
+        "[superseded read_file result: a.py was changed later in this turn by edit_file]"
+    )
+    assert compacted[3]["tool_call_id"] == "c1"
+    assert "read again" in compacted[5]["content"]
+    assert compacted[7]["content"] == _FILE  # different window
+    assert compacted[11]["content"] == _FILE
+    assert messages[3]["content"] == _FILE
+    assert compactor.tokens_saved > 0
+
+
+def test_budget_condenses_oldest_iterations_first() -> None:
+    messages = [{"role": "user", "content": "go"}]
+    for i in range(5):
+        messages += _iteration(f"c{i}", "exec", f"output {i}\n" + "x" * 2000, command=str(i))
+    compactor = TurnCompactor(1, budget_tokens=1200, keep_recent_iterations=2)
+
+    compacted = compactor.compact(messages)
+
+    condensed = [m["content"].startswith("[earlier exec result") for m in compacted[2::2]]
+    assert condensed[0] and condensed[-2:] == [False, False]
+    assert "output 0" in compacted[2]["content"]
+    assert compactor.condensed >= 1
+
+
+def test_small_stubs_wait_for_a_batch_and_applied_stubs_stay_fixed() -> None:
+    small = "\n".join(f"line {i}" for i in range(40))
+    big = "y" * 8000
+    messages = [
+        {"role": "user", "content": "go"},
+        *_iteration("c1", "read_file", small, path="a.py"),
+        *_iteration("c2", "exec", big, command="build"),
+        *_iteration("c3", "edit_file", "Successfully edited a.py", path="a.py"),
+    ]
+    compactor = TurnCompactor(1)
+
+    assert compactor.compact(messages) is messages
+
+    messages += _iteration("c4", "read_file", big, path="b.py")
+    messages += _iteration("c5", "read_file", big, path="b.py")
+    first = compactor.compact(messages)
+    assert "superseded" in first[2]["content"] and "superseded" in first[8]["content"]
+
+    messages += _iteration("c6", "edit_file", "Successfully edited b.py", path="b.py")
+    second = compactor.compact(messages)
+    assert [m["content"] for m in second[:10]] == [m["content"] for m in first[:10]]
+    assert "read again" in second[8]["content"]
+    assert "changed later" in second[10]["content"]
+
+
+class _ReadTool(Tool):
+    @property
+    def name(self) -> str:
+        return "read_file"
+
+    @property
+    def description(self) -> str:
+        return "read"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"path": {"type": "string"}}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        return _FILE
+
+
+class _RereadProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.requests: list[list[dict]] = []
+
+    async def chat(self, messages, **kwargs: Any) -> LLMResponse:
+        self.requests.append(messages)
+        if len(self.requests) <= 2:
+            call = ToolCallRequest(id=f"r{len(self.requests)}", name="read_file", arguments={"path": "a.py"})
+            return LLMResponse(content=None, tool_calls=[call], finish_reason="tool_calls")
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+async def test_runner_sends_compacted_messages_and_reports_savings() -> None:
+    provider = _RereadProvider()
+    tools = ToolRegistry()
+    tools.register(_ReadTool())
+
+    result = await AgentRunner(provider).run(
+        AgentRunSpec(
+            initial_messages=[{"role": "user", "content": "go"}],
+            tools=tools,
+            model="test",
+            max_iterations=5,
+            compact_tool_results=True,
+        )
+    )
+
+    last = provider.requests[-1]
+    assert "superseded" in last[2]["content"]
+    assert last[4]["content"] == _FILE
+    assert result.messages[2]["content"] == _FILE
+    assert result.compacted_tokens > 0
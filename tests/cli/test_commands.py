@@ -412,6 +412,39 @@ def test_make_provider_keeps_custom_on_chat_mode_by_default():
     assert isinstance(provider, OpenAICompatProvider)
 
 
+def test_make_provider_wraps_fallback_models_in_failover_provider():
+    from nanobot.providers.anthropic_provider import AnthropicProvider
+    from nanobot.providers.failover import FailoverProvider
+    from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+
+    config = Config.model_validate(
+        {
+            "agents": {
+                "defaults": {
+                    "model": "anthropic/claude-opus-4-5",
+                    "fallbackModels": ["deepseek/deepseek-chat"],
+                    "hedgeRequests": True,
+                }
+            },
+            "providers": {
+                "anthropic": {"apiKey": "a-key"},
+                "deepseek": {"apiKey": "d-key"},
+            },
+        }
+    )
+
+    with patch("anthropic.AsyncAnthropic"), patch("nanobot.providers.openai_compat_provider.AsyncOpenAI"):
+        provider = _make_provider(config)
+
+    assert isinstance(provider, FailoverProvider)
+    assert provider.hedge is True
+    assert provider.get_default_model() == "anthropic/claude-opus-4-5"
+    assert [t.model for t in provider.targets] == ["anthropic/claude-opus-4-5", "deepseek/deepseek-chat"]
+    assert isinstance(provider.targets[0].provider, AnthropicProvider)
+    assert isinstance(provider.targets[1].provider, OpenAICompatProvider)
+    assert provider.generation == provider.targets[0].provider.generation
+
+
 def test_make_provider_can_opt_custom_into_responses_mode():
     from nanobot.providers.openai_responses_provider import OpenAIResponsesProvider
 
@@ -845,7 +878,7 @@ def test_gateway_uses_workspace_directory_for_cron_store(monkeypatch, tmp_path:
     monkeypatch.setattr("nanobot.session.manager.SessionManager", lambda _workspace: object())
 
     class _StopCron:
-        def __init__(self, store_path: Path) -> None:
+        def __init__(self, store_path: Path, **_kwargs) -> None:
             seen["cron_store"] = store_path
             raise _StopGatewayError("stop")
 
@@ -882,7 +915,7 @@ def test_gateway_workspace_override_does_not_migrate_legacy_cron(
     monkeypatch.setattr("nanobot.config.paths.get_cron_dir", lambda: legacy_dir)
 
     class _StopCron:
-        def __init__(self, store_path: Path) -> None:
+        def __init__(self, store_path: Path, **_kwargs) -> None:
             seen["cron_store"] = store_path
             raise _StopGatewayError("stop")
 
@@ -925,7 +958,7 @@ def test_gateway_custom_config_workspace_does_not_migrate_legacy_cron(
     monkeypatch.setattr("nanobot.config.paths.get_cron_dir", lambda: legacy_dir)
 
     class _StopCron:
-        def __init__(self, store_path: Path) -> None:
+        def __init__(self, store_path: Path, **_kwargs) -> None:
             seen["cron_store"] = store_path
             raise _StopGatewayError("stop")
 
@@ -148,6 +148,15 @@ class TestRestartCommand:
                     "registered_tools": ["mcp_filesystem_read", "mcp_filesystem_write"],
                     "available_tools": ["read", "write", "list"],
                     "error": None,
+                    "stats": {
+                        "calls": 12,
+                        "errors": 1,
+                        "reconnects": 2,
+                        "last_error": "RuntimeError: boom",
+                        "ping_ms": 4.2,
+                        "p50_ms": 80.0,
+                        "p95_ms": 310.0,
+                    },
                 },
                 {
                     "name": "remote",
@@ -169,6 +178,9 @@ class TestRestartCommand:
         assert "filesystem" in response.content
         assert "connected" in response.content
         assert "tools: 2/3" in response.content
+        assert "calls: 12, errors: 1 - latency p50 80ms, p95 310ms - ping 4ms" in response.content
+        assert "reconnects: 2" in response.content
+        assert "last error: RuntimeError: boom" in response.content
         assert "remote" in response.content
         assert "failed" in response.content
         assert "TimeoutError" in response.content
@@ -252,7 +264,30 @@ class TestRestartCommand:
         )
 
         assert response is not None
-        assert "Cache: 64 cached prompt tokens" in response.content
+        assert "Cache: 64 cached prompt tokens (64% hit)" in response.content
+
+    @pytest.mark.asyncio
+    async def test_status_reports_cache_writes_when_available(self):
+        loop, _bus = _make_loop()
+        session = MagicMock()
+        session.get_history.return_value = [{"role": "user"}]
+        loop.sessions.get_or_create.return_value = session
+        loop._last_usage = {
+            "prompt_tokens": 200,
+            "completion_tokens": 10,
+            "cached_tokens": 150,
+            "cache_write_tokens": 40,
+        }
+        loop.memory_consolidator.estimate_session_prompt_tokens = MagicMock(
+            return_value=(0, "none")
+        )
+
+        response = await loop._process_message(
+            InboundMessage(channel="telegram", sender_id="u1", chat_id="c1", content="/status")
+        )
+
+        assert response is not None
+        assert "Cache: 150 cached prompt tokens, 40 written (75% hit)" in response.content
 
     @pytest.mark.asyncio
     async def test_process_direct_preserves_render_metadata(self):
@@ -274,3 +274,203 @@ async def test_running_service_honors_external_disable(tmp_path) -> None:
         assert called == []
     finally:
         service.stop()
+
+
+async def _drain_runs(service: CronService) -> None:
+    while service._run_tasks:
+        await asyncio.gather(*list(service._run_tasks))
+
+
+def _make_due(service: CronService, *job_ids: str, ago_ms: int = 0) -> None:
+    import time
+
+    for job_id in job_ids:
+        job = service.get_job(job_id)
+        job.state.next_run_at_ms = int(time.time() * 1000) - ago_ms
+        service._schedule(job)
+
+
+@pytest.mark.asyncio
+async def test_due_jobs_run_concurrently_up_to_worker_limit(tmp_path) -> None:
+    active = 0
+    peak = 0
+
+    async def on_job(_job) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job, max_concurrent_jobs=2)
+    jobs = [
+        service.add_job(
+            name=f"j{i}", schedule=CronSchedule(kind="every", every_ms=60_000), message="hi"
+        )
+        for i in range(4)
+    ]
+    await service.start()
+    try:
+        _make_due(service, *(j.id for j in jobs), ago_ms=1500)
+        await service._on_timer()
+        assert all(service.get_job(j.id).state.next_run_at_ms > 0 for j in jobs)
+        await _drain_runs(service)
+    finally:
+        service.stop()
+
+    assert peak == 2
+    records = [service.get_job(j.id).state.run_history[0] for j in jobs]
+    assert all(r.status == "ok" and r.lag_ms >= 1500 for r in records)
+    raw = json.loads((tmp_path / "cron" / "jobs.json").read_text())
+    assert raw["jobs"][0]["state"]["runHistory"][0]["lagMs"] >= 1500
+
+
+@pytest.mark.asyncio
+async def test_overlap_policies_skip_or_queue_while_running(tmp_path) -> None:
+    release = asyncio.Event()
+    runs: list[str] = []
+
+    async def on_job(job) -> None:
+        runs.append(job.name)
+        await release.wait()
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job)
+    every = CronSchedule(kind="every", every_ms=60_000)
+    skip = service.add_job(name="skip", schedule=every, message="hi")
+    queue = service.add_job(name="queue", schedule=every, message="hi", overlap="queue")
+    allow = service.add_job(name="allow", schedule=every, message="hi", overlap="allow")
+    await service.start()
+    try:
+        for _ in range(2):
+            _make_due(service, skip.id, queue.id, allow.id)
+            await service._on_timer()
+            await asyncio.sleep(0)
+        assert sorted(runs) == ["allow", "allow", "queue", "skip"]
+
+        release.set()
+        await _drain_runs(service)
+    finally:
+        service.stop()
+
+    assert sorted(runs) == ["allow", "allow", "queue", "queue", "skip"]
+    statuses = [r.status for r in service.get_job(skip.id).state.run_history]
+    assert sorted(statuses) == ["ok", "skipped"]
+    assert service.get_job(skip.id).overlap == "skip"
+    assert CronService(tmp_path / "cron" / "jobs.json").get_job(queue.id).overlap == "queue"
+
+
+@pytest.mark.asyncio
+async def test_queue_overlap_keeps_one_pending_run(tmp_path) -> None:
+    release = asyncio.Event()
+    runs: list[str] = []
+
+    async def on_job(job) -> None:
+        runs.append(job.name)
+        await release.wait()
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job)
+    every = CronSchedule(kind="every", every_ms=10_000)
+    job = service.add_job(name="slow", schedule=every, message="hi", overlap="queue")
+    await service.start()
+    try:
+        for _ in range(5):
+            _make_due(service, job.id)
+            await service._on_timer()
+            await asyncio.sleep(0)
+        assert len(service._queued_runs[job.id]) == 1
+
+        release.set()
+        await _drain_runs(service)
+    finally:
+        service.stop()
+
+    assert runs == ["slow", "slow"]
+    history = service.get_job(job.id).state.run_history
+    assert [r.error for r in history if r.status == "skipped"] == ["run queue full"] * 3
+
+
+@pytest.mark.asyncio
+async def test_run_timeout_records_error(tmp_path) -> None:
+    async def on_job(_job) -> None:
+        await asyncio.sleep(5)
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job, run_timeout_s=0.05)
+    every = CronSchedule(kind="every", every_ms=60_000)
+    job = service.add_job(name="slow", schedule=every, message="hi")
+
+    await service.run_job(job.id)
+
+    loaded = service.get_job(job.id)
+    assert loaded.state.last_status == "error"
+    assert loaded.state.run_history[0].error == "timed out after 0.05s"
+
+
+@pytest.mark.asyncio
+async def test_interval_runs_stay_anchored_to_schedule(tmp_path) -> None:
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=lambda _: asyncio.sleep(0.02))
+    every = CronSchedule(kind="every", every_ms=60_000)
+    job = service.add_job(name="grid", schedule=every, message="hi")
+    await service.start()
+    try:
+        _make_due(service, job.id, ago_ms=1500)
+        scheduled = service.get_job(job.id).state.next_run_at_ms
+        await service._on_timer()
+        await _drain_runs(service)
+        assert service.get_job(job.id).state.next_run_at_ms == scheduled + 60_000
+
+        await service.run_job(job.id)
+        assert service.get_job(job.id).state.next_run_at_ms == scheduled + 60_000
+    finally:
+        service.stop()
+
+
+@pytest.mark.asyncio
+async def test_catch_up_policies_after_downtime(tmp_path) -> None:
+    import time
+
+    store_path = tmp_path / "cron" / "jobs.json"
+    every = CronSchedule(kind="every", every_ms=60_000)
+    setup = CronService(store_path)
+    jobs = {
+        policy: setup.add_job(name=policy, schedule=every, message="hi", catch_up=policy)
+        for policy in ("skip", "once", "all")
+    }
+    missed_at = int(time.time() * 1000) - 210_000  # four slots missed
+    for job in jobs.values():
+        job.state.next_run_at_ms = missed_at
+    setup._save_store()
+
+    runs: list[str] = []
+
+    async def on_job(job) -> None:
+        runs.append(job.name)
+
+    service = CronService(store_path, on_job=on_job)
+    await service.start()
+    try:
+        await asyncio.sleep(0.05)
+        await _drain_runs(service)
+    finally:
+        service.stop()
+
+    assert sorted(runs) == ["all"] * 4 + ["once"]
+    for job in jobs.values():
+        assert service.get_job(job.id).state.next_run_at_ms == missed_at + 240_000
+    assert CronService(store_path).get_job(jobs["all"].id).catch_up == "all"
+
+
+def test_next_wake_skips_stale_heap_entries(tmp_path) -> None:
+    service = CronService(tmp_path / "cron" / "jobs.json")
+    first, second, third = (
+        service.add_job(
+            name=f"j{i}",
+            schedule=CronSchedule(kind="every", every_ms=(i + 1) * 60_000),
+            message="hi",
+        )
+        for i in range(3)
+    )
+
+    service.enable_job(first.id, enabled=False)
+    service.remove_job(second.id)
+
+    assert service.status()["next_wake_at_ms"] == third.state.next_run_at_ms
@@ -3,7 +3,7 @@
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+from nanobot.providers.openai_compat_provider import ChatStreamAccumulator, OpenAICompatProvider
 
 
 def test_custom_provider_parse_handles_empty_choices() -> None:
@@ -81,3 +81,34 @@ def test_custom_provider_parse_chunks_accepts_plain_text_chunks() -> None:
 
     assert result.finish_reason == "stop"
     assert result.content == "hello world"
+
+
+def _tool_chunk(index: int, args: str, *, name: str | None = None, finish: str | None = None) -> dict:
+    tc: dict = {"index": index, "function": {"arguments": args}}
+    if name:
+        tc["id"] = f"call_{index}"
+        tc["function"]["name"] = name
+    return {"choices": [{"delta": {"tool_calls": [tc]}, "finish_reason": finish}]}
+
+
+def test_stream_accumulator_releases_tool_calls_as_they_complete() -> None:
+    acc = ChatStreamAccumulator()
+
+    assert acc.feed({"choices": [{"delta": {"content": "Reading"}}]}) == "Reading"
+    acc.feed(_tool_chunk(0, '{"path": ', name="read_file"))
+    acc.feed(_tool_chunk(0, '"a.txt"}'))
+    assert acc.ready_tool_calls() == []
+
+    acc.feed(_tool_chunk(1, '{"path": "b.txt"}', name="read_file"))
+    ready = acc.ready_tool_calls()
+    assert [(c.id, c.arguments) for c in ready] == [("call_0", {"path": "a.txt"})]
+
+    acc.feed({"choices": [{"delta": {}, "finish_reason": "tool_calls"}]})
+    acc.feed({"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}})
+    result = acc.build()
+
+    assert result.content == "Reading"
+    assert result.finish_reason == "tool_calls"
+    assert result.usage["total_tokens"] == 12
+    assert [c.arguments for c in result.tool_calls] == [{"path": "a.txt"}, {"path": "b.txt"}]
+    assert result.tool_calls[0] is ready[0]
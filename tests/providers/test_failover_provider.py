@@ -0,0 +1,147 @@
+"""Failover, circuit breaking and hedging across provider targets."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.failover import FailoverProvider, FailoverTarget
+
+
+class _ScriptedProvider(LLMProvider):
+    def __init__(self, name: str, responses=None, delay: float = 0.0, chunks=()):
+        super().__init__()
+        self.name = name
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.chunks = list(chunks)
+        self.models: list[str] = []
+        self.cancelled = False
+
+    async def chat(self, **kwargs) -> LLMResponse:
+        self.models.append(kwargs.get("model"))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.responses:
+            return self.responses.pop(0)
+        return LLMResponse(content=self.name)
+
+    async def chat_stream(self, on_content_delta=None, **kwargs) -> LLMResponse:
+        self.models.append(kwargs.get("model"))
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                if on_content_delta:
+                    await on_content_delta(chunk)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return LLMResponse(content="".join(self.chunks))
+
+    def get_default_model(self) -> str:
+        return self.name
+
+
+def _failover(*providers: _ScriptedProvider, **kwargs) -> FailoverProvider:
+    return FailoverProvider([FailoverTarget(p, p.name) for p in providers], **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch):
+    monkeypatch.setattr(LLMProvider, "_CHAT_RETRY_DELAYS", (0,))
+
+
+@pytest.mark.asyncio
+async def test_non_transient_error_fails_over_without_opening_breaker() -> None:
+    primary = _ScriptedProvider("primary", [LLMResponse(content="400 bad request", finish_reason="error")])
+    backup = _ScriptedProvider("backup")
+    provider = _failover(primary, backup)
+
+    response = await provider.chat_with_retry(messages=[{"role": "user", "content": "hi"}])
+
+    assert response.content == "backup"
+    assert backup.models == ["backup"]
+    assert provider.targets[0].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_skips_failing_target_until_cooldown() -> None:
+    overloaded = LLMResponse(content="503 overloaded", finish_reason="error")
+    primary = _ScriptedProvider("primary", [overloaded] * 4)
+    backup = _ScriptedProvider("backup")
+    provider = _failover(primary, backup, failure_threshold=2, cooldown_s=60)
+    msgs = [{"role": "user", "content": "hi"}]
+
+    for _ in range(2):
+        assert (await provider.chat_with_retry(messages=msgs)).content == "backup"
+    calls = len(primary.models)
+    assert not provider.targets[0].available
+
+    assert (await provider.chat_with_retry(messages=msgs)).content == "backup"
+    assert len(primary.models) == calls
+
+    provider.targets[0].open_until = 0.0
+    primary.responses.clear()
+    assert (await provider.chat_with_retry(messages=msgs)).content == "primary"
+    assert provider.targets[0].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_explicit_model_only_overrides_primary_target() -> None:
+    primary = _ScriptedProvider("primary", [LLMResponse(content="400", finish_reason="error")])
+    backup = _ScriptedProvider("backup")
+    provider = _failover(primary, backup)
+
+    await provider.chat_with_retry(messages=[{"role": "user", "content": "hi"}], model="other")
+
+    assert primary.models == ["other"]
+    assert backup.models == ["backup"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_races_slow_target_and_cancels_loser() -> None:
+    primary = _ScriptedProvider("primary", delay=0.5)
+    backup = _ScriptedProvider("backup")
+    provider = _failover(primary, backup, hedge=True)
+    provider.targets[0].latencies.extend([0.01] * 20)
+
+    response = await provider.chat_with_retry(messages=[{"role": "user", "content": "hi"}])
+
+    assert response.content == "backup"
+    assert primary.cancelled
+
+
+@pytest.mark.asyncio
+async def test_streaming_hedge_forwards_only_the_winning_stream() -> None:
+    primary = _ScriptedProvider("primary", delay=0.2, chunks=["slow ", "reply"])
+    backup = _ScriptedProvider("backup", delay=0.0, chunks=["fast ", "reply"])
+    provider = _failover(primary, backup, hedge=True)
+    provider.targets[0].latencies.extend([0.01] * 20)
+    deltas: list[str] = []
+
+    async def on_delta(text: str) -> None:
+        deltas.append(text)
+
+    response = await provider.chat_stream_with_retry(
+        messages=[{"role": "user", "content": "hi"}], on_content_delta=on_delta,
+    )
+
+    assert response.content == "fast reply"
+    assert deltas == ["fast ", "reply"]
+    assert primary.cancelled
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_before_latency_history_exists() -> None:
+    primary = _ScriptedProvider("primary", delay=0.05)
+    backup = _ScriptedProvider("backup")
+    provider = _failover(primary, backup, hedge=True)
+
+    response = await provider.chat_with_retry(messages=[{"role": "user", "content": "hi"}])
+
+    assert response.content == "primary"
+    assert backup.models == []
+    assert len(provider.targets[0].latencies) == 1
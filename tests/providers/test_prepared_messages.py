@@ -0,0 +1,126 @@
+"""Prepared-message memoization in provider request building."""
+
+import copy
+from unittest.mock import patch
+
+from nanobot.providers.anthropic_provider import AnthropicProvider
+from nanobot.providers.base import PreparedMessageCache
+from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+from nanobot.providers.registry import find_by_name
+
+
+def _openai(spec_name: str | None = None) -> OpenAICompatProvider:
+    spec = find_by_name(spec_name) if spec_name else None
+    with patch("nanobot.providers.openai_compat_provider.AsyncOpenAI"):
+        return OpenAICompatProvider(spec=spec)
+
+
+def _anthropic() -> AnthropicProvider:
+    with patch("anthropic.AsyncAnthropic"):
+        return AnthropicProvider()
+
+
+def _history(n: int) -> list[dict]:
+    messages: list[dict] = [{"role": "system", "content": "You are helpful."}]
+    while len(messages) < n:
+        i = len(messages)
+        messages.append({"role": "user", "content": f"question {i}"})
+        messages.append({
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{
+                "id": f"call_long_identifier_{i}",
+                "type": "function",
+                "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'},
+            }],
+        })
+        messages.append({
+            "role": "tool",
+            "tool_call_id": f"call_long_identifier_{i}",
+            "name": "read_file",
+            "content": "x" * 200,
+        })
+    return messages
+
+
+def _kwargs(provider, messages, tools=None):
+    return provider._build_kwargs(
+        messages, tools, None, 1024, 0.1, None, None,
+    )
+
+
+def test_cache_reprepares_messages_reassigned_in_place() -> None:
+    cache = PreparedMessageCache()
+    msg = {"role": "user", "content": "a"}
+    calls: list[str] = []
+
+    def prepare(m):
+        calls.append(m["content"])
+        return m["content"].upper()
+
+    assert cache.get(msg, prepare) == "A"
+    assert cache.get(msg, prepare) == "A"
+    msg["content"] = "b"
+    assert cache.get(msg, prepare) == "B"
+    msg["name"] = "x"
+    assert cache.get(msg, prepare) == "B"
+    assert calls == ["a", "b", "b"]
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = PreparedMessageCache(max_entries=2)
+    msgs = [{"role": "user", "content": str(i)} for i in range(3)]
+    for m in msgs:
+        cache.get(m, lambda m: m["content"])
+    cache.get(msgs[0], lambda m: m["content"])
+    assert cache.misses == 4
+
+
+def test_openai_memoized_output_matches_fresh_provider() -> None:
+    messages = _history(30)
+    tools = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+    warm = _openai("openrouter")
+    for end in range(4, len(messages) + 1):
+        result = _kwargs(warm, messages[:end], tools)
+    assert result == _kwargs(_openai("openrouter"), messages, tools)
+    ids = {tc["id"] for m in result["messages"] for tc in m.get("tool_calls", [])}
+    assert all(len(i) == 9 for i in ids)
+
+
+def test_openai_cache_markers_do_not_leak_into_memoized_messages() -> None:
+    provider = _openai("openrouter")
+    messages = _history(10)
+    first = _kwargs(provider, messages[:6])["messages"]
+    assert "cache_control" in str(first[3]["content"])
+    second = _kwargs(provider, messages[:8])["messages"]
+    assert "cache_control" not in str(second[3]["content"])
+
+
+def test_anthropic_merges_without_mutating_memoized_conversions() -> None:
+    provider = _anthropic()
+    messages = _history(13)
+    messages.insert(5, {"role": "user", "content": "follow-up"})
+    snapshot = copy.deepcopy(messages)
+
+    first = _kwargs(provider, messages)
+    second = _kwargs(provider, messages)
+    fresh = _kwargs(_anthropic(), messages)
+
+    assert first == second == fresh
+    assert messages == snapshot
+    roles = [m["role"] for m in first["messages"]]
+    assert all(a != b for a, b in zip(roles, roles[1:]))
+
+
+def test_microbenchmark_500_messages_40_iterations() -> None:
+    """A 40-iteration tool loop over 500 messages prepares each message once."""
+    messages = _history(500)
+    for provider in (_openai("openrouter"), _anthropic()):
+        history = list(messages)
+        for i in range(40):
+            history.append({"role": "user", "content": f"turn {i}"})
+            _kwargs(provider, history)
+
+        cache = provider._prepared
+        assert len(history) - 1 <= cache.misses <= len(history)
+        assert cache.hits > 40 * 400
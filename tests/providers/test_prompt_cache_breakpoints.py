@@ -0,0 +1,90 @@
+"""Cache breakpoint placement at prompt segment boundaries."""
+
+from unittest.mock import patch
+
+from nanobot.providers.anthropic_provider import AnthropicProvider
+from nanobot.providers.openai_compat_provider import OpenAICompatProvider
+from nanobot.providers.openai_responses_common import normalize_openai_usage
+
+_SYSTEM = "# nanobot\n\nidentity\n\n---\n\n# Skills\n\nskills\n\n---\n\n# Memory\n\nfacts"
+_TOOLS = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+
+
+def _conversation() -> list[dict]:
+    return [
+        {"role": "system", "content": _SYSTEM},
+        {"role": "user", "content": "old question"},
+        {"role": "assistant", "content": "old answer"},
+        {"role": "user", "content": "[Runtime Context]\nCurrent Time: now\n\nnew question"},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "read_file", "arguments": "{}"},
+            }],
+        },
+        {"role": "tool", "tool_call_id": "call_1", "name": "read_file", "content": "data"},
+    ]
+
+
+def _count_markers(value) -> int:
+    if isinstance(value, dict):
+        return ("cache_control" in value) + sum(_count_markers(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(_count_markers(v) for v in value)
+    return 0
+
+
+def test_openai_compat_marks_segment_boundaries() -> None:
+    messages, tools = OpenAICompatProvider._apply_cache_control(_conversation(), _TOOLS)
+
+    system_blocks = messages[0]["content"]
+    assert "".join(b["text"] for b in system_blocks) == _SYSTEM
+    assert system_blocks[1]["text"].startswith("\n\n---\n\n# Memory")
+    assert "cache_control" in system_blocks[0]
+    # History ends before the current user message; the newest message is the tool result.
+    assert "cache_control" in messages[2]["content"][-1]
+    assert "cache_control" in messages[5]["content"][-1]
+    assert "cache_control" in system_blocks[1]
+    assert tools is _TOOLS
+    assert _count_markers(messages) == OpenAICompatProvider._MAX_CACHE_BREAKPOINTS
+
+
+def test_openai_compat_marks_tools_without_system_prompt() -> None:
+    messages, tools = OpenAICompatProvider._apply_cache_control(
+        [{"role": "user", "content": "hi"}], _TOOLS,
+    )
+
+    assert "cache_control" in messages[0]["content"][-1]
+    assert "cache_control" in tools[-1]
+
+
+def test_anthropic_marks_segment_boundaries_within_limit() -> None:
+    with patch("anthropic.AsyncAnthropic"):
+        provider = AnthropicProvider()
+
+    kwargs = provider._build_kwargs(_conversation(), _TOOLS, None, 1024, 0.1, None, None)
+
+    assert [b["text"][:12] for b in kwargs["system"]] == ["# nanobot\n\ni", "\n\n---\n\n# Mem"]
+    assert all("cache_control" in b for b in kwargs["system"])
+    msgs = kwargs["messages"]
+    assert "cache_control" in msgs[1]["content"][-1]  # last history message
+    assert "cache_control" in msgs[-1]["content"][-1]  # newest tool result
+    assert "cache_control" not in kwargs["tools"][-1]
+    total = _count_markers(kwargs["system"]) + _count_markers(msgs) + _count_markers(kwargs["tools"])
+    assert total == AnthropicProvider._MAX_CACHE_BREAKPOINTS
+
+
+def test_usage_reports_cache_reads_and_writes() -> None:
+    usage = normalize_openai_usage({
+        "usage": {
+            "prompt_tokens": 100,
+            "completion_tokens": 5,
+            "prompt_tokens_details": {"cached_tokens": 60, "cache_write_tokens": 30},
+        }
+    })
+
+    assert usage["cached_tokens"] == 60
+    assert usage["cache_write_tokens"] == 30
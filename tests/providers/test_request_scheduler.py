@@ -0,0 +1,119 @@
+"""Provider request scheduling: concurrency, priority and shared backoff."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.scheduler import RequestScheduler, parse_retry_after, request_priority
+
+_real_sleep = asyncio.sleep
+
+
+class _SlowProvider(LLMProvider):
+    def __init__(self, responses=None):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self.order: list[str] = []
+        self._responses = list(responses or [])
+
+    async def chat(self, *args, **kwargs) -> LLMResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await _real_sleep(0.01)
+        finally:
+            self.active -= 1
+        self.order.append(kwargs["messages"][0]["content"])
+        if self._responses:
+            return self._responses.pop(0)
+        return LLMResponse(content="ok", usage={"total_tokens": 10})
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _msgs(tag: str) -> list[dict]:
+    return [{"role": "user", "content": tag}]
+
+
+def test_parse_retry_after_variants() -> None:
+    assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after({}) is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_per_model() -> None:
+    provider = _SlowProvider()
+    provider.scheduler = RequestScheduler(max_concurrent=2)
+
+    await asyncio.gather(*(provider.chat_with_retry(messages=_msgs(str(i))) for i in range(6)))
+    assert provider.peak == 2
+
+    provider.peak = 0
+    await asyncio.gather(*(
+        provider.chat_with_retry(messages=_msgs(str(i)), model=f"m{i % 3}") for i in range(6)
+    ))
+    assert provider.peak > 2
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_are_admitted_before_background() -> None:
+    provider = _SlowProvider()
+    provider.scheduler = RequestScheduler(max_concurrent=1)
+
+    async def background(tag: str) -> None:
+        with request_priority("background"):
+            await provider.chat_with_retry(messages=_msgs(tag))
+
+    first = asyncio.create_task(provider.chat_with_retry(messages=_msgs("first")))
+    await asyncio.sleep(0)
+    queued = [asyncio.create_task(background(f"bg{i}")) for i in range(2)]
+    await asyncio.sleep(0)
+    queued.append(asyncio.create_task(provider.chat_with_retry(messages=_msgs("user"))))
+    await asyncio.gather(first, *queued)
+
+    assert provider.order == ["first", "user", "bg0", "bg1"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_retry_after_pauses_other_callers(monkeypatch) -> None:
+    provider = _SlowProvider([
+        LLMResponse(content="429 rate limit", finish_reason="error", retry_after=2.5),
+        LLMResponse(content="ok"),
+        LLMResponse(content="ok"),
+    ])
+    provider.scheduler = RequestScheduler()
+    slept: list[float] = []
+
+    async def _fake_sleep(delay: float) -> None:
+        slept.append(delay)
+        provider.scheduler._paused_until = 0.0
+        await _real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", _fake_sleep)
+
+    response = await provider.chat_with_retry(messages=_msgs("a"))
+    assert response.content == "ok"
+    assert slept == [2.5]  # the advertised wait beats the 1s default
+
+    provider.scheduler.backoff(0.2)
+    await provider.chat_with_retry(messages=_msgs("b"))
+    assert len(slept) == 2 and slept[1] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_token_budget_holds_background_callers_first() -> None:
+    scheduler = RequestScheduler(tokens_per_minute=100)
+    scheduler.record_usage("m", {"prompt_tokens": 50, "completion_tokens": 35})
+
+    async with scheduler.slot("m"):
+        pass
+    with request_priority("background"):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.slot("m").__aenter__(), 0.05)
@@ -0,0 +1,105 @@
+"""On-disk response cache for temperature-0 calls."""
+
+import os
+import time
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.response_cache import ResponseCache
+
+
+class _CountingProvider(LLMProvider):
+    def __init__(self, response: LLMResponse):
+        super().__init__()
+        self.calls = 0
+        self._response = response
+
+    async def chat(self, **kwargs) -> LLMResponse:
+        self.calls += 1
+        return self._response
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+_TOOL_RESPONSE = LLMResponse(
+    content=None,
+    tool_calls=[ToolCallRequest(id="call_1", name="heartbeat", arguments={"action": "skip"})],
+    finish_reason="tool_calls",
+    usage={"prompt_tokens": 120, "completion_tokens": 8},
+)
+_MSGS = [{"role": "user", "content": "Review HEARTBEAT.md"}]
+_FORCED = {"type": "function", "function": {"name": "heartbeat"}}
+_CACHED = {"temperature": 0.0, "cache": True}
+
+
+async def test_temperature_zero_calls_are_served_from_disk(tmp_path) -> None:
+    provider = _CountingProvider(_TOOL_RESPONSE)
+    provider.response_cache = ResponseCache(tmp_path)
+
+    first = await provider.chat_with_retry(messages=_MSGS, tool_choice=_FORCED, **_CACHED)
+    fresh = _CountingProvider(_TOOL_RESPONSE)
+    fresh.response_cache = ResponseCache(tmp_path)
+    second = await fresh.chat_with_retry(messages=_MSGS, tool_choice=_FORCED, **_CACHED)
+
+    assert provider.calls == 1 and fresh.calls == 0
+    assert second.tool_calls[0].arguments == first.tool_calls[0].arguments == {"action": "skip"}
+    assert second.usage == {}
+    assert (fresh.response_cache.hits, fresh.response_cache.misses) == (1, 0)
+
+
+async def test_sampled_and_changed_requests_bypass_cache(tmp_path) -> None:
+    provider = _CountingProvider(_TOOL_RESPONSE)
+    provider.response_cache = ResponseCache(tmp_path)
+
+    await provider.chat_with_retry(messages=_MSGS, temperature=0.7, cache=True)
+    await provider.chat_with_retry(messages=_MSGS, temperature=0.7, cache=True)
+    await provider.chat_with_retry(messages=_MSGS, **_CACHED)
+    await provider.chat_with_retry(messages=[{"role": "user", "content": "changed"}], **_CACHED)
+
+    assert provider.calls == 4
+    assert provider.response_cache.misses == 2
+
+
+async def test_calls_without_cache_opt_in_bypass_cache(tmp_path) -> None:
+    provider = _CountingProvider(_TOOL_RESPONSE)
+    provider.response_cache = ResponseCache(tmp_path)
+
+    await provider.chat_with_retry(messages=_MSGS, tool_choice=_FORCED, temperature=0.0)
+    await provider.chat_with_retry(messages=_MSGS, tool_choice=_FORCED, temperature=0.0)
+
+    assert provider.calls == 2
+    assert (provider.response_cache.hits, provider.response_cache.misses) == (0, 0)
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_errors_and_missing_forced_tool_calls_are_not_cached(tmp_path) -> None:
+    for response in (
+        LLMResponse(content="400 bad request", finish_reason="error"),
+        LLMResponse(content="I think we should skip."),
+    ):
+        provider = _CountingProvider(response)
+        provider.response_cache = ResponseCache(tmp_path)
+        await provider.chat_with_retry(messages=_MSGS, tool_choice=_FORCED, **_CACHED)
+        await provider.chat_with_retry(messages=_MSGS, tool_choice=_FORCED, **_CACHED)
+        assert provider.calls == 2
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_expired_and_least_recently_used_entries_are_dropped(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, max_entries=2, ttl_s=60)
+    keys = [cache.key("m", [{"role": "user", "content": str(i)}], None, None, 0.0) for i in range(3)]
+    cache.put(keys[0], LLMResponse(content="0"))
+    cache.put(keys[1], LLMResponse(content="1"))
+    stale = time.time() - 30
+    os.utime(tmp_path / f"{keys[1]}.json", (stale, stale))
+    assert cache.get(keys[0]).content == "0"
+
+    cache.put(keys[2], LLMResponse(content="2"))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]).content == "2"
+
+    cache.ttl_s = 0
+    assert cache.get(keys[0]) is None
+    assert (cache.hits, cache.misses) == (2, 2)
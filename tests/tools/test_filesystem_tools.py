@@ -1,12 +1,18 @@
-"""Tests for enhanced filesystem tools: ReadFileTool, EditFileTool, ListDirTool."""
+"""Tests for enhanced filesystem tools: ReadFileTool, EditFileTool, ListDirTool, GlobTool, GrepTool."""
+
+import asyncio
 
 import pytest
 
 from nanobot.agent.tools.filesystem import (
+    _LINE_INDEX_CACHE,
     EditFileTool,
+    GlobTool,
+    GrepTool,
     ListDirTool,
     ReadFileTool,
     _find_match,
+    _LineIndex,
 )
 
 
@@ -93,6 +99,74 @@ class TestReadFileTool:
         assert "Use offset=" in result
 
 
+class TestReadFileToolLargeFiles:
+    """Files above _MMAP_THRESHOLD are paged through a cached line index."""
+
+    @pytest.fixture()
+    def tool(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ReadFileTool, "_MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(_LineIndex, "BLOCK", 64)
+        return ReadFileTool(workspace=tmp_path)
+
+    @pytest.fixture()
+    def log_file(self, tmp_path):
+        f = tmp_path / "app.log"
+        f.write_bytes(b"".join(f"entry {i}\r\n".encode() for i in range(1, 1001)))
+        return f
+
+    @pytest.mark.asyncio
+    async def test_window_matches_full_read(self, tool, log_file, monkeypatch):
+        result = await tool.execute(path=str(log_file), offset=500, limit=3)
+        assert result.startswith("500| entry 500\n501| entry 501\n502| entry 502")
+        assert "Use offset=503 to continue" in result
+
+        monkeypatch.setattr(ReadFileTool, "_MMAP_THRESHOLD", 1 << 40)
+        small = await tool.execute(path=str(log_file), offset=500, limit=3)
+        assert small == result.replace("502. Use", "502 of 1000. Use")
+
+    @pytest.mark.asyncio
+    async def test_window_only_indexes_what_it_needs(self, tool, log_file):
+        await tool.execute(path=str(log_file), offset=10, limit=5)
+        index = next(v for k, v in _LINE_INDEX_CACHE.items() if k[0] == str(log_file))
+        assert not index.complete
+
+        result = await tool.execute(path=str(log_file), offset=999)
+        assert "999| entry 999\n1000| entry 1000" in result
+        assert "End of file — 1000 lines total" in result
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_a_consistent_index(self, tool, log_file):
+        offsets = list(range(1, 1001, 37)) * 4
+        results = await asyncio.gather(
+            *(tool.execute(path=str(log_file), offset=o, limit=1) for o in offsets)
+        )
+        for offset, result in zip(offsets, results):
+            assert result.startswith(f"{offset}| entry {offset}\n")
+        index = next(v for k, v in _LINE_INDEX_CACHE.items() if k[0] == str(log_file))
+        assert list(index.counts) == sorted(set(index.counts))
+
+    @pytest.mark.asyncio
+    async def test_offset_beyond_end(self, tool, log_file):
+        result = await tool.execute(path=str(log_file), offset=1001)
+        assert result == "Error: offset 1001 is beyond end of file (1000 lines)"
+
+    @pytest.mark.asyncio
+    async def test_index_invalidated_when_file_changes(self, tool, log_file):
+        await tool.execute(path=str(log_file), offset=999)
+        log_file.write_bytes(b"replaced\nlast line without newline")
+        result = await tool.execute(path=str(log_file), offset=2)
+        assert "2| last line without newline" in result
+        assert "End of file — 2 lines total" in result
+
+    @pytest.mark.asyncio
+    async def test_binary_detected_from_leading_bytes(self, tool, tmp_path):
+        f = tmp_path / "blob.bin"
+        f.write_bytes(b"\x00\x01\x02" + b"x" * 100)
+        result = await tool.execute(path=str(f))
+        assert "Cannot read binary file" in result
+
+
+
 # ---------------------------------------------------------------------------
 # _find_match  (unit tests for the helper)
 # ---------------------------------------------------------------------------
@@ -133,6 +207,12 @@ class TestFindMatch:
         match, count = _find_match(content, old_text)
         assert count == 2
 
+    def test_line_trim_anchor_off_first_line(self):
+        content = "\n".join(f"  x{i} = {i}" for i in range(500)) + "\n\n  target()\n  done()\n"
+        match, count = _find_match(content, "\ntarget()\ndone()")
+        assert count == 1
+        assert match == "\n  target()\n  done()"
+
     def test_empty_old_text(self):
         match, count = _find_match("hello", "")
         # Empty string is always "in" any string via exact match
@@ -205,6 +285,27 @@ class TestEditFileTool:
         assert "Error" in result
         assert "not found" in result
 
+    @pytest.mark.asyncio
+    async def test_not_found_in_large_file_reports_best_match(self, tool, tmp_path):
+        f = tmp_path / "big.py"
+        lines = [f"value_{i} = compute({i})\n" for i in range(20_000)]
+        f.write_text("".join(lines), encoding="utf-8")
+        old = "value_12000 = compute(12000)\nvalue_12001 = compute(-1)\nvalue_12002 = compute(12002)\n"
+        result = await tool.execute(path=str(f), old_text=old, new_text="x")
+        assert "Best match" in result
+        assert "line 12001" in result
+
+    @pytest.mark.asyncio
+    async def test_edit_is_atomic_and_keeps_mode(self, tool, tmp_path):
+        f = tmp_path / "run.sh"
+        f.write_text("echo hi\n", encoding="utf-8")
+        f.chmod(0o755)
+        result = await tool.execute(path=str(f), old_text="hi", new_text="bye")
+        assert "Successfully" in result
+        assert f.read_text() == "echo bye\n"
+        assert f.stat().st_mode & 0o777 == 0o755
+        assert [p.name for p in tmp_path.iterdir()] == ["run.sh"]
+
     @pytest.mark.asyncio
     async def test_missing_new_text_returns_clear_error(self, tool, tmp_path):
         f = tmp_path / "a.py"
@@ -264,6 +365,31 @@ class TestListDirTool:
         assert "truncated" in result
         assert "3 of 10" in result
 
+    @pytest.mark.asyncio
+    async def test_recursive_order_matches_sorted_paths(self, tool, tmp_path):
+        for rel in ("a/x.txt", "a-b/y.txt", "a/sub/z.txt", "b.txt"):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("x")
+        (tmp_path / "a" / "node_modules" / "deep").mkdir(parents=True)
+
+        result = await tool.execute(path=str(tmp_path), recursive=True)
+
+        expected = [
+            f"{p.relative_to(tmp_path)}/" if p.is_dir() else str(p.relative_to(tmp_path))
+            for p in sorted(tmp_path.rglob("*"))
+            if "node_modules" not in p.parts
+        ]
+        assert result.splitlines() == expected
+
+    @pytest.mark.asyncio
+    async def test_recursive_count_is_bounded(self, tool, tmp_path, monkeypatch):
+        monkeypatch.setattr(ListDirTool, "_COUNT_LIMIT", 5)
+        for i in range(20):
+            (tmp_path / f"f{i:02d}.txt").write_text("x")
+        result = await tool.execute(path=str(tmp_path), recursive=True, max_entries=3)
+        assert result.splitlines()[:3] == ["f00.txt", "f01.txt", "f02.txt"]
+        assert "showing first 3 of 8+ entries" in result
+
     @pytest.mark.asyncio
     async def test_empty_dir(self, tool, tmp_path):
         d = tmp_path / "empty"
@@ -392,3 +518,124 @@ class TestWorkspaceRestriction:
         assert "Error" in result
         assert "outside" in result.lower()
         assert skill_file.read_text() == "# Weather\nOriginal content."
+
+
+# ---------------------------------------------------------------------------
+# GlobTool / GrepTool
+# ---------------------------------------------------------------------------
+
+class TestSearchTools:
+
+    @pytest.fixture()
+    def repo(self, tmp_path):
+        files = {
+            ".gitignore": "*.log\n/out/\n!keep.log\n",
+            "README.md": "hello\n",
+            "src/app.py": "import os\n\ndef main():\n    return os.getcwd()\n",
+            "src/util.py": "def helper():\n    pass\n",
+            "src/gen/.gitignore": "*.py\n",
+            "src/gen/big.py": "def main():\n",
+            "src/gen/schema.json": "{}\n",
+            "out/build.txt": "def main():\n",
+            "debug.log": "def main():\n",
+            "keep.log": "def main(): kept\n",
+            "node_modules/pkg/index.js": "function main() {}\n",
+        }
+        for rel, content in files.items():
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text(content, encoding="utf-8")
+        (tmp_path / "blob.bin").write_bytes(b"\x00def main():")
+        return tmp_path
+
+    @pytest.mark.asyncio
+    async def test_glob_respects_gitignore(self, repo):
+        tool = GlobTool(workspace=repo)
+        result = await tool.execute(pattern="*")
+        assert result.splitlines() == [
+            ".gitignore",
+            "README.md",
+            "blob.bin",
+            "keep.log",
+            "src/app.py",
+            "src/gen/.gitignore",
+            "src/gen/schema.json",
+            "src/util.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_glob_anchored_pattern_and_subdir(self, repo):
+        tool = GlobTool(workspace=repo)
+        assert (await tool.execute(pattern="src/*.py")).splitlines() == [
+            "src/app.py",
+            "src/util.py",
+        ]
+        assert (await tool.execute(pattern="*.json", path="src")).splitlines() == [
+            "gen/schema.json",
+        ]
+        assert "No files matching" in await tool.execute(pattern="*.rs")
+
+    @pytest.mark.asyncio
+    async def test_glob_index_picks_up_new_files(self, repo):
+        tool = GlobTool(workspace=repo)
+        assert "No files matching" in await tool.execute(pattern="*.toml")
+        (repo / "src" / "pyproject.toml").write_text("x")
+        assert await tool.execute(pattern="*.toml") == "src/pyproject.toml"
+        (repo / "src" / ".gitignore").write_text("*.toml\n")
+        assert "No files matching" in await tool.execute(pattern="*.toml")
+
+    @pytest.mark.asyncio
+    async def test_grep_returns_line_numbered_matches(self, repo):
+        tool = GrepTool(workspace=repo)
+        result = await tool.execute(pattern=r"def \w+\(")
+        assert result.splitlines() == [
+            "keep.log:1: def main(): kept",
+            "src/app.py:3: def main():",
+            "src/util.py:1: def helper():",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_grep_anchored_pattern_matches_later_lines(self, repo):
+        tool = GrepTool(workspace=repo)
+        assert (await tool.execute(pattern="^def ", path="src/app.py")) == "app.py:3: def main():"
+        assert (await tool.execute(pattern=r"getcwd\(\)$", include="*.py")) == (
+            "src/app.py:4:     return os.getcwd()"
+        )
+        assert (await tool.execute(pattern=r"\Adef", include="*.py")).splitlines() == [
+            "src/app.py:3: def main():",
+            "src/util.py:1: def helper():",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_grep_end_anchor_matches_crlf_lines(self, repo):
+        (repo / "src" / "win.py").write_bytes(b"import os\r\ndef main():\r\n    pass\r\n")
+        tool = GrepTool(workspace=repo)
+        assert await tool.execute(pattern=r"main\(\):$", path="src/win.py") == (
+            "win.py:2: def main():"
+        )
+
+    @pytest.mark.asyncio
+    async def test_grep_include_case_and_cap(self, repo):
+        tool = GrepTool(workspace=repo)
+        result = await tool.execute(pattern="DEF", include="*.py", ignore_case=True, max_matches=1)
+        assert result.startswith("src/app.py:3: def main():")
+        assert "showing first 1 matches" in result
+
+    @pytest.mark.asyncio
+    async def test_grep_single_file_and_invalid_regex(self, repo):
+        tool = GrepTool(workspace=repo)
+        assert await tool.execute(pattern="getcwd", path="src/app.py") == (
+            "app.py:4:     return os.getcwd()"
+        )
+        assert "Invalid regular expression" in await tool.execute(pattern="(")
+
+    @pytest.mark.asyncio
+    async def test_search_blocked_outside_workspace(self, repo, tmp_path_factory):
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "secret.txt").write_text("def main():")
+        (repo / "link.txt").symlink_to(outside / "secret.txt")
+
+        grep = GrepTool(workspace=repo, allowed_dir=repo)
+        assert "outside allowed directory" in await grep.execute(pattern="x", path=str(outside))
+        assert "link.txt" not in await grep.execute(pattern="def main")
+        glob = GlobTool(workspace=repo, allowed_dir=repo)
+        assert "link.txt" not in await glob.execute(pattern="*.txt")
@@ -7,7 +7,15 @@ from types import ModuleType, SimpleNamespace
 
 import pytest
 
-from nanobot.agent.tools.mcp import MCPToolWrapper, connect_mcp_servers
+import nanobot.agent.tools.mcp as mcp_module
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.mcp import (
+    MCPServerConnection,
+    MCPToolCache,
+    MCPToolWrapper,
+    connect_mcp_servers,
+    mcp_progress,
+)
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.config.schema import MCPServerConfig
 
@@ -366,3 +374,196 @@ async def test_connect_mcp_servers_reports_missing_command_or_url() -> None:
 
     assert results["test"].connected is False
     assert results["test"].error == "no command or url configured"
+
+
+@pytest.mark.asyncio
+async def test_connect_mcp_servers_connects_in_parallel_with_per_server_timeout(
+    fake_mcp_runtime: dict[str, object | None], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_mcp_runtime["session"] = _make_fake_session(["demo"])
+    real_open_session = mcp_module._open_session
+    started: list[str] = []
+
+    async def _open_session(name, cfg, stack, result):
+        started.append(name)
+        if name == "slow":
+            await asyncio.sleep(60)
+        return await real_open_session(name, cfg, stack, result)
+
+    monkeypatch.setattr(mcp_module, "_open_session", _open_session)
+    slow = MCPServerConfig(command="slow")
+    slow.connect_timeout = 0.05
+    registry = ToolRegistry()
+    stack = AsyncExitStack()
+    await stack.__aenter__()
+    try:
+        results = await asyncio.wait_for(
+            connect_mcp_servers({"slow": slow, "fast": MCPServerConfig(command="fast")}, registry, stack),
+            timeout=2,
+        )
+    finally:
+        await stack.aclose()
+
+    assert started == ["slow", "fast"]
+    assert results["fast"].connected is True
+    assert results["slow"].connected is False
+    assert results["slow"].error == "connect timed out after 0.05s"
+    assert registry.tool_names == ["mcp_fast_demo"]
+
+
+@pytest.mark.asyncio
+async def test_cached_tools_register_before_connect_and_connect_on_first_call(
+    fake_mcp_runtime: dict[str, object | None], tmp_path
+) -> None:
+    calls: list[tuple[str, dict]] = []
+    session = _make_fake_session(["demo"])
+
+    async def call_tool(name: str, arguments: dict | None = None, **_kwargs):
+        calls.append((name, arguments))
+        return SimpleNamespace(content=[_FakeTextContent("ok")])
+
+    session.call_tool = call_tool
+    fake_mcp_runtime["session"] = session
+    cfg = MCPServerConfig(command="fake")
+    cache = MCPToolCache(tmp_path / "tools.json")
+
+    first = MCPServerConnection("test", cfg, ToolRegistry(), cache)
+    await first.connect()
+    await first.close()
+
+    registry = ToolRegistry()
+    connection = MCPServerConnection("test", cfg, registry, MCPToolCache(tmp_path / "tools.json"))
+    assert connection.register_cached_tools() == ["mcp_test_demo"]
+    assert not connection.connected
+
+    result = await registry.get("mcp_test_demo").execute(value=1)
+    await connection.close()
+
+    assert result == "ok"
+    assert calls == [("demo", {"value": 1})]
+    changed = MCPServerConnection("test", MCPServerConfig(command="other"), ToolRegistry(), cache)
+    assert changed.register_cached_tools() == []
+
+
+@pytest.mark.asyncio
+async def test_health_check_reconnects_only_the_failed_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    opened: list[str] = []
+    pings = {"good": 0, "bad": 0}
+
+    def _session(name: str) -> SimpleNamespace:
+        async def send_ping() -> None:
+            pings[name] += 1
+            if name == "bad" and pings[name] == 1:
+                raise ConnectionError("broken pipe")
+
+        async def list_tools() -> SimpleNamespace:
+            return SimpleNamespace(tools=[_make_tool_def("demo")])
+
+        return SimpleNamespace(send_ping=send_ping, list_tools=list_tools)
+
+    async def _open_session(name, cfg, stack, result):
+        opened.append(name)
+        result.transport = "stdio"
+        return _session(name)
+
+    monkeypatch.setattr(mcp_module, "_open_session", _open_session)
+    monkeypatch.setattr(MCPServerConnection, "_RECONNECT_BASE_S", 0.01)
+    registry = ToolRegistry()
+    connections = {}
+    for name in ("good", "bad"):
+        cfg = MCPServerConfig(command=name)
+        cfg.health_check_interval = 0.02
+        connections[name] = MCPServerConnection(name, cfg, registry)
+    await asyncio.gather(*(c.connect() for c in connections.values()))
+    good_session = connections["good"].session
+
+    for connection in connections.values():
+        connection.start_health_checks()
+    for _ in range(100):
+        if connections["bad"].stats.reconnects:
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.gather(*(c.shutdown() for c in connections.values()))
+
+    assert opened.count("bad") == 2 and opened.count("good") == 1
+    assert connections["good"].session is None and good_session is not None
+    assert connections["bad"].stats.reconnects == 1
+    assert "broken pipe" in connections["bad"].stats.last_error
+    assert connections["good"].stats.ping_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_connection_records_call_latency_and_errors(
+    fake_mcp_runtime: dict[str, object | None],
+) -> None:
+    session = _make_fake_session(["demo"])
+
+    async def call_tool(name: str, arguments: dict | None = None, **_kwargs):
+        if arguments.get("fail"):
+            raise RuntimeError("boom")
+        return SimpleNamespace(content=[_FakeTextContent("ok")])
+
+    session.call_tool = call_tool
+    fake_mcp_runtime["session"] = session
+    registry = ToolRegistry()
+    connection = MCPServerConnection("test", MCPServerConfig(command="fake"), registry)
+    await connection.connect()
+    tool = registry.get("mcp_test_demo")
+    await tool.execute(fail=False)
+    await tool.execute(fail=True)
+    await connection.shutdown()
+
+    stats = connection.stats.snapshot()
+    assert (stats["calls"], stats["errors"]) == (2, 1)
+    assert stats["last_error"] == "RuntimeError: boom"
+    assert stats["p95_ms"] is not None
+
+
+def _blocks_session(texts: list[str]) -> SimpleNamespace:
+    async def call_tool(_name: str, arguments: dict | None = None, progress_callback=None):
+        if progress_callback is not None:
+            await progress_callback(1, 4, "indexing")
+            await progress_callback(2, 4, "indexing")
+        return SimpleNamespace(content=[_FakeTextContent(text) for text in texts])
+
+    return SimpleNamespace(call_tool=call_tool)
+
+
+@pytest.mark.asyncio
+async def test_execute_stores_large_results_as_artifacts(tmp_path) -> None:
+    texts = ["a" * 30, "b" * 30, "c" * 30]
+    tool_def = _make_tool_def("dump")
+    store = ArtifactStore(tmp_path, threshold_chars=1_000, preview_chars=30)
+    wrapper = MCPToolWrapper(
+        _blocks_session(texts), "test", tool_def, max_result_chars=40, artifacts=store
+    )
+    bare = MCPToolWrapper(_blocks_session(texts), "test", tool_def, max_result_chars=40)
+
+    result = await wrapper.execute()
+    truncated = await bare.execute()
+
+    full = "\n".join(texts)
+    [artifact] = list(store.directory.iterdir())
+    assert artifact.read_text(encoding="utf-8") == full
+    assert f".artifacts/{artifact.name}" in result
+    assert await store.offload(wrapper.name, {}, result) == result
+    assert store.stored == 1
+    assert truncated == full[:40] + "\n\n... (MCP result truncated: showing the first 40 of 92 chars)"
+
+
+@pytest.mark.asyncio
+async def test_execute_forwards_progress_notifications_as_tool_hints() -> None:
+    hints: list[tuple[str, bool]] = []
+
+    async def on_progress(content: str, *, tool_hint: bool = False) -> None:
+        hints.append((content, tool_hint))
+
+    wrapper = MCPToolWrapper(_blocks_session(["done"]), "test", _make_tool_def("index"))
+    assert await wrapper.execute() == "done"
+    with mcp_progress(on_progress):
+        assert await wrapper.execute() == "done"
+
+    # The second notification falls inside the throttle window.
+    assert hints == [("mcp_test_index: indexing (25%)", True)]
@@ -1,5 +1,6 @@
 """Test message tool suppress logic for final replies."""
 
+import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
@@ -291,12 +292,36 @@ class TestMessageToolTurnTracking:
     def test_sent_in_turn_tracks_same_target(self) -> None:
         tool = MessageTool()
         tool.set_context("feishu", "chat1")
-        assert not tool._sent_in_turn
-        tool._sent_in_turn = True
-        assert tool._sent_in_turn
+        assert not tool.sent_in_turn
+        tool.sent_in_turn = True
+        assert tool.sent_in_turn
 
     def test_start_turn_resets(self) -> None:
         tool = MessageTool()
-        tool._sent_in_turn = True
+        tool.sent_in_turn = True
         tool.start_turn()
-        assert not tool._sent_in_turn
+        assert not tool.sent_in_turn
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turns_keep_their_own_route_and_flag(self) -> None:
+        sent: list[OutboundMessage] = []
+
+        async def _send(msg: OutboundMessage) -> None:
+            sent.append(msg)
+
+        tool = MessageTool(send_callback=_send)
+        both_bound = asyncio.Barrier(2)
+
+        async def turn(chat_id: str, send: bool) -> bool:
+            tool.set_context("feishu", chat_id)
+            tool.start_turn()
+            await both_bound.wait()
+            if send:
+                await tool.execute(content=f"hi {chat_id}")
+            await asyncio.sleep(0)
+            return tool.sent_in_turn
+
+        flags = await asyncio.gather(turn("a", True), turn("b", False))
+
+        assert flags == [True, False]
+        assert [(m.chat_id, m.content) for m in sent] == [("a", "hi a")]
@@ -391,6 +391,26 @@ async def test_exec_head_tail_truncation() -> None:
     assert "Exit code:" in result
 
 
+async def test_exec_truncation_counts_bytes_dropped_during_capture() -> None:
+    """Output discarded while streaming should still be reported as truncated."""
+    tool = ExecTool()
+    result = await tool.execute(command="python -c \"print('A' * 100000)\"")
+    assert len(result) < 11_000
+    notice = result.split("... (", 1)[1].split(" chars truncated", 1)[0]
+    assert int(notice.replace(",", "")) > 85_000
+    assert "Exit code: 0" in result
+
+
+async def test_exec_kills_command_past_output_cap() -> None:
+    """A runaway command should be killed once the hard output cap is hit."""
+    tool = ExecTool(timeout=30)
+    tool._MAX_CAPTURE_BYTES = 256 * 1024
+    result = await tool.execute(command="yes")
+    assert "command was killed" in result
+    assert "timed out" not in result
+    assert "Exit code: 0" not in result
+
+
 async def test_exec_timeout_parameter() -> None:
     """LLM-supplied timeout should override the constructor default."""
     tool = ExecTool(timeout=60)
@@ -408,6 +428,52 @@ async def test_exec_timeout_capped_at_max() -> None:
     assert "Exit code: 0" in result
 
 
+async def test_exec_persistent_session_keeps_shell_state(tmp_path) -> None:
+    """cd and exported variables should survive between calls in one session."""
+    (tmp_path / "sub").mkdir()
+    tool = ExecTool(timeout=10, working_dir=str(tmp_path), persistent=True)
+    tool.set_context("cli:a")
+    try:
+        await tool.execute(command="cd sub && export NANOBOT_X=42")
+        result = await tool.execute(command='pwd; echo "x=$NANOBOT_X"; false')
+        assert str(tmp_path / "sub") in result
+        assert "x=42" in result
+        assert "Exit code: 1" in result
+
+        tool.set_context("cli:b")
+        other = await tool.execute(command='echo "x=$NANOBOT_X"')
+        assert "x=\n" in other
+    finally:
+        await tool.close_sessions()
+
+
+async def test_exec_persistent_session_recovers_after_timeout(tmp_path) -> None:
+    """A timed-out command resets the session; the next call gets a fresh shell."""
+    tool = ExecTool(timeout=10, working_dir=str(tmp_path), persistent=True)
+    try:
+        await tool.execute(command="export NANOBOT_Y=1")
+        result = await tool.execute(command="sleep 10", timeout=1)
+        assert "timed out" in result
+        result = await tool.execute(command='echo "y=$NANOBOT_Y"; echo err >&2')
+        assert "y=\n" in result
+        assert "STDERR:\nerr" in result
+        assert "Exit code: 0" in result
+    finally:
+        await tool.close_sessions()
+
+
+async def test_exec_persistent_session_survives_exit(tmp_path) -> None:
+    """`exit` ends the shell but the following command starts a new one."""
+    tool = ExecTool(timeout=10, working_dir=str(tmp_path), persistent=True)
+    try:
+        result = await tool.execute(command="exit 3")
+        assert "shell session ended" in result
+        result = await tool.execute(command="echo back")
+        assert "back" in result
+    finally:
+        await tool.close_sessions()
+
+
 # --- _resolve_type and nullable param tests ---
 
 